@@ -0,0 +1,191 @@
+# Benchmarks of the LTL simplifiers
+#
+#   python bench.py [--repeat N] [--only NAME] [--out FILE] [--compare FILE]
+#
+# A benchmark prepares its input, starting from empty node tables and
+# caches (DropTerms), and returns the run that is timed. Every benchmark is
+# timed over N runs (the best run counts) and then run once more under
+# tracemalloc for memory. The report is JSON: ops, seconds, ops/sec, blocks
+# and bytes still held after the run (the difference of two tracemalloc
+# snapshots, e.g. new nodes and cache entries), peak traced memory. --compare
+# prints the ops/sec ratio against an earlier report and exits with 1 on a
+# slowdown over 10%.
+
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+Here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(Here, 'classification_csmml2024'))
+
+import convert_new
+import convert2024
+
+#
+# Random deep formulas over the sweep variables, simplified bottom-up
+# by Simplify
+#
+Vars = ['trig', 'rel', 'inv', 'fin', 'del', 'rea']
+
+def RandomTerm(rnd:random.Random, depth:int):
+  c = convert2024
+  if depth == 0 or rnd.random() < 0.1:
+    if rnd.random() < 0.1: return c.BoolConstTerm(rnd.random() < 0.5)
+    return c.BoolFreeTerm(rnd.choice(Vars))
+  cls = rnd.choice([c.NotTerm, c.AndTerm, c.OrTerm, c.ImplTerm, c.WTerm, c.GTerm, c.FTerm])
+  if cls in (c.NotTerm, c.GTerm, c.FTerm): return cls(RandomTerm(rnd, depth - 1))
+  return cls(RandomTerm(rnd, depth - 1), RandomTerm(rnd, depth - 1))
+
+#
+# operand samples for the micro-benchmarks: subterms of the sweep results,
+# printed because DropTerms discards the nodes before every run. They are
+# computed on first use, so only the micro-benchmarks run the sweep for them
+#
+Samples = None
+
+def Operands() -> list:
+  global Samples
+  if Samples is None:
+    convert2024.DropTerms()
+    seen = set()
+    stack = [ltl for attrs, ltl in convert2024.Classify(1)]
+    while stack:
+      t = stack.pop()
+      if t in seen: continue
+      seen.add(t)
+      stack.extend((t.left(), t.right())[:t.childcount()])
+    Samples = sorted(convert2024.SortKey(t) for t in seen)
+  return Samples
+
+#
+# Benchmarks: each prepares its input and returns the run, which returns
+# the number of operations it performed
+#
+def BenchConvertNew():
+  with open(os.path.join(Here, 'atributs.csv'), encoding='utf8', newline='') as f:
+    rows = list(csv.DictReader(f))
+  return lambda: sum(1 for record in convert_new.Classify(rows))
+
+def BenchConvert2024():
+  convert2024.DropTerms()
+  return lambda: sum(1 for record in convert2024.Classify(1))
+
+def BenchRandomDeep():
+  convert2024.DropTerms()
+  formulas = [RandomTerm(random.Random(k), 7) for k in range(300)]
+  def run() -> int:
+    for t in formulas:
+      convert2024.Simplify(t)
+    return len(formulas)
+  return run
+
+def Micro(name:str, arity:int):
+  def bench():
+    texts = Operands()
+    convert2024.DropTerms()
+    samples = [convert2024.ParseFormula(text) for text in texts]
+    f = getattr(convert2024, name)
+    rnd = random.Random(arity)
+    if arity == 1: args = [(a,) for a in samples]
+    else: args = [(rnd.choice(samples), rnd.choice(samples)) for k in range(2000)]
+    def run() -> int:
+      # no memoization, so every call runs the whole rule chain
+      old = convert2024.cache.maxsize
+      convert2024.cache.resize(0)
+      try:
+        for a in args:
+          f(*a)
+      finally:
+        convert2024.cache.resize(old)
+      return len(args)
+    return run
+  return bench
+
+def Benchmarks() -> dict:
+  benches = {
+    'convert_new.sweep': BenchConvertNew,
+    'convert2024.sweep': BenchConvert2024,
+    'random.deep': BenchRandomDeep,
+  }
+  for name, arity in (('No', 1), ('FutureSimpl', 1), ('GloballySimpl', 1), ('DisSimpl', 2),
+                      ('ConSimpl', 2), ('ImplSimpl', 2), ('WeakUntilSimpl', 2)):
+    benches['micro.' + name] = Micro(name, arity)
+  return benches
+
+def Measure(bench, repeat:int) -> dict:
+  best = None
+  for k in range(repeat):
+    run = bench()
+    gc.collect()
+    t0 = time.perf_counter()
+    ops = run()
+    dt = time.perf_counter() - t0
+    if best is None or dt < best: best = dt
+  run = bench()
+  gc.collect()
+  tracemalloc.start()
+  before = tracemalloc.take_snapshot()
+  tracemalloc.reset_peak()
+  run()
+  current, peak = tracemalloc.get_traced_memory()
+  after = tracemalloc.take_snapshot()
+  tracemalloc.stop()
+  held = after.compare_to(before, 'filename')
+  return {'ops': ops, 'seconds': best, 'ops_per_sec': ops / best if best else None,
+          'held_blocks': sum(s.count_diff for s in held), 'held_bytes': sum(s.size_diff for s in held),
+          'peak_bytes': peak}
+
+def Commit():
+  try:
+    return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Here, capture_output=True,
+                          text=True, check=True).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+def Compare(report:dict, path:str, threshold:float = 0.9) -> bool:
+  with open(path, encoding='utf8') as f:
+    old = json.load(f)['benchmarks']
+  ok = True
+  for name, r in report['benchmarks'].items():
+    if name not in old or not old[name]['ops_per_sec']: continue
+    ratio = r['ops_per_sec'] / old[name]['ops_per_sec']
+    flag = ''
+    if ratio < threshold:
+      flag = '  slower'
+      ok = False
+    print('%-26s %6.2fx%s' % (name, ratio, flag), file=sys.stderr)
+  return ok
+
+def Main() -> int:
+  parser = argparse.ArgumentParser(description='Benchmarks of the LTL simplifiers')
+  parser.add_argument('--repeat', type=int, default=3)
+  parser.add_argument('--only', help='run the benchmarks whose name contains this text')
+  parser.add_argument('--out', help='write the JSON report to this file')
+  parser.add_argument('--compare', help='earlier JSON report to compare with')
+  args = parser.parse_args()
+
+  results = {}
+  for name, bench in Benchmarks().items():
+    if args.only and args.only not in name: continue
+    results[name] = Measure(bench, args.repeat)
+  report = {'commit': Commit(), 'python': platform.python_version(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'benchmarks': results}
+  text = json.dumps(report, indent=2)
+  if args.out:
+    with open(args.out, 'w', encoding='utf8') as f:
+      f.write(text + '\n')
+  else: print(text)
+  if args.compare and not Compare(report, args.compare): return 1
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
@@ -0,0 +1,136 @@
+# Command line of the classification
+#
+#   python cli.py pattern [options] TRIGGER RELEASE INVARIANT FINAL DELAY REACTION
+#   python cli.py batch [options] FILE
+#   python cli.py sweep [options] [--fix ATTRIBUTE=VALUE ...]
+#
+# An attribute is a formula in the printed or ASCII syntax, e.g. ¬trig or
+# 'trig & !rel' (true* and false* of atributs.csv are accepted as well).
+# A batch file has six attributes per line separated by spaces or commas
+# (so an attribute there has no spaces or commas inside), or
+# a header line naming the columns like atributs.csv, where the missing
+# attributes keep their own variable (trigger is trig and so on).
+# Options: --format text|csv|xlsx|store|classes, --output FILE,
+# --workers N (sweep only), --cache DB for the persistent cache, --stats,
+# --fixpoint to saturate the results, --propositional to reduce the
+# propositional parts by truth tables, --merge to merge the classes with
+# equal meaning (bounded check on lasso traces, see equiv.py).
+
+import argparse
+import re
+import sys
+import time
+
+from convert2024 import (Attributes, BoolConstTerm, ParseFormula, Reduce, Classify,
+                         PrintSink, CsvSink, WorkbookSink, ClassIndex, DiskCache, cache)
+
+Defaults = {'trigger': 'trig', 'release': 'rel', 'invariant': 'inv', 'final': 'fin',
+            'delay': 'del', 'reaction': 'rea'}
+
+def Attribute(text:str):
+  s = text.strip()
+  if s == 'true*': return BoolConstTerm(True)
+  if s == 'false*': return BoolConstTerm(False)
+  return ParseFormula(s)
+
+# attribute tuples of a batch file
+def ReadBatch(path:str):
+  with open(path, encoding='utf8') as f:
+    lines = [l.split('#')[0] for l in f]
+  rows = [[x for x in re.split(r'[\s,]+', l) if x] for l in lines]
+  rows = [r for r in rows if r]
+  if rows and all(x in Attributes for x in rows[0]):
+    header = rows.pop(0)
+    for r in rows:
+      values = dict(Defaults)
+      values.update(zip(header, r))
+      yield tuple(Attribute(values[a]) for a in Attributes)
+    return
+  for r in rows:
+    if len(r) != len(Attributes):
+      raise ValueError('%s: expected %d attributes, got %s' % (path, len(Attributes), ' '.join(r)))
+    yield tuple(Attribute(x) for x in r)
+
+def Records(attrs):
+  for a in attrs:
+    yield a, Reduce(*a)
+
+def Sink(fmt:str, output:str):
+  if fmt == 'text': return PrintSink()
+  if fmt == 'csv': return CsvSink(output or '-')
+  if output is None: raise ValueError('--format %s needs --output' % fmt)
+  if fmt == 'xlsx': return WorkbookSink(output)
+  from result_store import StoreSink
+  return StoreSink(output)
+
+def Main(argv:list = None) -> int:
+  common = argparse.ArgumentParser(add_help=False)
+  common.add_argument('--format', choices=['text', 'csv', 'xlsx', 'store', 'classes'], default='text')
+  common.add_argument('--output', help='output file, csv goes to the standard output without it')
+  common.add_argument('--workers', type=int, help='worker processes of a sweep, 1 runs in-process')
+  common.add_argument('--cache', help='SQLite file of the persistent simplifier cache')
+  common.add_argument('--stats', action='store_true', help='print counts, time and cache statistics to stderr')
+  common.add_argument('--fixpoint', action='store_true', help='apply the rules to saturation')
+  common.add_argument('--propositional', action='store_true',
+                      help='reduce propositional subterms by truth tables')
+  common.add_argument('--merge', action='store_true', help='merge the classes whose formulas are equivalent')
+  parser = argparse.ArgumentParser(description='Simplification of EDTL requirements to LTL')
+  modes = parser.add_subparsers(dest='mode', required=True)
+  p = modes.add_parser('pattern', parents=[common], help='simplify one requirement')
+  for a in Attributes:
+    p.add_argument(a)
+  p = modes.add_parser('batch', parents=[common], help='simplify the requirements of a file')
+  p.add_argument('file')
+  p = modes.add_parser('sweep', parents=[common], help='classify the attribute space')
+  p.add_argument('--fix', action='append', default=[], metavar='ATTRIBUTE=VALUE',
+                 help='keep only the tuples with this attribute value')
+  args = parser.parse_args(argv)
+
+  try:
+    if args.mode == 'pattern':
+      records = Records([tuple(Attribute(getattr(args, a)) for a in Attributes)])
+    elif args.mode == 'batch':
+      records = Records(ReadBatch(args.file))
+    else:
+      fixed = {}
+      for f in args.fix:
+        name, eq, value = f.partition('=')
+        if not eq or name not in Attributes: raise ValueError('bad --fix ' + f)
+        fixed[name] = Attribute(value)
+      records = Classify(args.workers, fixed or None)
+    # the disk cache fingerprint depends on it
+    cache.propositional = args.propositional
+    if args.cache: cache.disk = DiskCache(args.cache)
+    cache.fixpoint = args.fixpoint
+    classes = ClassIndex()
+    sinks = [classes]
+    if args.format != 'classes': sinks.append(Sink(args.format, args.output))
+    start = time.perf_counter()
+    count = 0
+    for record in records:
+      count += 1
+      for sink in sinks:
+        sink.write(record)
+    for sink in sinks:
+      sink.close()
+    if args.merge:
+      from equiv import MergeClasses
+      classes = MergeClasses(classes)
+  except (OSError, ValueError) as e:
+    print('error: %s' % e, file=sys.stderr)
+    return 1
+  finally:
+    if cache.disk is not None: cache.disk.close()
+
+  if args.format == 'classes': print(classes.printme())
+  if args.stats:
+    print('%d records, %d classes, %.3f s' % (count, classes.count(), time.perf_counter() - start), file=sys.stderr)
+    # worker processes keep their own caches
+    if args.mode != 'sweep' or args.workers == 1:
+      print(cache.printme(), file=sys.stderr)
+      if cache.disk is not None: print(cache.disk.printme(), file=sys.stderr)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
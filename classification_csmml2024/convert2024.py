@@ -5,7 +5,10 @@
 
 
 from enum import Enum
-import unittest
+from collections import OrderedDict
+from operator import attrgetter
+from itertools import product
+import re
   
 #
 # Enum-class for checking the type 
@@ -29,11 +32,22 @@ class Term:
   pass
 
 def printx(a) -> str:
-  if (a.type() == TermType.BoolConst) or (a.type() == TermType.BoolVar) or (a.type() == TermType.Not): return a.printme()
+  if (a.ty == TermType.BoolConst) or (a.ty == TermType.BoolVar) or (a.ty == TermType.Not): return a.printme()
   else: return "(" + a.printme() + ")" 
 
 class Term:
-  def __init__(self) -> None:
+  # nodes carry no __dict__ and no hash of their own: terms are hash-consed,
+  # so the identity hash of object is the structural one. The TermType of a
+  # node is the ty of its class
+  __slots__ = ()
+  nodes = {}
+  fields = ()
+  ty = None
+  def __init_subclass__(cls, **kw) -> None:
+    super().__init_subclass__(**kw)
+    # one node table per class, see NoOpTerm, OneOpTerm and TwoOpTerm
+    cls.nodes = {}
+  def __init__(self, *args) -> None:
     pass
   def printme(self) -> str:
     pass
@@ -44,17 +58,56 @@ class Term:
   def right(self) -> Term:
     pass
   def type(self) -> TermType:
-    pass
+    return self.ty
   def equals(self, other: Term) -> bool:
-#    print('checking ')
-#    print(self.printme() + ' vs ')
-#    print(other.printme())
-    return self.printme() == other.printme()
+    # terms are hash-consed, so equal structures are the same node
+    return self is other
+  def __reduce__(self):
+    return (self.__class__, tuple(getattr(self, f) for f in self.fields))
+
+#
+# Hash-consing: one shared node per distinct structure. Every class keeps its
+# nodes in cls.nodes keyed on the value of a leaf or on the ids of the
+# (already interned) operands, so no key tuple is kept per node; the table
+# holds its nodes, so the ids stay valid
+#
+def TermClasses() -> list:
+  out = []
+  work = [Term]
+  while work:
+    c = work.pop()
+    out.append(c)
+    work.extend(c.__subclasses__())
+  return out
+
+# releases the node tables and the caches keyed on terms; terms built
+# before are not shared with the ones built after, so do not mix them
+def DropTerms() -> None:
+  for c in TermClasses():
+    c.nodes.clear()
+  cache.clear()
+  Canonicals.clear()
+  SortKeys.clear()
+  Digests.clear()
+  PropVars.clear()
+  Tables.clear()
+  if cache.disk is not None: cache.disk.terms.clear()
+
+def NodeCount() -> int:
+  return sum(len(c.nodes) for c in TermClasses())
  
 #
 # Class for const/var terms 
 #
 class NoOpTerm(Term):
+  __slots__ = ('v',)
+  fields = ('v',)
+  def __new__(cls, v):
+    t = cls.nodes.get(v)
+    if t is None:
+      t = cls.nodes[v] = object.__new__(cls)
+      t.v = v
+    return t
   def childcount(self) -> int:
     return 0
   def val(self):
@@ -64,9 +117,15 @@ class NoOpTerm(Term):
 # Class for one operation terms 
 #
 class OneOpTerm(Term):
+  __slots__ = ('a',)
   a: Term
-  def __init__(self, a:Term) -> None:
-    self.a = a
+  fields = ('a',)
+  def __new__(cls, a:Term):
+    t = cls.nodes.get(id(a))
+    if t is None:
+      t = cls.nodes[id(a)] = object.__new__(cls)
+      t.a = a
+    return t
   def childcount(self) -> int:
     return 1
   def left(self) -> Term:
@@ -76,11 +135,18 @@ class OneOpTerm(Term):
 # Class for two operation terms 
 #
 class TwoOpTerm(Term):
+  __slots__ = ('a', 'b')
   a: Term
   b: Term
-  def __init__(self, a:Term, b:Term) -> None:
-    self.a = a
-    self.b = b
+  fields = ('a', 'b')
+  def __new__(cls, a:Term, b:Term):
+    key = id(a) << 64 | id(b)
+    t = cls.nodes.get(key)
+    if t is None:
+      t = cls.nodes[key] = object.__new__(cls)
+      t.a = a
+      t.b = b
+    return t
   def childcount(self) -> int:
     return 2
   def left(self) -> Term:
@@ -92,14 +158,12 @@ class TwoOpTerm(Term):
 # Class for true/false
 #
 class BoolConstTerm(NoOpTerm):
+  __slots__ = ()
+  ty = TermType.BoolConst
   v: bool
-  def __init__(self, boolVar:bool) -> None:
-    self.v = boolVar
   def printme(self) -> str:
     if self.v: return "true"
     else: return "false"
-  def type(self) -> TermType:
-    return TermType.BoolConst
   def val(self) -> bool:
     return self.v
 
@@ -107,13 +171,11 @@ class BoolConstTerm(NoOpTerm):
 # Class for string-named variables
 #
 class BoolFreeTerm(NoOpTerm):
+  __slots__ = ()
+  ty = TermType.BoolVar
   v: str
-  def __init__(self, freeFar:str) -> None:
-    self.v = freeFar
   def printme(self) -> str:
     return self.v
-  def type(self) -> TermType:
-    return TermType.BoolVar
   def val(self) -> str: 
     return self.v
 
@@ -121,1038 +183,1885 @@ class BoolFreeTerm(NoOpTerm):
 # Classes for particular LTL operations
 #
 class NotTerm(OneOpTerm):
-  def type(self) -> TermType:
-    return TermType.Not
+  __slots__ = ()
+  ty = TermType.Not
   def printme(self) -> str:
     return  "¬" + printx(self.left())
 
 class AndTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.And
+  __slots__ = ()
+  ty = TermType.And
   def printme(self) -> str:
     return printx(self.left()) + " ∧ " + printx(self.right())
 
 class OrTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.Or
+  __slots__ = ()
+  ty = TermType.Or
   def printme(self) -> str:
     return printx(self.left()) + " ∨ " + printx(self.right())
 
 class ImplTerm(TwoOpTerm):
-  def type(self)->TermType:
-    return TermType.Impl
+  __slots__ = ()
+  ty = TermType.Impl
   def printme(self) -> str:
     return printx(self.left()) + " → " + printx(self.right())
 
 class UTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.U
+  __slots__ = ()
+  ty = TermType.U
   def printme(self) -> str:
     return printx(self.left()) + " U " + printx(self.right())
 
 class WTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.W
+  __slots__ = ()
+  ty = TermType.W
   def printme(self) -> str:
     return printx(self.left()) + " W " + printx(self.right())
 
 class GTerm(OneOpTerm):
-  def type(self) -> TermType:
-    return TermType.G
+  __slots__ = ()
+  ty = TermType.G
   def printme(self) -> str:
     return "G " + printx(self.left())
 
 class FTerm(OneOpTerm):
-  def type(self) -> TermType:
-    return TermType.F
+  __slots__ = ()
+  ty = TermType.F
   def printme(self) -> str:
     return "F " + printx(self.left())
 
+#
+# Rule engine
+#
+# The rewrite rules of the simplifiers are written as patterns in the printed
+# LTL syntax:
+#   a, b, c ...       pattern variables, repeated occurrences are the same term
+#   ~a                a term complementary to a (see CheckNotHelper)
+#   'rel'             the free variable with this name
+#   true, false       constants
+#   w@(...)           binds w to the whole matched subterm
+#   ¬ ∧ ∨ → U W G F   operators, ¬/G/F bind tighter than U/W, then ∧, ∨, →
+#
+# The right-hand side uses the same syntax and is rebuilt through the
+# simplifiers (∧ by ConSimpl, ∨ by DisSimpl and so on), so a rewritten term
+# is simplified again. A rule may list several left-hand sides; rules of a set
+# are tried in the order they were added and the first match wins.
+#
+# Every set keeps its left-hand sides in a discrimination tree (RuleTrie),
+# built as rules are added, so a call only tries the rules that fit the
+# operands instead of walking the whole chain.
+#
+
+PatternBinary = {'∧': TermType.And, '∨': TermType.Or, '→': TermType.Impl,
+                 'U': TermType.U, 'W': TermType.W}
+PatternPrec = {TermType.Impl: 1, TermType.Or: 2, TermType.And: 3,
+               TermType.U: 4, TermType.W: 4}
+PatternUnary = {'¬': TermType.Not, 'G': TermType.G, 'F': TermType.F}
+
+# simplifier used to rebuild each operator of a right-hand side
+Builders = {TermType.Not: 'No', TermType.And: 'ConSimpl', TermType.Or: 'DisSimpl',
+            TermType.Impl: 'ImplSimpl', TermType.W: 'WeakUntilSimpl',
+            TermType.U: 'UTerm', TermType.G: 'GloballySimpl', TermType.F: 'FutureSimpl'}
+
+#
+# Parser for patterns, a pattern is a tuple:
+# ('var', x), ('not', x), ('const', v), ('atom', name), ('as', x, p)
+# or (TermType, operands...)
+#
+class PatternParser:
+  def __init__(self, text:str) -> None:
+    self.text = text
+    self.toks = re.findall(r"'\w+'|[a-z]\w*|[¬~∧∨→UWGF()@]", text)
+    if ''.join(self.toks) != ''.join(text.split()):
+      raise ValueError('bad pattern: ' + text)
+    self.pos = 0
+  def peek(self):
+    if self.pos < len(self.toks): return self.toks[self.pos]
+    return None
+  def next(self) -> str:
+    tok = self.peek()
+    if tok is None: raise ValueError('unexpected end of pattern: ' + self.text)
+    self.pos += 1
+    return tok
+  def parse(self):
+    p = self.binary(0)
+    if self.peek() is not None: raise ValueError('trailing input in pattern: ' + self.text)
+    return p
+  def binary(self, prec:int):
+    p = self.unary()
+    op = PatternBinary.get(self.peek())
+    while op is not None and PatternPrec[op] > prec:
+      self.next()
+      p = (op, p, self.binary(PatternPrec[op] - 1))
+      op = PatternBinary.get(self.peek())
+    return p
+  def unary(self):
+    tok = self.next()
+    if tok in PatternUnary: return (PatternUnary[tok], self.unary())
+    if tok == '~': return ('not', self.next())
+    if tok == '(':
+      p = self.binary(0)
+      if self.next() != ')': raise ValueError('missing ) in pattern: ' + self.text)
+      return p
+    if tok == 'true' or tok == 'false': return ('const', tok == 'true')
+    if tok[0] == "'": return ('atom', tok[1:-1])
+    if not tok[0].isalpha() or not tok[0].islower(): raise ValueError('bad token ' + tok + ' in pattern: ' + self.text)
+    if self.peek() == '@':
+      self.next()
+      return ('as', tok, self.unary())
+    return ('var', tok)
+
+def ParsePattern(text:str):
+  return PatternParser(text).parse()
+
+#
+# Parser for formulas in the printed syntax and its ASCII forms:
+#   ¬ ! ~   ∧ & && /\   ∨ v | || \/   → -> =>   U W G F   true false
+# with the precedences of the patterns. It is a Pratt parser with explicit
+# operator and operand stacks, so deep formulas do not recurse, and it builds
+# the hash-consed nodes directly without simplification
+#
+FormulaToken = re.compile(r"\s*(?:(?P<bin>->|=>|→|&&|&|/\\|∧|\|\||\||\\/|∨)|(?P<un>[¬!~])|"
+                          r"(?P<lp>\()|(?P<rp>\))|(?P<word>[A-Za-z_]\w*))")
+FormulaBinary = {'->': TermType.Impl, '=>': TermType.Impl, '→': TermType.Impl,
+                 '&&': TermType.And, '&': TermType.And, '/\\': TermType.And, '∧': TermType.And,
+                 '||': TermType.Or, '|': TermType.Or, '\\/': TermType.Or, '∨': TermType.Or,
+                 'v': TermType.Or, 'U': TermType.U, 'W': TermType.W}
+FormulaUnary = {'¬': TermType.Not, '!': TermType.Not, '~': TermType.Not,
+                'G': TermType.G, 'F': TermType.F}
+Constructors = {TermType.Not: NotTerm, TermType.And: AndTerm, TermType.Or: OrTerm,
+                TermType.Impl: ImplTerm, TermType.U: UTerm, TermType.W: WTerm,
+                TermType.G: GTerm, TermType.F: FTerm}
+
+def ParseFormula(text:str) -> Term:
+  operands = []
+  ops = []
+  expect = True
+  pos = 0
+  while True:
+    m = FormulaToken.match(text, pos)
+    if m is None:
+      if text[pos:].strip(): raise ValueError('bad formula at %d: %s' % (pos, text))
+      break
+    pos = m.end()
+    kind = m.lastgroup
+    tok = m.group(kind)
+    if expect:
+      if kind == 'un' or (kind == 'word' and tok in ('G', 'F')):
+        ops.append(FormulaUnary[tok])
+      elif kind == 'lp':
+        ops.append(None)
+      elif kind == 'word':
+        if tok == 'true' or tok == 'false': operands.append(BoolConstTerm(tok == 'true'))
+        else: operands.append(BoolFreeTerm(tok))
+        expect = False
+      else: raise ValueError('operand expected at %d: %s' % (m.start(kind), text))
+    elif kind == 'bin' or (kind == 'word' and tok in ('U', 'W', 'v')):
+      ty = FormulaBinary[tok]
+      prec = PatternPrec[ty]
+      # operators are right-associative, as in the patterns
+      while ops and ops[-1] is not None and PatternPrec.get(ops[-1], 5) > prec:
+        ReduceFormula(ops, operands)
+      ops.append(ty)
+      expect = True
+    elif kind == 'rp':
+      while ops and ops[-1] is not None:
+        ReduceFormula(ops, operands)
+      if not ops: raise ValueError('unbalanced ) at %d: %s' % (m.start(kind), text))
+      ops.pop()
+    else: raise ValueError('operator expected at %d: %s' % (m.start(kind), text))
+  if expect: raise ValueError('unexpected end of formula: ' + text)
+  while ops:
+    if ops[-1] is None: raise ValueError('missing ) in formula: ' + text)
+    ReduceFormula(ops, operands)
+  return operands[0]
+
+def ReduceFormula(ops:list, operands:list) -> None:
+  ty = ops.pop()
+  cls = Constructors[ty]
+  if ty in PatternPrec:
+    b = operands.pop()
+    operands.append(cls(operands.pop(), b))
+  else: operands.append(cls(operands.pop()))
+
+# formulas of lines, empty lines and # comments are skipped; result files
+# repeat the same formula many times, so every distinct line is parsed once
+def ParseLines(lines):
+  parsed = {}
+  for line in lines:
+    line = line.split('#', 1)[0].strip()
+    if not line: continue
+    t = parsed.get(line)
+    if t is None:
+      t = parsed[line] = ParseFormula(line)
+    yield t
+
+def ParseFormulas(text:str):
+  return ParseLines(text.splitlines())
+
+def ReadFormulas(path:str):
+  with open(path, encoding='utf8') as f:
+    yield from ParseLines(f)
+
+#
+# Compiles a pattern into a matcher m(term, env) -> bool, variables are bound
+# into env in the same order the matcher visits them. Complements of variables
+# that are bound later are collected into post and checked after the match
+#
+def CompileMatch(p, bound:set, post:list):
+  tag = p[0]
+  if tag == 'var':
+    x = p[1]
+    if x in bound:
+      return lambda t, env: env[x] is t
+    bound.add(x)
+    def bind(t, env):
+      env[x] = t
+      return True
+    return bind
+  if tag == 'not':
+    x = p[1]
+    if x in bound:
+      return lambda t, env: CheckNotHelper(env[x], t)
+    tmp = '~%s%d' % (x, len(post))
+    post.append((x, tmp))
+    def defer(t, env):
+      env[tmp] = t
+      return True
+    return defer
+  if tag == 'const':
+    v = p[1]
+    return lambda t, env: t.ty is TermType.BoolConst and t.v == v
+  if tag == 'atom':
+    name = p[1]
+    return lambda t, env: t.ty is TermType.BoolVar and t.v == name
+  if tag == 'as':
+    bind = CompileMatch(('var', p[1]), bound, post)
+    inner = CompileMatch(p[2], bound, post)
+    return lambda t, env: bind(t, env) and inner(t, env)
+  if len(p) == 2:
+    m0 = CompileMatch(p[1], bound, post)
+    return lambda t, env: t.ty is tag and m0(t.a, env)
+  m0 = CompileMatch(p[1], bound, post)
+  m1 = CompileMatch(p[2], bound, post)
+  return lambda t, env: t.ty is tag and m0(t.a, env) and m1(t.b, env)
+
+#
+# Compiles a right-hand side into a builder b(env) -> Term. Leaves are
+# interned when the rule fires, so the rules keep no nodes of their own and
+# stay valid after DropTerms
+#
+def CompileBuild(p, bound:set):
+  tag = p[0]
+  if tag == 'var':
+    x = p[1]
+    if x not in bound: raise ValueError('unbound variable ' + x)
+    return lambda env: env[x]
+  if tag == 'const':
+    v = p[1]
+    return lambda env: BoolConstTerm(v)
+  if tag == 'atom':
+    name = p[1]
+    return lambda env: BoolFreeTerm(name)
+  if tag == 'not' or tag == 'as':
+    raise ValueError('~ and @ are not allowed in a right-hand side')
+  name = Builders[tag]
+  scope = globals()
+  if len(p) == 2:
+    b0 = CompileBuild(p[1], bound)
+    return lambda env: scope[name](b0(env))
+  b0 = CompileBuild(p[1], bound)
+  b1 = CompileBuild(p[2], bound)
+  return lambda env: scope[name](b0(env), b1(env))
+
+#
+# Discrimination tree of a rule set: a trie over the operands of the
+# left-hand sides read in preorder. An edge is an operator type, the value of
+# a constant or the name of an 'atom'; variables and ~x are wildcards (skip)
+# that pass over a whole subterm. Every node tests a fixed position of the
+# operands, so the trie compiles into one function of nested ifs over the
+# operands: it follows the edge of each position and the wildcards, and its
+# cost depends on the shape of the operands and the patterns that fit them,
+# not on the number of rules. The cases found are returned in rule order
+#
+class RuleTrie:
+  def __init__(self) -> None:
+    self.next = {}
+    self.skip = None
+    self.cases = []
+    self.size = 0
+  def insert(self, case) -> None:
+    case.order = self.size
+    self.size += 1
+    node = self
+    for sym in PatternSymbols(case.args):
+      nxt = node.skip if sym is None else node.next.get(sym)
+      if nxt is None:
+        nxt = RuleTrie()
+        if sym is None: node.skip = nxt
+        else: node.next[sym] = nxt
+      node = nxt
+    node.cases.append(case)
+  # lookup(args) -> cases that may match the operands. Deep tries are
+  # split into helper functions, Python limits the nesting of blocks
+  def compile(self, arity:int):
+    names = {'Merge': MergeCases}
+    for ty in TermType:
+      names[ty.name] = ty
+    lines = ['def lookup(args):', '  found = []']
+    lines.append('  ' + ', '.join('t%d' % i for i in range(arity)) + (',' if arity == 1 else '') + ' = args')
+    helpers = []
+    leaves = []
+    # the trie is as deep as the largest pattern, so this recursion is bounded
+    def emit(node, pending:tuple, pad:str, out:list) -> None:
+      if not pending:
+        if node.cases:
+          names['c%d' % len(leaves)] = node.cases
+          out.append(pad + 'found.append(c%d)' % len(leaves))
+          leaves.append(node)
+        return
+      if len(pad) > 64:
+        params = ['p%d' % i for i in range(len(pending))]
+        body = ['def n%d(%s, found):' % (len(helpers), ', '.join(params))]
+        out.append(pad + 'n%d(%s, found)' % (len(helpers), ', '.join(pending)))
+        helpers.append(body)
+        emit(node, tuple(params), '  ', body)
+        return
+      t = pending[-1]
+      rest = pending[:-1]
+      if node.skip is not None: emit(node.skip, rest, pad, out)
+      test = 'if'
+      for sym, nxt in node.next.items():
+        if sym in (TermType.Not, TermType.G, TermType.F):
+          out.append(pad + '%s %s.ty is %s:' % (test, t, sym.name))
+          emit(nxt, rest + (t + '.a',), pad + '  ', out)
+        elif isinstance(sym, TermType):
+          out.append(pad + '%s %s.ty is %s:' % (test, t, sym.name))
+          emit(nxt, rest + (t + '.b', t + '.a'), pad + '  ', out)
+        else:
+          ty = TermType.BoolConst if isinstance(sym, bool) else TermType.BoolVar
+          out.append(pad + '%s %s.ty is %s and %s.v == %r:' % (test, t, ty.name, t, sym))
+          emit(nxt, rest, pad + '  ', out)
+        test = 'elif'
+    emit(self, tuple('t%d' % i for i in reversed(range(arity))), '  ', lines)
+    lines.append('  return Merge(found)')
+    self.source = '\n'.join(lines + [l for body in helpers for l in body])
+    exec(self.source, names)
+    return names['lookup']
+
+# cases of the leaves reached by a lookup, in rule order
+def MergeCases(found:list) -> list:
+  if len(found) == 1: return found[0]
+  if not found: return found
+  return sorted((c for cases in found for c in cases), key=CaseOrder)
+
+CaseOrder = attrgetter('order')
+
+# edges of the operand patterns in preorder
+def PatternSymbols(args) -> list:
+  out = []
+  stack = list(reversed(args))
+  while stack:
+    p = stack.pop()
+    tag = p[0]
+    if tag == 'as': stack.append(p[2])
+    elif tag == 'var' or tag == 'not': out.append(None)
+    elif tag == 'const' or tag == 'atom': out.append(p[1])
+    else:
+      out.append(tag)
+      stack.extend(reversed(p[1:]))
+  return out
+
+#
+# Commutative matching: a rule given with commute=True also matches every
+# operand order of the ∧ and ∨ nodes below the root of its left-hand sides,
+# so a ∨ (b ∧ a) covers a ∨ (a ∧ b). The orders are expanded into cases when
+# the rule is added, the written order first, and orders that only rename
+# the variables are dropped. The root keeps its order: a mirrored root is a
+# rule of its own, e.g. true ∨ b and a ∨ true. Rules that only hold where the
+# simplifier meets them (egraph.Contextual) list the orders they were
+# written for
+#
+def Commuted(p) -> list:
+  out = []
+  seen = set()
+  for args in product(*(OperandOrders(q) for q in p[1:])):
+    q = (p[0],) + args
+    key = PatternShape(q, {})
+    if key not in seen:
+      seen.add(key)
+      out.append(q)
+  return out
+
+def OperandOrders(p) -> list:
+  tag = p[0]
+  if tag == 'as': return [('as', p[1], q) for q in OperandOrders(p[2])]
+  if tag == 'var' or tag == 'not' or tag == 'const' or tag == 'atom': return [p]
+  if len(p) == 2: return [(tag, q) for q in OperandOrders(p[1])]
+  orders = [(tag, x, y) for x in OperandOrders(p[1]) for y in OperandOrders(p[2])]
+  if tag is TermType.And or tag is TermType.Or:
+    orders += [(tag, y, x) for _, x, y in orders]
+  return orders
+
+# the pattern with its variables numbered in the order they are met
+def PatternShape(p, names:dict) -> tuple:
+  tag = p[0]
+  if tag == 'var' or tag == 'not': return (tag, names.setdefault(p[1], len(names)))
+  if tag == 'as': return ('as', names.setdefault(p[1], len(names)), PatternShape(p[2], names))
+  if tag == 'const' or tag == 'atom': return p
+  return (tag,) + tuple(PatternShape(q, names) for q in p[1:])
+
+#
+# One left-hand side of a rule, in one operand order
+#
+class RuleCase:
+  def __init__(self, rule, text:str, p) -> None:
+    self.rule = rule
+    self.text = text
+    self.args = p[1:]
+    self.bound = set()
+    post = []
+    self.matchers = [CompileMatch(q, self.bound, post) for q in self.args]
+    for x, tmp in post:
+      if x not in self.bound: raise ValueError('~' + x + ' without ' + x + ' in pattern: ' + text)
+    self.post = post
+  def match(self, args):
+    env = {}
+    for m, t in zip(self.matchers, args):
+      if not m(t, env): return None
+    for x, tmp in self.post:
+      if not CheckNotHelper(env[x], env[tmp]): return None
+    return env
+
+class Rule:
+  def __init__(self, ruleset, lhs, rhs, commute:bool = False) -> None:
+    self.ruleset = ruleset
+    self.number = len(ruleset.rules) + 1
+    self.lhs = lhs
+    self.commute = commute
+    self.cases = []
+    for text in lhs:
+      p = ParsePattern(text)
+      if p[0] is not ruleset.op: raise ValueError('pattern ' + text + ' does not match the rule set')
+      for q in Commuted(p) if commute else [p]:
+        self.cases.append(RuleCase(self, text, q))
+    if callable(rhs):
+      self.rhs = getattr(rhs, '__doc__', None) or 'builtin'
+      self.build = rhs
+    else:
+      self.rhs = rhs
+      bound = set.intersection(*(c.bound for c in self.cases))
+      self.build = CompileBuild(ParsePattern(rhs), bound)
+  def name(self) -> str:
+    return '%s #%d' % (self.ruleset.name, self.number)
+  def printme(self) -> str:
+    return self.cases[0].text + ' = ' + self.rhs
+
+class RuleSet:
+  def __init__(self, name:str, op:TermType, default) -> None:
+    self.name = name
+    self.op = op
+    self.default = default
+    self.rules = []
+    self.trie = RuleTrie()
+    self.lookup = None
+  def rule(self, *lhs, to, commute:bool = False):
+    r = Rule(self, lhs, to, commute)
+    self.rules.append(r)
+    for c in r.cases:
+      self.trie.insert(c)
+    self.lookup = None
+    return r
+  # puts a new rule in place of rule number, returns (old, new)
+  def replace(self, number:int, *lhs, to, commute:bool = False):
+    old = self.rules[number - 1]
+    r = Rule(self, lhs, to, commute)
+    r.number = number
+    self.rules[number - 1] = r
+    self.reindex()
+    return old, r
+  # rebuilds the trie after self.rules was changed in place
+  def reindex(self) -> None:
+    self.trie = RuleTrie()
+    for r in self.rules:
+      for c in r.cases:
+        self.trie.insert(c)
+    self.lookup = None
+  # the cases that may match the operands, the trie is compiled on first use
+  def candidates(self, args) -> list:
+    if self.lookup is None:
+      self.lookup = self.trie.compile(1 if self.op in (TermType.Not, TermType.G, TermType.F) else 2)
+    return self.lookup(args)
+  def apply(self, *args) -> Term:
+    if cache.propositional and self.op in Connectives:
+      r = Propositional(self, args)
+      if r is not None: return r
+    if profiler.enabled: return profiler.apply(self, args)
+    for c in self.candidates(args):
+      env = c.match(args)
+      if env is not None:
+        if cache.track and cache.frames: cache.frames[-1][0] = c.rule
+        return c.rule.build(env)
+    return self.default(*args)
+
+#
+# Opt-in profiler of the rule sets: counts guard evaluations (pattern
+# matches tried), firings and their time per rule, calls and nesting depth
+# per set. Build time includes the nested simplifier calls of the
+# right-hand side. Only cache misses reach the rule sets, so use
+# cache.resize(0) to profile every call
+#
+class RuleStats:
+  def __init__(self) -> None:
+    self.guards = 0
+    self.fired = 0
+    self.guardtime = 0.0
+    self.buildtime = 0.0
+
+class RuleProfiler:
+  def __init__(self) -> None:
+    self.enabled = False
+    self.reset()
+  def reset(self) -> None:
+    self.rules = {}
+    self.sets = {}
+    self.depth = 0
+  def apply(self, rs:RuleSet, args) -> Term:
+    from time import perf_counter
+    calls = self.sets.get(rs)
+    if calls is None:
+      calls = self.sets[rs] = {'calls': 0, 'defaults': 0, 'depth': 0, 'maxdepth': 0}
+    self.depth += 1
+    calls['calls'] += 1
+    calls['depth'] += self.depth
+    calls['maxdepth'] = max(calls['maxdepth'], self.depth)
+    try:
+      for c in rs.candidates(args):
+        st = self.rules.get(c.rule)
+        if st is None:
+          st = self.rules[c.rule] = RuleStats()
+        t0 = perf_counter()
+        env = c.match(args)
+        st.guardtime += perf_counter() - t0
+        st.guards += 1
+        if env is not None:
+          if cache.track and cache.frames: cache.frames[-1][0] = c.rule
+          st.fired += 1
+          t0 = perf_counter()
+          r = c.rule.build(env)
+          st.buildtime += perf_counter() - t0
+          return r
+      calls['defaults'] += 1
+      return rs.default(*args)
+    finally:
+      self.depth -= 1
+  # rules that never fired while profiling, in the given rule sets
+  def dead(self, rulesets:list) -> list:
+    return [r for rs in rulesets for r in rs.rules if r not in self.rules or self.rules[r].fired == 0]
+  def printme(self, top:int = None) -> str:
+    lines = ['%-18s %8s %8s %8s %8s' % ('rule set', 'calls', 'default', 'depth', 'max')]
+    for rs, c in sorted(self.sets.items(), key=lambda x: -x[1]['calls']):
+      lines.append('%-18s %8d %8d %8.2f %8d' % (rs.name, c['calls'], c['defaults'], c['depth'] / c['calls'], c['maxdepth']))
+    lines.append('')
+    lines.append('%-18s %8s %8s %10s %10s  %s' % ('rule', 'guards', 'fired', 'guard ms', 'build ms', 'pattern'))
+    ranked = sorted(self.rules.items(), key=lambda x: -(x[1].guardtime + x[1].buildtime))
+    for r, st in ranked[:top]:
+      lines.append('%-18s %8d %8d %10.3f %10.3f  %s' % (r.name(), st.guards, st.fired,
+                   1000 * st.guardtime, 1000 * st.buildtime, r.printme()))
+    dead = self.dead(list(self.sets))
+    if dead:
+      lines.append('')
+      lines.append('never fired: ' + ', '.join(r.name() for r in dead))
+    return '\n'.join(lines)
+
+profiler = RuleProfiler()
+
+
 #
 # Routines for simplifications
 #
 
-# check a and not(b)/not(a) and b 
+# check a and not(b)/not(a) and b
 def CheckNotHelper(a:Term, b:Term):
-  if (a.type() == TermType.BoolConst) and (b.type() == TermType.BoolConst):
+  if (a.ty == TermType.BoolConst) and (b.ty == TermType.BoolConst):
     return a.val() != b.val()
-  if (a.type() == TermType.Not) and (b.type() != TermType.Not):
+  if (a.ty == TermType.Not) and (b.ty != TermType.Not):
     return a.left().equals(b)
-  if (a.type() != TermType.Not) and (b.type() == TermType.Not):
+  if (a.ty != TermType.Not) and (b.ty == TermType.Not):
     return b.left().equals(a)
-  return False  
+  if cache.propositional: return Complement(a, b)
+  return False
 
 
-def DisSimpl(a:Term, b:Term):
-  
-  if ((a.type() == TermType.BoolConst) and (a.val() == True)) or \
-  ((b.type() == TermType.BoolConst) and (b.val() == True)): 
-    return BoolConstTerm(True)
-  elif (a.type() == TermType.BoolConst) and (a.val() == False): return b
-  elif (b.type() == TermType.BoolConst) and (b.val() == False): return a
-  
-  #a ∨ a = a
-  elif (a.equals(b)):
-    return a
+#
+# Truth tables of propositional terms. Every query numbers the variables of
+# its own operands in sorted order (the scope); over at most six variables a
+# term is then one 64-bit integer: bit j is its value for the assignment j,
+# where variable number k is true when bit k of j is set. Equal meaning is
+# equal tables and every check below is a single integer operation. A query
+# with a temporal operand or over more than six variables has no tables
+# (None), whatever ran before
+#
+Full = (1 << 64) - 1
+Projections = [0xAAAAAAAAAAAAAAAA, 0xCCCCCCCCCCCCCCCC, 0xF0F0F0F0F0F0F0F0,
+               0xFF00FF00FF00FF00, 0xFFFF0000FFFF0000, 0xFFFFFFFF00000000]
+Connectives = (TermType.Not, TermType.And, TermType.Or, TermType.Impl)
+PropVars = {}
+Tables = {}
+
+# sorted variable names of a propositional term, None if it is temporal
+def PropVariables(t:Term):
+  stack = [t]
+  while stack:
+    x = stack[-1]
+    if x in PropVars:
+      stack.pop()
+      continue
+    ty = x.ty
+    if ty is TermType.BoolConst: v = ()
+    elif ty is TermType.BoolVar: v = (x.v,)
+    elif ty in Connectives:
+      kids = (x.left(), x.right())[:x.childcount()]
+      pending = [k for k in kids if k not in PropVars]
+      if pending:
+        stack.extend(pending)
+        continue
+      vs = [PropVars[k] for k in kids]
+      if None in vs: v = None
+      elif len(vs) == 1 or vs[0] == vs[1]: v = vs[0]
+      else: v = tuple(sorted(set(vs[0]) | set(vs[1])))
+    else: v = None
+    PropVars[x] = v
+    stack.pop()
+  return PropVars[t]
+
+# the scope of a query over the terms, None if it has no tables
+def Scope(*terms):
+  names = set()
+  for t in terms:
+    v = PropVariables(t)
+    if v is None: return None
+    names.update(v)
+  if len(names) > len(Projections): return None
+  return tuple(sorted(names))
+
+# table of t over the scope (by default its own variables)
+def TruthTable(t:Term, scope:tuple = None):
+  if scope is None:
+    scope = Scope(t)
+    if scope is None: return None
+  stack = [t]
+  while stack:
+    x = stack[-1]
+    if (x, scope) in Tables:
+      stack.pop()
+      continue
+    ty = x.ty
+    if ty is TermType.BoolConst: v = Full if x.v else 0
+    elif ty is TermType.BoolVar: v = Projections[scope.index(x.v)]
+    else:
+      kids = (x.left(), x.right())[:x.childcount()]
+      pending = [k for k in kids if (k, scope) not in Tables]
+      if pending:
+        stack.extend(pending)
+        continue
+      a = Tables[kids[0], scope]
+      if ty is TermType.Not: v = Full ^ a
+      else: v = Combine(ty, a, Tables[kids[1], scope])
+    Tables[x, scope] = v
+    stack.pop()
+  return Tables[t, scope]
+
+def Combine(ty:TermType, a:int, b:int) -> int:
+  if ty is TermType.And: return a & b
+  if ty is TermType.Or: return a | b
+  return (Full ^ a) | b
+
+# the constant or literal of a table over the scope, None if it has none
+def Literal(table:int, scope:tuple):
+  if table == Full: return BoolConstTerm(True)
+  if table == 0: return BoolConstTerm(False)
+  for k, name in enumerate(scope):
+    if table == Projections[k]: return BoolFreeTerm(name)
+    if table == Full ^ Projections[k]: return NotTerm(BoolFreeTerm(name))
+  return None
+
+def Tautology(t:Term) -> bool:
+  return TruthTable(t) == Full
+
+def Contradiction(t:Term) -> bool:
+  return TruthTable(t) == 0
+
+# is a → b valid
+def Implies(a:Term, b:Term) -> bool:
+  scope = Scope(a, b)
+  return scope is not None and TruthTable(a, scope) & ~TruthTable(b, scope) == 0
+
+def Complement(a:Term, b:Term) -> bool:
+  scope = Scope(a, b)
+  return scope is not None and TruthTable(a, scope) ^ TruthTable(b, scope) == Full
+
+# right-nested chain of cls over the operands
+def Chain(cls, ops:list) -> Term:
+  c = ops[-1]
+  for x in reversed(ops[:-1]):
+    c = cls(x, c)
+  return c
 
-  #a ∨ ¬a = a
-  elif CheckNotHelper(a,b):
-    return BoolConstTerm(True)  
+#
+# Propositional reduction of a ∧ b, a ∨ b, a → b with propositional
+# operands: a constant, a literal or one of the operands when the table
+# allows it,
+# else the simplifier again with one operand of an ∧/∨ chain inside a or b
+# dropped when that keeps the table (this covers absorption, a ∨ (b ∧ ¬a)
+# and the like). None when nothing applies and the rules go on
+#
+def Propositional(rs:'RuleSet', args:tuple):
+  scope = Scope(*args)
+  if scope is None: return None
+  ta, tb = (TruthTable(x, scope) for x in args)
+  r = Combine(rs.op, ta, tb)
+  l = Literal(r, scope)
+  if l is not None: return l
+  if r == ta: return args[0]
+  if r == tb: return args[1]
+  for k, x in enumerate(args):
+    if x.ty is not TermType.And and x.ty is not TermType.Or: continue
+    ops = Operands(x, x.ty)
+    for i in range(len(ops)):
+      y = Chain(x.__class__, ops[:i] + ops[i + 1:])
+      t = TruthTable(y, scope)
+      if (Combine(rs.op, t, tb) if k == 0 else Combine(rs.op, ta, t)) == r:
+        return globals()[rs.name](*((y, args[1]) if k == 0 else (args[0], y)))
+  return None
 
-  #a ∨ (b ∧ a) = a
-  elif (b.type() == TermType.And) and (a.equals(b.right())):
-    return a
-  
-  #a ∨ (a ∧ b) = a
-  elif (b.type() == TermType.And) and (a.equals(b.left())):
-    return a
-  
-  # a v (b ∧ ¬a) = a v b
-  elif (b.type() == TermType.And) and CheckNotHelper(a, b.right()):
-    return DisSimpl(a, b.left()) 
-  
-  # a v (¬a ∧ b) = a v b
-  elif (b.type() == TermType.And) and CheckNotHelper(a, b.left()):
-    return DisSimpl(a, b.right()) 
-  
-  # a v (b ∧ ¬a) = a v b
-  elif (a.type() == TermType.And) and CheckNotHelper(b, a.right()):
-    return DisSimpl(b, a.left()) 
-  
-  # a v (¬a ∧ b) = a v b
-  elif (a.type() == TermType.And) and CheckNotHelper(b, a.left()):
-    return DisSimpl(b, a.right()) 
-
-  # (a ∧ ¬b) v (b ∧ a) 
-  elif (b.type() == TermType.And) and (a.type() == TermType.And) and \
-  ((a.left().equals(b.left()) and CheckNotHelper(a.right(),b.right())) or\
-  (a.left().equals(b.right()) and CheckNotHelper(a.right(),b.left()))):
-    return a.left() 
-
-  # (a ∧ ¬b) v (b ∧ a)
-  elif (b.type() == TermType.And) and (a.type() == TermType.And) and \
-  ((a.right().equals(b.left()) and CheckNotHelper(a.left(),b.right())) or\
-  (a.right().equals(b.right()) and CheckNotHelper(a.left(),b.left()))):
-    return a.right() 
-
-  # (a ∧ ¬b) v (c v (b ∧ a)) 
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and \
-       (a.type() == TermType.And) and \
-  ((a.right().equals(b.right().left()) and CheckNotHelper(a.left(),b.right().right())) or\
-  (a.right().equals(b.right().right()) and CheckNotHelper(a.left(),b.right().left()))):
-    return DisSimpl(a.right(), b.left()) 
-
-  # (a ∧ ¬b) v (c v (b ∧ a)) 
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and\
-       (a.type() == TermType.And) and \
-  ((a.left().equals(b.right().left()) and CheckNotHelper(a.right(),b.right().right())) or\
-  (a.left().equals(b.right().right()) and CheckNotHelper(a.right(),b.right().left()))):
-    return DisSimpl(a.left(), b.left()) 
-  
-  # (a ∧ ¬b) v (b v (a ∧ c)) = (a ∧ ¬b) v b
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and\
-       (a.type() == TermType.And) and CheckNotHelper(a.right(),b.left()) and\
-       (a.left().equals(b.right().left()) or a.left().equals(b.right().right())):
-    return DisSimpl(a.left(), b.left()) 
-
-  # (a ∧ ¬b) v (b v (a ∧ c)) = (a ∧ ¬b) v b
-  elif (b.type() == TermType.Or) and (b.left().type() == TermType.And) and\
-       (a.type() == TermType.And) and CheckNotHelper(a.right(),b.right()) and\
-       (a.left().equals(b.left().left()) or a.left().equals(b.left().right())):
-    return DisSimpl(a.left(), b.right()) 
-
-  # (a ∧ ¬b) v (b v (a ∧ c)) = (a ∧ ¬b) v b
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and\
-       (a.type() == TermType.And) and CheckNotHelper(a.left(),b.left()) and\
-       (a.right().equals(b.right().left()) or a.right().equals(b.right().right())):
-    return DisSimpl(a.right(), b.left()) 
-
-  # (a ∧ ¬b) v (b v (a ∧ c)) = (a ∧ ¬b) v b
-  elif (b.type() == TermType.Or) and (b.left().type() == TermType.And) and\
-       (a.type() == TermType.And) and CheckNotHelper(a.left(),b.right()) and\
-       (a.right().equals(b.left().left()) or a.right().equals(b.left().right())):
-    return DisSimpl(a.right(), b.right()) 
-
-  #a ∨ (b ∧ (a ∨ c)) = a ∨ (b ∧ c)
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.Or) and \
-  (b.right().left().equals(a)):
-    return DisSimpl(a, ConSimpl(b.left(), b.right().right())) 
-  
-  # a v (b ∧ (c v a) = a ∨ (b ∧ c)
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.Or) and \
-  (b.right().right().equals(a)):
-    return DisSimpl(a, ConSimpl(b.left(), b.right().left())) 
-  
-  #a ∨ F(a ∨ b) = F(a ∨ b)
-  elif (b.type() == TermType.F) and (b.left().type() == TermType.Or) and a.equals(b.left().left()):
-    return b
-  
-  #a ∨ (b U a) = (b U a)
-  elif (b.type() == TermType.U) and (b.right().equals(a)):
-    return b
-  
-  #G(¬a) ∨ F(a) = true
-  elif (a.type() == TermType.G) and (b.type() == TermType.F) and \
-   CheckNotHelper(a.left(), b.left()):
-    return BoolConstTerm(True)
-  
-  #a ∨ F(a) = F(a)
-  elif (b.type() == TermType.F) and (b.left().equals(a)):
-    return b
-  
-  # (G a) v a = G a
-  elif (a.type() == TermType.G) and (a.left().equals(b)): return a
-  
-  #a ∨ (a ∨ b) = a V b | a ∨ (b ∨ a) = a ∨ b
-  elif (b.type() == TermType.Or) and (b.left().equals(a) or b.right().equals(a)):
-    return b
-  
-  #G(¬a) ∨ (F(a) ∨ с) = true
-  elif (a.type() == TermType.G) and (b.type() == TermType.Or) and \
-  (b.left().type() == TermType.F) and CheckNotHelper(a.left().left(), b.left().left()):
-    return BoolConstTerm(True)
-  
-  #a ∨ (b U (a ∨ c)) = (b U (a ∨ c))
-  elif (b.type() == TermType.U) and (b.right().type() == TermType.Or) and (b.right().left().equals(a)):
-    return b  
-  
-  # a v (b ∧ (c v (c U a))) = a v (b ∧ (c U a)) = b ∧ (c U a)
-  elif (b.type() == TermType.And) and    \
-       (b.right().type() == TermType.Or) and  \
-       (b.right().right().type() == TermType.U) and  \
-       (b.right().right().right().equals(a)):
-    return ConSimpl(b.left(),b.right().right())
-   
-  # a v (b v (c v a))) = b v (c v a) 
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.Or) and (b.right().right().equals(a)):
-    return b  
-  
-  # inv v (¬trig v (inv ∧ rea)) = inv v !trig 
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and (b.right().left().equals(a) or b.right().right().equals(a)):
-    return DisSimpl(a, b.left())  
-
-  # a v (b ∧ ((c ∧ b) W a))) = (c ∧ b) W a 
-  elif (b.type() == TermType.And) and    \
-       (b.right().type() == TermType.W) and (b.right().left().type() == TermType.And) and\
-       (b.right().right().equals(a)) and (b.right().left().right().equals(b.left())):
-    return b.right()
-
-  # a v (b W (a v c)) = b W (a v c)
-  elif (b.type() == TermType.W) and (b.right().type() == TermType.Or) and (b.right().left().equals(a)):
-    return b
-  
-  # a v (b W a) = b W a
-  elif (b.type() == TermType.W) and (b.right().equals(a)):
-    return b
-  
-  # a v (a W b) =  a v b
-  elif (b.type() == TermType.W) and (b.left().equals(a)):
-    return DisSimpl(a, b.right())
-  
-  # a v (b ∧ (a W (a v c)) = a | (b & (a | c)) = a | b&a | b&c 
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.W) and (b.right().left().equals(a)) and\
-    (b.right().right().type() == TermType.Or) and (b.right().right().left().equals(a)):
-    return DisSimpl(a, ConSimpl(b.left(), b.right().right()))
-  
-  # a v (b ∧ ((d ∧ a) W (a v (b ∧ c)))) = a v (b ∧ c) 
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.W) and\
-       (b.right().left().type() == TermType.And) and (b.right().right().type() == TermType.Or) and (b.right().right().right().type() == TermType.And) and\
-       (b.right().left().right().equals(a) or b.right().left().left().equals(a)) and b.right().right().left().equals(a) and b.right().right().right().left().equals(b.left()):
-    return DisSimpl(a, b.left())
-  
-   #a v (b ∧ ((c ∧ b) W (a v (c ∧ b)))) = a v ((c ∧ b) W (a v (c ∧ b)))) = a | (b & (a | (b & c))) = a | (b & c)
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.W) and\
-       (b.right().left().type() == TermType.And) and (b.right().right().type() == TermType.Or) and\
-       (b.right().right().right().type() == TermType.And) and\
-       (b.right().left().right().equals(b.left()) or b.right().left().left().equals(b.left())) and\
-        b.right().right().left().equals(a) and\
-       (b.right().right().right().left().equals(b.left()) or b.right().right().right().right().equals(b.left())):
-    return DisSimpl(a, b.right().left())
-
-   #a v (b ∧ ((c ∧ b) W a)) = (c ∧ b) W a
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.W) and\
-       (b.right().left().type() == TermType.And) and\
-       (b.right().left().right().equals(b.left()) or b.right().left().left().equals(b.left())) and\
-        b.right().right().equals(a):
-    return b.right()
-
-   #a v (b ∧ ( b W (a v (c ∧ b)))) = a v (b W (a v (c ∧ b))))
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.W) and\
-       (b.right().right().type() == TermType.Or) and\
-       (b.right().right().right().type() == TermType.And) and\
-        b.right().left().equals(b.left()) and\
-        b.right().right().left().equals(a) and\
-       (b.right().right().right().left().equals(b.left()) or b.right().right().right().right().equals(b.left())):
-    return b.right()
-  
-   #a v (b ∧ (b W a) = a v (b W a)
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.W) and\
-        b.right().left().equals(b.left()) and\
-        b.right().right().equals(a):
-    return b.right()
-  
-  # ¬a ∨ (¬b ∨ (a ∧ (¬c W (¬b ∨ d)))) = !a | (a & (!c W (d | !b))) 
-  elif (b.type() == TermType.Or) and\
-       (b.right().type() == TermType.And) and (b.right().right().type() == TermType.W) and\
-       (b.right().right().right().type() == TermType.Or) and\
-        CheckNotHelper(a, b.right().left()) and b.left().equals(b.right().right().right().left()):
-    return ImplSimpl(b.right().left(),b.right().right())
+
+DisRules = RuleSet('DisSimpl', TermType.Or, OrTerm)
+
+DisRules.rule('true ∨ b', 'a ∨ true', to='true')
+DisRules.rule('false ∨ b', to='b')
+DisRules.rule('a ∨ false', to='a')
+
+#a ∨ a = a
+DisRules.rule('a ∨ a', to='a')
+
+#a ∨ ¬a = a
+DisRules.rule('a ∨ ~a', to='true')
+
+#a ∨ (b ∧ a) = a
+DisRules.rule('a ∨ (b ∧ a)', to='a', commute=True)
+
+# a v (b ∧ ¬a) = a v b
+DisRules.rule('a ∨ (b ∧ ~a)', to='a ∨ b', commute=True)
+
+# (b ∧ ¬a) v a = a v b
+DisRules.rule('(b ∧ ~a) ∨ a', to='a ∨ b', commute=True)
+
+# (a ∧ ¬b) v (b ∧ a)
+DisRules.rule('(a ∧ b) ∨ (a ∧ ~b)', to='a', commute=True)
+
+# (¬b ∧ a) v (c v (b ∧ a))
+DisRules.rule('(b ∧ a) ∨ (c ∨ (a ∧ ~b))', to='a ∨ c', commute=True)
+
+# (a ∧ ¬b) v (b v (a ∧ c)) = (a ∧ ¬b) v b
+DisRules.rule('(a ∧ ~b) ∨ (b ∨ (a ∧ c))', to='a ∨ b', commute=True)
+
+#a ∨ (b ∧ (a ∨ c)) = a ∨ (b ∧ c)
+DisRules.rule('a ∨ (b ∧ (a ∨ c))', to='a ∨ (b ∧ c)', commute=True)
+
+#a ∨ F(a ∨ b) = F(a ∨ b)
+DisRules.rule('a ∨ f@(F (a ∨ b))', to='f')
+
+#a ∨ (b U a) = (b U a)
+DisRules.rule('a ∨ u@(b U a)', to='u')
+
+#G(¬a) ∨ F(a) = true
+DisRules.rule('G a ∨ F ~a', to='true')
+
+#a ∨ F(a) = F(a)
+DisRules.rule('a ∨ f@(F a)', to='f')
+
+# (G a) v a = G a
+DisRules.rule('g@(G a) ∨ a', to='g')
+
+#a ∨ (a ∨ b) = a V b | a ∨ (b ∨ a) = a ∨ b
+DisRules.rule('a ∨ o@(a ∨ b)', to='o', commute=True)
+
+#G(¬a) ∨ (F(a) ∨ с) = true
+DisRules.rule('G a ∨ (F ~a ∨ c)', to='true')
+
+#a ∨ (b U (a ∨ c)) = (b U (a ∨ c))
+DisRules.rule('a ∨ u@(b U (a ∨ c))', to='u')
+
+# a v (b ∧ (c v (c U a))) = a v (b ∧ (c U a)) = b ∧ (c U a)
+DisRules.rule('a ∨ (b ∧ (c ∨ u@(d U a)))', to='b ∧ u')
+
+# a v (b v (c v a))) = b v (c v a)
+DisRules.rule('a ∨ o@(b ∨ (c ∨ a))', to='o')
+
+# inv v (¬trig v (inv ∧ rea)) = inv v !trig
+DisRules.rule('a ∨ (b ∨ (a ∧ c))', to='a ∨ b', commute=True)
+
+# a v (b ∧ ((c ∧ b) W a))) = (c ∧ b) W a
+DisRules.rule('a ∨ (b ∧ w@((c ∧ b) W a))', to='w', commute=True)
+
+# a v (b W (a v c)) = b W (a v c)
+DisRules.rule('a ∨ w@(b W (a ∨ c))', to='w')
+
+# a v (b W a) = b W a
+DisRules.rule('a ∨ w@(b W a)', to='w')
+
+# a v (a W b) =  a v b
+DisRules.rule('a ∨ (a W b)', to='a ∨ b')
+
+# a v (b ∧ (a W (a v c)) = a | (b & (a | c)) = a | b&a | b&c
+DisRules.rule('a ∨ (b ∧ (a W o@(a ∨ c)))', to='a ∨ (b ∧ o)')
+
+# a v (b ∧ ((d ∧ a) W (a v (b ∧ c)))) = a v (b ∧ c)
+DisRules.rule('a ∨ (b ∧ ((d ∧ a) W (a ∨ (b ∧ c))))',
+              'a ∨ (b ∧ ((a ∧ d) W (a ∨ (b ∧ c))))', to='a ∨ b')
+
+#a v (b ∧ ((c ∧ b) W (a v (c ∧ b)))) = a v ((c ∧ b) W (a v (c ∧ b)))) = a | (b & (a | (b & c))) = a | (b & c)
+DisRules.rule('a ∨ (b ∧ (l@(c ∧ b) W (a ∨ (b ∧ d))))',
+              'a ∨ (b ∧ (l@(b ∧ c) W (a ∨ (b ∧ d))))',
+              'a ∨ (b ∧ (l@(c ∧ b) W (a ∨ (d ∧ b))))',
+              'a ∨ (b ∧ (l@(b ∧ c) W (a ∨ (d ∧ b))))', to='a ∨ l')
+
+#a v (b ∧ ( b W (a v (c ∧ b)))) = a v (b W (a v (c ∧ b))))
+DisRules.rule('a ∨ (b ∧ w@(b W (a ∨ (b ∧ c))))', to='w', commute=True)
+
+#a v (b ∧ (b W a) = a v (b W a)
+DisRules.rule('a ∨ (b ∧ w@(b W a))', to='w')
+
+# ¬a ∨ (¬b ∨ (a ∧ (¬c W (¬b ∨ d)))) = !a | (a & (!c W (d | !b)))
+DisRules.rule('~a ∨ (b ∨ (a ∧ w@(c W (b ∨ d))))', to='a → w')
 
 # ¬a ∨ (¬b ∨ (a ∧ (c W ¬b)))
-  elif (b.type() == TermType.Or) and\
-       (b.right().type() == TermType.And) and (b.right().right().type() == TermType.W) and\
-        CheckNotHelper(a, b.right().left()) and b.left().equals(b.right().right().right()):
-    return ImplSimpl(b.right().left(),b.right().right())
+DisRules.rule('~a ∨ (b ∨ (a ∧ w@(c W b)))', to='a → w')
 
+# (a ∧ ¬b) ∨ (¬a ∨ (b ∧ (a W (¬a ∨ c)))) = true
+DisRules.rule('(a ∧ b) ∨ (~a ∨ (~b ∧ (a W (~a ∨ c))))', to='true')
 
-# (a ∧ ¬b) ∨ (¬a ∨ (b ∧ (a W (¬a ∨ c)))) = true 
-  elif (a.type() == TermType.And) and (b.type() == TermType.Or) and\
-       (b.right().type() == TermType.And) and (b.right().right().type() == TermType.W) and\
-       (b.right().right().right().type() == TermType.Or) and\
-        CheckNotHelper(a.left(), b.left()) and a.left().equals(b.right().right().left()) and\
-        CheckNotHelper(a.left(), b.right().right().right().left()) and\
-        CheckNotHelper(a.right(), b.right().left()):
-    return BoolConstTerm(True)
+def DisSimpl(a:Term, b:Term):
+  return DisRules.apply(a, b)
 
 
-  else: 
-    return OrTerm(a, b)
+# t without its leading pairs of ¬, in a loop
+def EvenNot(t:Term) -> Term:
+  while t.ty is TermType.Not and t.a.ty is TermType.Not:
+    t = t.a.a
+  return t
 
+def DropNotNot(env):
+  '''EvenNot(a) ∧ EvenNot(b)'''
+  return ConSimpl(EvenNot(env['a']), EvenNot(env['b']))
 
+ConRules = RuleSet('ConSimpl', TermType.And, AndTerm)
 
-def ConSimpl(a:Term, b:Term):
+# ¬ (¬ a), the pairs are dropped at once so a deep ¬¬ chain does not
+# re-enter the simplifier once per pair
+ConRules.rule('(¬¬a) ∧ b', to=DropNotNot)
+ConRules.rule('a ∧ (¬¬b)', to=DropNotNot)
 
-  # ¬ (¬ a)
-  if (a.type() == TermType.Not) and (a.left().type() == TermType.Not):
-    a = a.left().left()
-  if (b.type() == TermType.Not) and (b.left().type() == TermType.Not):
-    b = b.left().left()
-  
-  if ((a.type() == TermType.BoolConst) and (a.val() == False)) or \
-  ((b.type() == TermType.BoolConst) and (b.val() == False)): 
-    return BoolConstTerm(False)
-  elif (a.type() == TermType.BoolConst) and (a.val() == True): 
-    return b
-  elif (b.type() == TermType.BoolConst) and (b.val() == True): 
-    return a
-  elif (a.type() == TermType.Not) and (a.left().equals(b)): 
-    return BoolConstTerm(False)
-  elif (b.type() == TermType.Not) and (b.left().equals(a)): 
-    return BoolConstTerm(False)
-
-  # a ∧ a = a
-  elif a.equals(b):
-    return a  
-  
-  # a ∧ (a ∧ b) = a ∧ (b ∧ a)
-  elif (b.type() == TermType.And) and (b.left().equals(a) or b.right().equals(a)): 
-    return b
-  
-  # ¬a ∧ (a ∧ b) = false
-  elif (b.type() == TermType.And) and (CheckNotHelper(b.left(), a) or CheckNotHelper(b.right(),a)): 
-    return BoolConstTerm(False)
-  
-  # (¬ a) ∧ (a v b) = (¬ a) ∧ b
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (a.left().equals(b.left())): 
-    return ConSimpl(a,b.right())
+ConRules.rule('false ∧ b', 'a ∧ false', to='false')
+ConRules.rule('true ∧ b', to='b')
+ConRules.rule('a ∧ true', to='a')
+ConRules.rule('(¬a) ∧ a', to='false')
+ConRules.rule('a ∧ (¬a)', to='false')
 
-  # (¬ a) ∧ (b v a) = (¬ a) ∧ b
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (a.left().equals(b.right())): 
-    return ConSimpl(a,b.left())  
-  
-  # a ∧ (a v b) = a
-  elif (b.type() == TermType.Or) and (a.equals(b.left()) or a.equals(b.right())): 
-    return a
-  
-  # (¬a) ∧ (b v (a ∧ c)) = (¬a) ∧ b
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and CheckNotHelper(a, (b.right().left())): 
-    return ConSimpl(a,b.left())
-  
-  # a ∧ (¬a W b) = a ∧ b
-  elif (b.type() == TermType.W) and CheckNotHelper(a, b.left()): 
-    return ConSimpl(a, b.right())
-  
-  # a ∧ G(¬a)
-  elif (b.type() == TermType.G) and CheckNotHelper(a, b.left()): 
-    return BoolConstTerm(False)
-  
-  # a ∧ G (b ∧ ¬a) = false = ¬a ∧ G (a ∧ b)
-  elif (b.type() == TermType.G) and (b.left().type() == TermType.And) and\
-     (CheckNotHelper(a, b.left().right()) or CheckNotHelper(a, b.left().left())): 
-    return BoolConstTerm(False)  
-
-  # a ∧ G(a)
-  elif (b.type() == TermType.G) and a.equals(b.left()): 
-    return b
-  
-    # a ∧ G(b ∧ a)
-  elif (b.type() == TermType.G) and (b.left().type() == TermType.And) and (a.equals(b.left().right()) or a.equals(b.left().left())): 
-    return b
-
-  # a ∧ ((b ∧ ¬a) W c) = a ∧ c
-  elif (b.type() == TermType.W) and\
-    (b.left().type() == TermType.And) and\
-       CheckNotHelper(a, b.left().right()): 
-    return ConSimpl(a, b.right())
-  
-  # ¬a ∧ ((a ∧ b) W (a ∧ c))) = false
-  elif (b.type() == TermType.W) and\
-    (b.left().type() == TermType.And) and (b.right().type() == TermType.And) and\
-       CheckNotHelper(a, b.left().left()) and CheckNotHelper(a, b.right().left()): 
-    return BoolConstTerm(False)
-
-  # ¬a ∧ ((a ∧ b) W (c v (a ∧ d)))) = ¬a ∧ c
-  elif (b.type() == TermType.W) and\
-    (b.left().type() == TermType.And) and (b.right().type() == TermType.Or) and (b.right().right().type() == TermType.And) and\
-       CheckNotHelper(a, b.left().left()) and CheckNotHelper(a, b.right().right().left()): 
-    return ConSimpl(a,b.right().left())
-  
-  # ¬a ∧ ((a ∧ b) W c) = ¬a ∧ c
-  elif (b.type() == TermType.W) and\
-    (b.left().type() == TermType.And) and\
-       CheckNotHelper(a, b.left().left()): 
-    return ConSimpl(a,b.right())
-  
-  # a ∧ (b W (a v с)))
-  elif (b.type() == TermType.W) and\
-    (b.right().type() == TermType.Or) and\
-       a.equals(b.right().left()): 
-    return a
-  
-  # a ∧ ((a ∧ b) W (a ∧ c)) = (a ∧ b) W (a ∧ c)
-  elif (b.type() == TermType.W) and\
-    (b.right().type() == TermType.And) and (b.left().type() == TermType.And) and\
-       (a.equals(b.left().left()) or a.equals(b.left().right())) and\
-       (a.equals(b.right().left()) or a.equals(b.right().right())): 
-    return b
+# a ∧ a = a
+ConRules.rule('a ∧ a', to='a')
+
+# a ∧ (a ∧ b) = a ∧ (b ∧ a)
+ConRules.rule('a ∧ n@(a ∧ b)', to='n', commute=True)
+
+# ¬a ∧ (a ∧ b) = false
+ConRules.rule('a ∧ (~a ∧ b)', to='false', commute=True)
+
+# (¬ a) ∧ (a v b) = (¬ a) ∧ b
+ConRules.rule('n@(¬a) ∧ (a ∨ b)', to='n ∧ b', commute=True)
+
+# a ∧ (a v b) = a
+ConRules.rule('a ∧ (a ∨ b)', to='a', commute=True)
+
+# (¬a) ∧ (b v (a ∧ c)) = (¬a) ∧ b
+ConRules.rule('a ∧ (b ∨ (~a ∧ c))', to='a ∧ b')
+
+# a ∧ (¬a W b) = a ∧ b
+ConRules.rule('a ∧ (~a W b)', to='a ∧ b')
+
+# a ∧ G(¬a)
+ConRules.rule('a ∧ G ~a', to='false')
+
+# a ∧ G (b ∧ ¬a) = false = ¬a ∧ G (a ∧ b)
+ConRules.rule('a ∧ G (b ∧ ~a)', to='false', commute=True)
+
+# a ∧ G(a)
+ConRules.rule('a ∧ g@(G a)', to='g')
 
-  # a ∧ (a W a ∧ c)) = a W (a ∧ c)
-  elif (b.type() == TermType.W) and\
-    (b.right().type() == TermType.And) and\
-       a.equals(b.left()) and\
-       (a.equals(b.right().left()) or a.equals(b.right().right())): 
-    return b
+# a ∧ G(b ∧ a)
+ConRules.rule('a ∧ g@(G (b ∧ a))', to='g', commute=True)
 
-  # a ∧ (b W a)
-  elif (b.type() == TermType.W) and a.equals(b.right()): 
-    return a
+# a ∧ ((b ∧ ¬a) W c) = a ∧ c
+ConRules.rule('a ∧ ((b ∧ ~a) W c)', to='a ∧ c', commute=True)
 
-  else: return AndTerm(a, b)
+# ¬a ∧ ((a ∧ b) W (a ∧ c))) = false
+ConRules.rule('a ∧ ((~a ∧ b) W (~a ∧ c))', to='false')
+
+# ¬a ∧ ((a ∧ b) W (c v (a ∧ d)))) = ¬a ∧ c
+ConRules.rule('a ∧ ((~a ∧ b) W (c ∨ (~a ∧ d)))', to='a ∧ c')
+
+# a ∧ (b W (a v с)))
+ConRules.rule('a ∧ (b W (a ∨ c))', to='a')
+
+# a ∧ ((a ∧ b) W (a ∧ c)) = (a ∧ b) W (a ∧ c)
+ConRules.rule('a ∧ w@((a ∧ b) W (a ∧ c))', to='w', commute=True)
+
+# a ∧ (a W a ∧ c)) = a W (a ∧ c)
+ConRules.rule('a ∧ w@(a W (a ∧ c))', to='w', commute=True)
+
+# a ∧ (b W a)
+ConRules.rule('a ∧ (b W a)', to='a')
+
+def ConSimpl(a:Term, b:Term):
+  return ConRules.apply(a, b)
 
 
 def No(a:Term):
-  if (a.type() == TermType.BoolConst): 
+  if (a.ty == TermType.BoolConst):
     return BoolConstTerm(not a.val())
-  else: 
-    return NotTerm(a)
+  # ¬¬a = a, all pairs at once
+  if a.ty is TermType.Not: return EvenNot(a.a)
+  if cache.propositional:
+    scope = Scope(a)
+    l = None if scope is None else Literal(Full ^ TruthTable(a, scope), scope)
+    if l is not None: return l
+  return NotTerm(a)
+
+
+ImplRules = RuleSet('ImplSimpl', TermType.Impl, ImplTerm)
+
+ImplRules.rule('a@true → b', 'a@false → b', 'a → b@true', 'a → b@false', to='¬a ∨ b')
+
+# ¬a -> a = a
+ImplRules.rule('~b → b', to='b')
+
+# (¬rel ->)
+ImplRules.rule("¬'rel' → b", to="'rel' ∨ b")
+
+# ¬a -> a ∨ b = b
+ImplRules.rule('~a → o@(a ∨ b)', to='o')
+
+# a -> a ∨ b = true
+ImplRules.rule('a → (a ∨ b)', to='true', commute=True)
+
+# a → (a ∧ b) = a → b
+ImplRules.rule('a → (a ∧ b)', to='a → b', commute=True)
+
+# a -> a = true
+ImplRules.rule('a → a', to='true')
+
+# c∧¬a -> a
+ImplRules.rule('(c ∧ ~a) → a', to='c → a')
+
+# c∧¬a -> a ∨ b
+ImplRules.rule('(c ∧ ~a) → o@(a ∨ b)', to='c → o')
+
+# trig → (rel v (inv ∧ ¬trig)) = trig → rel
+ImplRules.rule('a → (b ∨ (~a ∧ c))', to='a → b', commute=True)
 
+# ¬a -> F a
+ImplRules.rule('~a → f@(F a)', to='f')
+
+# a → (G ¬a)
+ImplRules.rule('~b → G b', to='b')
+
+# c∧¬a -> F a
+ImplRules.rule('(c ∧ ~a) → f@(F a)', to='c → f')
+
+# ¬a -> F(a ∨ b)
+ImplRules.rule('~a → f@(F (a ∨ b))', to='f')
+
+# c∧¬a -> F(a ∨ b)
+ImplRules.rule('(c ∧ ~a) → f@(F (a ∨ b))', to='c → f')
+
+# ¬a -> b W a = b W a
+ImplRules.rule('~a → w@(b W a)', to='w')
+
+# (a ∧ ¬b) → (b W c) = (a ∧ ¬b) → c
+ImplRules.rule('n@(a ∧ ~b) → (b W c)', to='n → c', commute=True)
+
+# a → (b ∧ ¬a) W c = a → c
+ImplRules.rule('a → ((~a ∧ b) W c)', to='a → c', commute=True)
+
+# a → (b W (a ∧ b)) = a → b
+ImplRules.rule('a → (b W (a ∧ b))', 'a → (b@a W (a ∧ c))', to='a → b', commute=True)
+
+# ¬a -> b W (a ∨ c) = b W (a ∨ c)
+ImplRules.rule('a → w@(b W (~a ∨ c))', 'a → w@(b W (a ∨ c))', to='w', commute=True)
+
+# a -> b W (a ∨ c) = true
+ImplRules.rule('a → (b W (a ∨ c))', to='true', commute=True)
+
+# c∧¬a -> b W a = c -> b W a
+ImplRules.rule('(c ∧ ~a) → w@(b W a)', to='c → w')
+
+# c∧¬a -> b W (a ∨ d) = c -> b W (a ∨ d)
+ImplRules.rule('(c ∧ ~a) → w@(b W (a ∨ d))', to='c → w')
+
+# a → (¬a W b) = a → b
+ImplRules.rule('a → (~a W b)', to='a → b')
+
+# (a ∧ ¬b) → (c W (d W b)) = !a | (c W (d W b))
+ImplRules.rule('(a ∧ ~b) → w@(c W (d W b))', to='a → w')
+
+# a → (b v (a ∧ (c W (b v (e ∧ d))))) = ¬a v (a ∧ (c W (b v (d ∧ e))))
+ImplRules.rule('a → (b ∨ r@(a ∧ (c W (b ∨ d))))', to='a → r')
+
+# a → (b v (a ∧ (c W b))) = ¬a v (a ∧ (c W b))
+ImplRules.rule('a → (b ∨ r@(a ∧ (c W b)))', to='a → r')
 
 def ImplSimpl(a:Term, b:Term):
-  if ((a.type() == TermType.BoolConst) or (b.type() == TermType.BoolConst)):
-    return DisSimpl(No(a), b)
-  
-  # ¬a -> a = a
-  elif CheckNotHelper(a, b): 
-    return b
-  
-  # (¬rel ->)
-  elif (a.type() == TermType.Not) and (a.left().type() == TermType.BoolVar):
-        if (a.left().val() == 'rel'): return DisSimpl(a.left(),b)
-  
-  # ¬a -> a ∨ b = b
-  elif ((b.type() == TermType.Or) and CheckNotHelper(a, b.left())): 
-    return b
+  return ImplRules.apply(a, b)
 
-  # a -> a ∨ b = true
-  elif ((b.type() == TermType.Or) and (a.equals(b.left()) or a.equals(b.right()))): 
-    return BoolConstTerm(True)
-  
-  # a → (a ∧ b) = a → b  
-  elif (b.type() == TermType.And) and a.equals(b.left()): 
-    return ImplSimpl(a, b.right())
-
-  elif (b.type() == TermType.And) and a.equals(b.right()): 
-    return ImplSimpl(a, b.left())
-      
-  # a -> a = true
-  elif a.equals(b): 
-    return BoolConstTerm(True)
-
-  # c∧¬a -> a 
-  elif ((a.type() == TermType.And) and CheckNotHelper(a.right(),b)): 
-    return ImplSimpl(a.left(), b)
-  
-  # c∧¬a -> a ∨ b
-  elif ((a.type() == TermType.And) and (b.type() == TermType.Or) and CheckNotHelper(a.right(),b.left())): 
-    return ImplSimpl(a.left(), b)
-  
-  # trig → (rel v (inv ∧ ¬trig)) = trig → rel 
-  elif ((b.type() == TermType.Or) and (b.right().type() == TermType.And) and\
-        (CheckNotHelper(a,b.right().left()) or CheckNotHelper(a,b.right().right()))): 
-    return ImplSimpl(a, b.left())
-  
-  # ¬a -> F a
-  elif ((b.type() == TermType.F) and CheckNotHelper(a, b.left())): 
-    return b
-  
-  # a → (G ¬a)
-  elif ((b.type() == TermType.G) and CheckNotHelper(a, b.left())): 
-    return b.left()
-  
-  # c∧¬a -> F a
-  elif ((a.type() == TermType.And) and (b.type() == TermType.F) and CheckNotHelper(a.right(),b.left())): 
-    return ImplSimpl(a.left(), b)
-  
-  # ¬a -> F(a ∨ b)
-  elif ((b.type() == TermType.F) and (b.left().type() == TermType.Or) and CheckNotHelper(a, b.left().left())): 
-    return b
-  
-  # c∧¬a -> F(a ∨ b)
-  elif (a.type() == TermType.And) and (b.type() == TermType.F) and (b.left().type() == TermType.Or) and \
-        CheckNotHelper(a.right(), b.left().left()): 
-    return ImplSimpl(a.left(), b)
-  
-  # ¬a -> b W a = b W a
-  elif (b.type() == TermType.W) and CheckNotHelper(a, b.right()): 
-    return b  
-  
-  # (a ∧ ¬b) → (b W c) = (a ∧ ¬b) → c
-  elif (b.type() == TermType.W) and (a.type() == TermType.And) and\
-    (CheckNotHelper(a.right(), b.left()) or CheckNotHelper(a.left(), b.left())):
-    return ImplSimpl(a, b.right())    
-
-  # a → (b ∧ ¬a) W c = a → c
-  elif (b.type() == TermType.W) and (b.left().type() == TermType.And) and\
-    (CheckNotHelper(a, b.left().left()) or CheckNotHelper(a, b.left().right())):
-    return ImplSimpl(a, b.right())    
-
-
-  # a → (b W (a ∧ b)) = a → b
-  elif (b.type() == TermType.W) and (b.right().type() == TermType.And) and\
-        (a.equals(b.right().left()) or a.equals(b.right().right())) and\
-        (b.left().equals(b.right().left()) or b.left().equals(b.right().right())): 
-    return ImplSimpl(a, b.left())    
-  
-  # ¬a -> b W (a ∨ c) = b W (a ∨ c) 
-  elif (b.type() == TermType.W) and (b.right().type() == TermType.Or ) and\
-        ((CheckNotHelper(a, b.right().left())) or CheckNotHelper(a, b.right().right()) or\
-         a.equals(b.right().left()) or a.equals(b.right().right())):
-    return b  
-
-  # a -> b W (a ∨ c) = true
-  elif (b.type() == TermType.W) and (b.right().type() == TermType.Or ) and\
-         (a.equals(b.right().left()) or a.equals(b.right().right())):
-    return BoolConstTerm(True)  
-
-  # c∧¬a -> b W a = c -> b W a
-  elif ((a.type() == TermType.And) and (b.type() == TermType.W) and CheckNotHelper(a.right(), b.right())): 
-    return ImplSimpl(a.left(), b)  
-  
-  
-  # c∧¬a -> b W (a ∨ d) = c -> b W (a ∨ d)
-  elif ((a.type() == TermType.And) and (b.type() == TermType.W) and (b.right().type() == TermType.Or ) and\
-        CheckNotHelper(a.right(), b.right().left())):
-    return ImplSimpl(a.left(), b)  
-  
-  # a → (¬a W b) = a → b
-  elif ((b.type() == TermType.W) and CheckNotHelper(a, b.left())): 
-    return ImplSimpl(a, b.right())  
-  
-  # (a ∧ ¬b) → (c W (d W b)) = !a | (c W (d W b))
-  elif ((a.type() == TermType.And) and (b.type() == TermType.W) and\
-         (b.right().type() == TermType.W) and\
-         CheckNotHelper(a.right(), b.right().right())): 
-    return ImplSimpl(a.left(), b)
-
-
-  # a → (b v (a ∧ (c W (b v (e ∧ d))))) = ¬a v (a ∧ (c W (b v (d ∧ e))))
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and\
-       (b.right().right().type() == TermType.W) and (b.right().right().right().type() == TermType.Or) and\
-         a.equals(b.right().left()) and b.left().equals(b.right().right().right().left()): 
-    return ImplSimpl(a, b.right())
-
-  # a → (b v (a ∧ (c W b))) = ¬a v (a ∧ (c W b))
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.And) and\
-       (b.right().right().type() == TermType.W) and\
-         a.equals(b.right().left()) and b.left().equals(b.right().right().right()): 
-    return ImplSimpl(a, b.right())
-  
-  else:
-    return ImplTerm(a, b)
-  
 
 def FutureSimpl(a:Term):
-  if (a.type() == TermType.BoolConst): return a
+  if (a.ty == TermType.BoolConst): return a
   else: return FTerm(a)
-  
 
 
+def KeepGloballyFuture(env):
+  '''GF a'''
+  return GTerm(env['f'])
 
-def GloballySimpl(a:Term):
-  if (a.type() == TermType.BoolConst): return a
-  
-  #G(F(a)) = GF(a)
-  elif (a.type() == TermType.F): return GTerm(a)
-  
-  #G(G(a)) = G(a)
-  elif (a.type() == TermType.G): return GloballySimpl(a.left())
+GloballyRules = RuleSet('GloballySimpl', TermType.G, GTerm)
 
-  # G ((G a) v a) = G(a)
-  elif (a.type() == TermType.Or) and (a.left().type() == TermType.G) and (a.left().left().equals(a.right())): return GloballySimpl(a.right())
-  
-  # G (¬a ∧ (b W a)) = G (¬a ∧ b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
-    CheckNotHelper(a.left(),a.right().right()):
-      return GloballySimpl(ConSimpl(a.left(), a.right().left()))
-  
-  # G (a W (b ∧ a)) = G a
-  elif (a.type() == TermType.W) and (a.right().type() == TermType.And) and \
-    (a.left().equals(a.right().right()) or a.left().equals(a.right().left())):
-      return GloballySimpl(a.left())
-  
-  # G (a ∧ (¬b W b)) = G a
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
-    CheckNotHelper(a.right().left(),a.right().right()):
-      return GloballySimpl(a.left())
-
-  # G (a ∧ ((b ∧ (¬ c)) W (c ∧ b))) = G (a ∧ b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().left().type() == TermType.And) and (a.right().right().type() == TermType.And) and \
-    CheckNotHelper(a.right().left().right(),a.right().right().left()) and a.right().left().left().equals(a.right().right().right()):
-      return GloballySimpl(ConSimpl(a.left(),a.right().left().left()))
-
-  # G ((¬ a) ∧ F a) = false
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.F) and \
-    CheckNotHelper(a.left(),a.right().left()):
-      return BoolConstTerm(False)
-
-  # G ((¬ a) ∧ F (a ∨ b)) = G ((¬ a) ∧ F b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.F) and (a.right().left().type() == TermType.Or) and \
-    CheckNotHelper(a.left(),a.right().left().left()):
-      return GloballySimpl(ConSimpl(a.left(), FutureSimpl(a.right().left().right())))
-
-  # G ((¬ a) ∧ ( b W (a ∨ c))) = G ((¬ a) ∧ ( b W c ))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.Or) and \
-    CheckNotHelper(a.left(),a.right().right().left()):
-      return GloballySimpl(ConSimpl(a.left(), WeakUntilSimpl(a.right().left(),a.right().right().right())))
-  
-  # G ((¬ a) ∧ (b W (c ∧ (F a)))) = G ((¬ a) ∧ G b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-       (a.right().right().right().type() == TermType.F) and CheckNotHelper(a.left(),a.right().right().right().left()):
-      return GloballySimpl(ConSimpl(a.left(), a.right().left()))
-
-  # G ((¬ a) ∧ (b W (c ∧ (F (a v d))))) = G ((¬ a) ∧ (b W (c ∧ (F d))))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-       (a.right().right().right().type() == TermType.F) and (a.right().right().right().left().type() == TermType.Or) and CheckNotHelper(a.left(),a.right().right().right().left().left()):
-      return GloballySimpl(ConSimpl(a.left(), WeakUntilSimpl(a.right().left(), ConSimpl(a.right().right().left(), FutureSimpl(a.right().right().right().left().right())))))
-
-  # G ((a ∧ (¬ b)) W (b ∧ (G a))) = G (a)
-  elif (a.type() == TermType.W) and (a.left().type() == TermType.And) and (a.right().type() == TermType.And) and (a.right().right().type() == TermType.G) and \
-       a.left().left().equals(a.right().right().left()) and CheckNotHelper(a.left().right(),a.right().left()):
-      return GloballySimpl(a.right().right())
-
-  # G ((a ∧ (¬ b)) W (b ∧ a)) = G (a)
-  elif (a.type() == TermType.W) and (a.left().type() == TermType.And) and (a.right().type() == TermType.And) and \
-       a.left().left().equals(a.right().right()) and CheckNotHelper(a.left().right(),a.right().left()):
-      return GloballySimpl(a.right().right())
-  
-  # G ((¬a) ∧ (b W ((¬a) ∧ c))) = G ((¬ a) ∧ ( b W c ))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-        (a.left().type() == TermType.Not) and (a.right().right().left().type() == TermType.Not) and \
-         a.left().left().equals(a.right().right().left().left()):
-      return GloballySimpl(ConSimpl(a.left(), WeakUntilSimpl(a.right().left(),a.right().right().right())))
-  
-  # G (¬a ∧ (¬a W (¬a ∧ b))) = G (¬a ∧ (true W b)) = G(¬a) 
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-        (a.left().type() == TermType.Not) and (a.right().right().left().type() == TermType.Not) and (a.right().left().type() == TermType.Not) and\
-        a.left().left().equals(a.right().right().left().left()) and a.left().left().equals(a.right().left().left()):
-      return GloballySimpl(a.left())
-  
-  # G (¬a ∧ (¬a W b)) = G (¬a ∧ (true W b)) = G(¬a)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
-        (a.left().type() == TermType.Not) and (a.right().left().type() == TermType.Not) and\
-        a.left().left().equals(a.right().left().left()):
-      return GloballySimpl(a.left())
-  
-  # G (¬a W (b v a)) = true
-  elif (a.type() == TermType.W) and (a.right().type() == TermType.Or) and\
-        (CheckNotHelper(a.left(), a.right().right()) or CheckNotHelper(a.left(), a.right().left())):
-      return BoolConstTerm(True)
-  
-  # G (¬a W (G a)) = G(a -> Ga)
-  elif (a.type() == TermType.W) and (a.right().type() == TermType.G) and \
-        CheckNotHelper(a.left(), a.right().left()):
-      return GloballySimpl(ImplSimpl(a.right().left(), GloballySimpl(a.right().left())))  
-  
-  # G (a W (G b)) = G(¬a -> G(b))
-  elif (a.type() == TermType.W) and (a.right().type() == TermType.G):
-      return GloballySimpl(ImplSimpl(No(a.left()), a.right()))
-  
-  # G ((a ∧ ¬b) W (G (a ∧ b))) = G(¬(a | b) -> G(a & b)) != G(a ∧ ¬b) v FG(a ∧ b)
-  elif (a.type() == TermType.W) and (a.right().type() == TermType.G) and \
-       (a.left().type() == TermType.And) and (a.right().left().type() == TermType.And) and \
-        CheckNotHelper(a.left().right(), a.right().left().right()) and\
-        a.left().left().equals(a.right().left().left()):
-      return GloballySimpl(ImplSimpl(No(a.left())), a.right())  
-
-  # G (a ∧ ((a ∧ b) W (a ∧ c))) = G(a & (b | c)) != G (a ∧ (b W c))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
-        (a.right().left().type() == TermType.And) and (a.right().right().type() == TermType.And) and\
-        a.left().equals(a.right().left().left()) and a.left().equals(a.right().right().left()):
-      return GloballySimpl(ConSimpl(a.left(), DisSimpl(a.right().left().right(),a.right().right().right())))
-
-  # G (a ∧ (a W (a ∧ b))) = G a
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
-    (a.right().right().type() == TermType.And) and\
-    a.left().equals(a.right().left()) and a.left().equals(a.right().right().left()):
-      return GloballySimpl(a.left())
-
-  # G (a W (b ∧ (G a))) = G a
-  elif (a.type() == TermType.W) and (a.right().type() == TermType.And) and \
-    (a.right().right().type() == TermType.G) and\
-    a.left().equals(a.right().right().left()):
-      return GloballySimpl(a.left())
-  
-  # G (a W b) = G(a v b)
-  elif (a.type() == TermType.W):
-      return GloballySimpl(DisSimpl(a.left(),a.right()))
+GloballyRules.rule('G a@true', 'G a@false', to='a')
 
-# G(a v ((¬a ∧ ¬b) W (b W a))) = G((¬b ∧ ¬a) v (b W a))
-  elif (a.type() == TermType.Or) and (a.right().type() == TermType.W) and\
-       (a.right().left().type() == TermType.And) and (a.right().right().type() == TermType.W) and\
-       CheckNotHelper(a.left(), a.right().left().left()) and a.left().equals(a.right().right().right()) and\
-       CheckNotHelper(a.right().left().right(), a.right().right().left()):
-      return GloballySimpl(ImplSimpl(DisSimpl(a.left(),a.right().right().left()),a.right().right()))
+#G(F(a)) = GF(a)
+GloballyRules.rule('G f@(F a)', to=KeepGloballyFuture)
+
+#G(G(a)) = G(a)
+GloballyRules.rule('G G a', to='G a')
+
+# G ((G a) v a) = G(a)
+GloballyRules.rule('G (G a ∨ a)', to='G a')
+
+# G (¬a ∧ (b W a)) = G (¬a ∧ b)
+GloballyRules.rule('G (a ∧ (b W ~a))', to='G (a ∧ b)')
+
+# G (a W (b ∧ a)) = G a
+GloballyRules.rule('G (a W (b ∧ a))', to='G a', commute=True)
+
+# G (a ∧ (¬b W b)) = G a
+GloballyRules.rule('G (a ∧ (b W ~b))', to='G a')
+
+# G (a ∧ ((b ∧ (¬ c)) W (c ∧ b))) = G (a ∧ b)
+GloballyRules.rule('G (a ∧ ((b ∧ c) W (~c ∧ b)))', to='G (a ∧ b)')
+
+# G ((¬ a) ∧ F a) = false
+GloballyRules.rule('G (a ∧ F ~a)', to='false')
 
+# G ((¬ a) ∧ F (a ∨ b)) = G ((¬ a) ∧ F b)
+GloballyRules.rule('G (a ∧ F (~a ∨ b))', to='G (a ∧ F b)')
 
-# G (a v (b W c W a))) = G(b v (c W a)) 
-  elif (a.type() == TermType.Or) and (a.right().type() == TermType.W) and\
-       (a.right().right().type() == TermType.W) and\
-        a.left().equals(a.right().right().right()):
-      return GloballySimpl(DisSimpl(a.left(),a.right().right()))
+# G ((¬ a) ∧ ( b W (a ∨ c))) = G ((¬ a) ∧ ( b W c ))
+GloballyRules.rule('G (a ∧ (b W (~a ∨ c)))', to='G (a ∧ (b W c))')
+
+# G ((¬ a) ∧ (b W (c ∧ (F a)))) = G ((¬ a) ∧ G b)
+GloballyRules.rule('G (a ∧ (b W (c ∧ F ~a)))', to='G (a ∧ b)')
+
+# G ((¬ a) ∧ (b W (c ∧ (F (a v d))))) = G ((¬ a) ∧ (b W (c ∧ (F d))))
+GloballyRules.rule('G (a ∧ (b W (c ∧ F (~a ∨ d))))', to='G (a ∧ (b W (c ∧ F d)))')
+
+# G ((a ∧ (¬ b)) W (b ∧ (G a))) = G (a)
+GloballyRules.rule('G ((a ∧ b) W (~b ∧ g@(G a)))', to='G g')
+
+# G ((a ∧ (¬ b)) W (b ∧ a)) = G (a)
+GloballyRules.rule('G ((a ∧ b) W (~b ∧ a))', to='G a')
+
+# G ((¬a) ∧ (b W ((¬a) ∧ c))) = G ((¬ a) ∧ ( b W c ))
+GloballyRules.rule('G (n@(¬a) ∧ (b W (n ∧ c)))', to='G (n ∧ (b W c))')
+
+# G (¬a ∧ (¬a W (¬a ∧ b))) = G (¬a ∧ (true W b)) = G(¬a)
+GloballyRules.rule('G (n@(¬a) ∧ (n W (n ∧ b)))', to='G n')
+
+# G (¬a ∧ (¬a W b)) = G (¬a ∧ (true W b)) = G(¬a)
+GloballyRules.rule('G (n@(¬a) ∧ (n W b))', to='G n')
+
+# G (¬a W (b v a)) = true
+GloballyRules.rule('G (a W (b ∨ ~a))', to='true', commute=True)
+
+# G (¬a W (G a)) = G(a -> Ga)
+GloballyRules.rule('G (~a W G a)', to='G (a → G a)')
+
+# G (a W (G b)) = G(¬a -> G(b))
+GloballyRules.rule('G (a W g@(G b))', to='G (¬a → g)')
+
+# G ((a ∧ ¬b) W (G (a ∧ b))) = G(¬(a | b) -> G(a & b)) != G(a ∧ ¬b) v FG(a ∧ b)
+GloballyRules.rule('G (l@(a ∧ b) W g@(G (a ∧ ~b)))', to='G (¬l → g)')
+
+# G (a ∧ ((a ∧ b) W (a ∧ c))) = G(a & (b | c)) != G (a ∧ (b W c))
+GloballyRules.rule('G (a ∧ ((a ∧ b) W (a ∧ c)))', to='G (a ∧ (b ∨ c))')
+
+# G (a ∧ (a W (a ∧ b))) = G a
+GloballyRules.rule('G (a ∧ (a W (a ∧ b)))', to='G a')
+
+# G (a W (b ∧ (G a))) = G a
+GloballyRules.rule('G (a W (b ∧ G a))', to='G a')
+
+# G (a W b) = G(a v b)
+GloballyRules.rule('G (a W b)', to='G (a ∨ b)')
+
+# G(a v ((¬a ∧ ¬b) W (b W a))) = G((¬b ∧ ¬a) v (b W a))
+GloballyRules.rule('G (a ∨ ((~a ∧ ~b) W w@(b W a)))', to='G ((a ∨ b) → w)')
+
+# G (a v (b W c W a))) = G(b v (c W a))
+GloballyRules.rule('G (a ∨ (b W w@(c W a)))', to='G (a ∨ w)')
 
 # G (a → (G (b ∧ ¬a))) = G ¬a
-  elif (a.type() == TermType.Impl) and (a.right().type() == TermType.G) and\
-       (a.right().left().type() == TermType.And) and CheckNotHelper(a.left(), a.right().left().right()):
-      return GloballySimpl(a.right().left().right())
+GloballyRules.rule('G (~a → G (b ∧ a))', to='G a')
 
 # G (a → (c v (a ∧ (¬b W (b v d))))) = true
-  elif (a.type() == TermType.Impl) and (a.right().type() == TermType.Or) and\
-       (a.right().right().type() == TermType.And) and (a.right().right().right().type() == TermType.W) and\
-       (a.right().right().right().right().type() == TermType.Or) and\
-       a.left().equals(a.right().right().left()) and\
-       CheckNotHelper(a.right().right().right().left(), a.right().right().right().right().left()):
-      return BoolConstTerm(True)
+GloballyRules.rule('G (a → (c ∨ (a ∧ (b W (~b ∨ d)))))', to='true')
 
 # G (trig → (¬fin W (fin W ¬trig))) = G(fin → (fin W ¬trig))
-  elif (a.type() == TermType.Impl) and (a.right().type() == TermType.W) and\
-       (a.right().right().type() == TermType.W) and\
-       CheckNotHelper(a.left(), a.right().right().right()) and\
-       CheckNotHelper(a.right().left(), a.right().right().left()):
-      return GloballySimpl(ImplSimpl(a.right().right().left(), a.right().right()))
+GloballyRules.rule('G (a → (~f W w@(f W ~a)))', to='G (f → w)')
 
 # G (a → (a W (d v (¬a ∧ (¬b W (b v c)))))) = true
-  elif (a.type() == TermType.Impl) and (a.right().type() == TermType.W) and\
-       (a.right().right().type() == TermType.Or) and (a.right().right().right().type() == TermType.And) and\
-       (a.right().right().right().right().type() == TermType.W) and (a.right().right().right().right().right().type() == TermType.Or) and\
-       a.left().equals(a.right().left()) and CheckNotHelper(a.left(), a.right().right().right().left()) and\
-       CheckNotHelper(a.right().right().right().right().left(), a.right().right().right().right().right().left()):
-      return BoolConstTerm(True)
+GloballyRules.rule('G (a → (a W (d ∨ (~a ∧ (b W (~b ∨ c))))))', to='true')
 
-# G (a → ((b ∧ ¬c) W ((b ∧ c) W ¬a))) = G((b ∧ ¬c) v ((b ∧ c) W ¬a)) 
-  elif (a.type() == TermType.Impl) and (a.right().type() == TermType.W) and\
-       (a.right().right().type() == TermType.W) and (a.right().left().type() == TermType.And) and\
-       (a.right().right().left().type() == TermType.And) and\
-       CheckNotHelper(a.left(), a.right().right().right()) and\
-       CheckNotHelper(a.right().left().right(), a.right().right().left().right()) and\
-        a.right().left().left().equals(a.right().right().left().left()):
-      return GloballySimpl(DisSimpl(a.right().left(),a.right().right()))
+# G (a → ((b ∧ ¬c) W ((b ∧ c) W ¬a))) = G((b ∧ ¬c) v ((b ∧ c) W ¬a))
+GloballyRules.rule('G (a → (l@(b ∧ c) W w@((b ∧ ~c) W ~a)))', to='G (l ∨ w)')
+
+def GloballySimpl(a:Term):
+  return GloballyRules.apply(a)
 
 
-  else: return GTerm(a)
+WeakUntilRules = RuleSet('WeakUntilSimpl', TermType.W, WTerm)
 
+# 0 W 0 = 0
+# 1 W 0 = 1 W 1 = 0 W 1 = 1
+WeakUntilRules.rule('false W false', to='false')
+WeakUntilRules.rule('true W false', 'false W true', 'true W true', to='true')
+
+# 0 W b = b
+# 1 W b = 1
+WeakUntilRules.rule('false W b', to='b')
+WeakUntilRules.rule('true W b', to='true')
+
+# a W 1 = 1
+# a W 0 = G a
+WeakUntilRules.rule('a W true', to='true')
+WeakUntilRules.rule('a W false', to='G a')
+
+#a W a = a
+WeakUntilRules.rule('a W a', to='a')
+
+# a W (b v a) = a W (a v b)
+WeakUntilRules.rule('a W o@(b ∨ a)', to='o', commute=True)
+
+# (a ∧ b) W (c v a) = c v a
+WeakUntilRules.rule('(a ∧ b) W o@(c ∨ a)', to='o', commute=True)
+
+# (a ∧ b) W a) = a
+WeakUntilRules.rule('(a ∧ b) W a', to='a', commute=True)
+
+# ¬a W a = = G(¬a) \/ F(a) = true
+WeakUntilRules.rule('a W ~a', to='true')
+
+# ¬a W (a v b) = true
+WeakUntilRules.rule('a W (b ∨ ~a)', to='true', commute=True)
+
+# (a ∧ ¬b) W (¬a v b) =
+WeakUntilRules.rule('(a ∧ b) W (~a ∨ ~b)', to='true')
+
+# (a ∧ ¬b) W (b ∧ (G a)) = G (a)
+WeakUntilRules.rule('(a ∧ b) W (~b ∧ G a)', to='G a')
+
+# (¬a ∧ c) W a = c W a
+WeakUntilRules.rule('((¬a) ∧ c) W a', to='c W a')
+
+# (¬a ∧ c) W (a v d) = c W (a v d)
+WeakUntilRules.rule('((¬a) ∧ c) W o@(a ∨ d)', to='c W o')
+
+# ¬a W (a ∧ (¬a W b)) = ¬a W (a ∧ b)
+WeakUntilRules.rule('n@(¬a) W (a ∧ (n W b))', to='n W (a ∧ b)')
+
+# (a ∧ b) W (c W (b v d)) = c W (b v d)
+WeakUntilRules.rule('(a ∧ b) W w@(c W (b ∨ d))', to='w')
+
+# (a ∧ b) W (c W b) = c W b
+WeakUntilRules.rule('(a ∧ b) W w@(c W b)', to='w')
+
+# a W (a W b) = (a W b)
+WeakUntilRules.rule('a W w@(a W b)', to='w')
+
+# a W (G a) = G a
+WeakUntilRules.rule('a W g@(G a)', to='g')
 
 def WeakUntilSimpl(a:Term, b:Term):
-  
-  # 0 W 0 = 0
-  # 1 W 0 = 1 W 1 = 0 W 1 = 1
-  if ((a.type() == TermType.BoolConst) and (b.type() == TermType.BoolConst)):
-    if ((a.val() == False) and (b.val() == False)): return BoolConstTerm(False)
-    else: return BoolConstTerm(True)
-
-  # 0 W b = b
-  # 1 W b = 1
-  elif (b.type() != TermType.BoolConst) and (a.type() == TermType.BoolConst):
-    if (a.val() == False): return b
-    else: return BoolConstTerm(True)
-  
-  # a W 1 = 1
-  # a W 0 = G a
-  elif (a.type() != TermType.BoolConst) and (b.type() == TermType.BoolConst):
-    if (b.val() == True): return BoolConstTerm(True)
-    else: return GloballySimpl(a)
-
-  #a W a = a
-  elif (a.equals(b)):
-    return a
-
-  # a W (b v a) = a W (a v b) 
-  elif (b.type() == TermType.Or) and (a.equals(b.right()) or a.equals(b.left())):
-    return b
-
-  # (a ∧ b) W (c v a) = c v a
-  elif (a.type() == TermType.And) and (b.type() == TermType.Or) and (a.left().equals(b.right())):
-    return b
-
-  # (a ∧ b) W a) = a
-  elif (a.type() == TermType.And) and (a.left().equals(b) or a.right().equals(b)):
-    return b
-
-  # (a ∧ b) W (b v c) = b v c
-  elif (a.type() == TermType.And) and (b.type() == TermType.Or) and\
-    a.right().equals(b.left()):
-    return b
-  
-  # ¬a W a = = G(¬a) \/ F(a) = true
-  elif CheckNotHelper(a, b):
-    return BoolConstTerm(True)
-  
-  # ¬a W (a v b) = true
-  elif (b.type() == TermType.Or) and (CheckNotHelper(a, b.right()) or CheckNotHelper(a, b.left())):
-    return BoolConstTerm(True)
-
-  # (a ∧ ¬b) W (¬a v b) = 
-  elif (a.type() == TermType.And) and (b.type() == TermType.Or) and\
-    CheckNotHelper(a.left(), b.left()) and CheckNotHelper(a.right(), b.right()):
-    return BoolConstTerm(True)
-
-  # (a ∧ ¬b) W (b ∧ (G a)) = G (a)
-  elif (a.type() == TermType.And) and (b.type() == TermType.And) and (b.right().type() == TermType.G) and \
-       a.left().equals(b.right().left()) and CheckNotHelper(a.right(),b.left()):
-      return GloballySimpl(a.left())
-
-  # (¬a ∧ c) W a = c W a
-  elif (a.type() == TermType.And) and (a.left().type() == TermType.Not) and \
-       a.left().left().equals(b):
-      return WeakUntilSimpl(a.right(), b)
-  
-  # (¬a ∧ c) W (a v d) = c W (a v d)
-  elif (a.type() == TermType.And) and (b.type() == TermType.Or) and (a.left().type() == TermType.Not) and \
-       a.left().left().equals(b.left()):
-      return WeakUntilSimpl(a.right(), b)
-  
-  # ¬a W (a ∧ (¬a W b)) = ¬a W (a ∧ b)
-  elif (a.type() == TermType.Not) and (b.type() == TermType.And) and (b.right().type() == TermType.W) and (b.right().left().type() == TermType.Not) and\
-       a.left().equals(b.left()) and a.left().equals(b.right().left().left()):
-      return WeakUntilSimpl(a, ConSimpl(b.left(),b.right().right()))
-  
-  # (a ∧ b) W (c W (b v d)) = c W (b v d)
-  elif (a.type() == TermType.And) and (b.type() == TermType.W) and (b.right().type() == TermType.Or) and\
-       a.right().equals(b.right().left()):
-      return b
-  
-  # (a ∧ b) W (c W b) = c W b
-  elif (a.type() == TermType.And) and (b.type() == TermType.W) and\
-       a.right().equals(b.right()):
-      return b
-  
-  # a W (a W b) = (a W b)
-  elif (b.type() == TermType.W) and a.equals(b.left()):
-      return b
-  
-  # a W (G a) = G a
-  elif (b.type() == TermType.G) and a.equals(b.left()):
-      return b
-  
+  return WeakUntilRules.apply(a, b)
 
-  else: return WTerm(a, b)
+
+#
+# Canonical form for the commutative operators: chains of ∧ (∨) are
+# flattened, their operands are sorted by the printed form and rebuilt as
+# a right-nested chain, so a ∨ (b ∧ a) and (a ∧ b) ∨ a become one node.
+# Terms stay binary because the rules are written over left()/right().
+# It keys the classes of ClassIndex; the rules see the operand order of the
+# EDTL skeleton and match the mirrored orders with commute=True
+#
+Canonicals = {}
+SortKeys = {}
+Infix = {TermType.And: " ∧ ", TermType.Or: " ∨ ", TermType.Impl: " → ",
+         TermType.U: " U ", TermType.W: " W "}
+Prefix = {TermType.Not: "¬", TermType.G: "G ", TermType.F: "F "}
+
+# printme() of t, built bottom-up from the keys of the operands
+def SortKey(t:Term) -> str:
+  k = SortKeys.get(t)
+  if k is not None: return k
+  stack = [t]
+  while stack:
+    x = stack[-1]
+    if x in SortKeys:
+      stack.pop()
+      continue
+    n = x.childcount()
+    kids = [k for k in (x.left(), x.right())[:n] if k not in SortKeys]
+    if kids:
+      stack.extend(kids)
+      continue
+    if n == 0: k = x.printme()
+    elif n == 1: k = Prefix[x.ty] + Wrap(x.a)
+    else: k = Wrap(x.a) + Infix[x.ty] + Wrap(x.b)
+    SortKeys[x] = k
+    stack.pop()
+  return SortKeys[t]
+
+# key of an operand as printx() writes it
+def Wrap(t:Term) -> str:
+  if t.ty is TermType.BoolConst or t.ty is TermType.BoolVar or t.ty is TermType.Not: return SortKeys[t]
+  return "(" + SortKeys[t] + ")"
+
+# operands of a chain of ty, left to right
+def Operands(t:Term, ty:TermType) -> list:
+  out = []
+  stack = [t]
+  while stack:
+    x = stack.pop()
+    if x.ty is ty:
+      stack.append(x.b)
+      stack.append(x.a)
+    else: out.append(x)
+  return out
+
+def Canonical(t:Term) -> Term:
+  c = Canonicals.get(t)
+  if c is not None: return c
+  stack = [t]
+  while stack:
+    x = stack[-1]
+    if x in Canonicals:
+      stack.pop()
+      continue
+    ty = x.ty
+    chain = ty is TermType.And or ty is TermType.Or
+    kids = Operands(x, ty) if chain else (x.left(), x.right())[:x.childcount()]
+    pending = [k for k in kids if k not in Canonicals]
+    if pending:
+      stack.extend(pending)
+      continue
+    kids = [Canonicals[k] for k in kids]
+    if chain: c = Chain(x.__class__, sorted(kids, key=SortKey))
+    elif kids: c = x.__class__(*kids)
+    else: c = x
+    Canonicals[x] = c
+    Canonicals[c] = c
+    stack.pop()
+  return Canonicals[t]
 
 
 #
-# MAIN
+# Memoization layer for the simplifiers: results are kept in one LRU cache
+# keyed on (operator, operands). Terms are hash-consed, so operands are
+# compared by identity and a lookup costs O(1)
 #
-def Main():
+class SimplCache:
+  def __init__(self, maxsize:int = 1 << 16) -> None:
+    self.maxsize = maxsize
+    self.entries = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+    # record for every computed entry the rule that fired and the calls it made
+    self.track = False
+    self.deps = {}
+    self.frames = []
+    # optional DiskCache shared between runs
+    self.disk = None
+    # terms known to be in normal form, see Simplify
+    self.normal = set()
+    # saturate the results of Reduce
+    self.fixpoint = False
+    # reduce propositional operands by truth tables, see Propositional
+    self.propositional = False
+  def resize(self, maxsize:int) -> None:
+    self.maxsize = maxsize
+    while len(self.entries) > maxsize:
+      self.entries.popitem(last=False)
+  def clear(self) -> None:
+    self.entries.clear()
+    self.deps.clear()
+    self.normal.clear()
+    self.hits = 0
+    self.misses = 0
+  #
+  # Drops the entries computed by the simplifier, the entries where one of
+  # the rules fired or where it could fire now (no earlier rule of its set
+  # fired and one of its patterns matches the operands), the entries where a
+  # rule fired that is no longer in its set (replaced or removed), and all
+  # entries derived from them. Needs track to be on while the entries are
+  # computed; evicted entries keep their dependencies, so the graph stays
+  # complete
+  #
+  def invalidate(self, simplifier:str = None, rules:list = ()) -> int:
+    bad = set()
+    live = {}
+    for key, (fired, calls) in self.deps.items():
+      if fired is not None:
+        current = live.get(fired.ruleset)
+        if current is None:
+          current = live[fired.ruleset] = set(fired.ruleset.rules)
+        if fired in rules or fired not in current:
+          bad.add(key)
+          continue
+      if key[0] == simplifier:
+        bad.add(key)
+        continue
+      for r in rules:
+        if key[0] != r.ruleset.name: continue
+        if fired is not None and fired.number < r.number: continue
+        if any(c.match(key[1:]) is not None for c in r.cases):
+          bad.add(key)
+          break
+    users = {}
+    for key, (fired, calls) in self.deps.items():
+      for k in calls:
+        users.setdefault(k, []).append(key)
+    work = list(bad)
+    while work:
+      for u in users.get(work.pop(), ()):
+        if u not in bad:
+          bad.add(u)
+          work.append(u)
+    for key in bad:
+      self.entries.pop(key, None)
+      self.deps.pop(key, None)
+    if bad: self.normal.clear()
+    return len(bad)
+  def put(self, key, value) -> None:
+    if self.maxsize <= 0: return
+    self.entries[key] = value
+    if len(self.entries) > self.maxsize:
+      self.entries.popitem(last=False)
+  def printme(self) -> str:
+    total = self.hits + self.misses
+    rate = 100.0 * self.hits / total if total else 0.0
+    return "cache: %d entries (max %d), %d hits, %d misses, %.1f%% hit rate" % \
+      (len(self.entries), self.maxsize, self.hits, self.misses, rate)
+
+cache = SimplCache()
+
+def Memo(f):
+  op = f.__name__
+  def memo(*args):
+    key = (op,) + args
+    r = cache.entries.get(key)
+    if cache.track and cache.frames: cache.frames[-1][1].append(key)
+    if r is not None:
+      cache.entries.move_to_end(key)
+      cache.hits += 1
+      return r
+    cache.misses += 1
+    disk = cache.disk
+    if disk is not None and not cache.track:
+      r = disk.get(key)
+      if r is not None:
+        cache.put(key, r)
+        return r
+    if cache.track:
+      cache.frames.append([None, []])
+      try:
+        r = f(*args)
+      finally:
+        fired, calls = cache.frames.pop()
+      cache.deps[key] = (fired, tuple(calls))
+    else: r = f(*args)
+    cache.put(key, r)
+    if disk is not None: disk.put(key, r)
+    return r
+  memo.__name__ = op
+  memo.raw = f
+  return memo
+
+# recursive calls inside the simplifiers resolve these names at call time,
+# so nested sub-results are shared through the cache as well
+No = Memo(No)
+FutureSimpl = Memo(FutureSimpl)
+DisSimpl = Memo(DisSimpl)
+ConSimpl = Memo(ConSimpl)
+ImplSimpl = Memo(ImplSimpl)
+GloballySimpl = Memo(GloballySimpl)
+WeakUntilSimpl = Memo(WeakUntilSimpl)
 
-  import pandas as pd
-  import numpy as np
-  from matplotlib import pyplot as plt 
+#
+# Simplification of a whole term: the nodes are rebuilt bottom-up through
+# the simplifier of their operator (as in Builders) once their operands are
+# simplified. The DAG is walked with an explicit stack, so deep terms do not
+# hit the recursion limit, and shared subterms are simplified once.
+#
+# With fixpoint the rules are applied to saturation: a node that is rewritten
+# is dirty and its result is walked again, a node that its simplifier leaves
+# as it is (with normal operands) is normal. Normal nodes are remembered in
+# cache.normal, so later calls only revisit subterms that changed. A rewrite
+# leading back to a node still being walked ends the walk of that node
+#
+def Simplify(t:Term, fixpoint:bool = False) -> Term:
+  normal = cache.normal if fixpoint else ()
+  done = {}
+  active = set()
+  stack = [t]
+  while stack:
+    x = stack[-1]
+    if x in done or x in normal:
+      stack.pop()
+      continue
+    n = x.childcount()
+    if n == 0:
+      done[x] = x
+      stack.pop()
+      continue
+    active.add(x)
+    kids = (x.left(), x.right())[:n]
+    pending = [k for k in kids if k not in done and k not in normal]
+    if pending:
+      stack.extend(pending)
+      continue
+    args = [done.get(k, k) for k in kids]
+    y = globals()[Builders[x.ty]](*args)
+    if fixpoint:
+      if y is x and all(a is k for a, k in zip(args, kids)):
+        normal.add(x)
+      elif y in normal:
+        done[x] = y
+      elif y in done:
+        done[x] = done[y]
+      elif y not in active:
+        stack.append(y)
+        continue
+      else: done[x] = y
+    else: done[x] = y
+    stack.pop()
+    active.discard(x)
+  return done.get(t, t)
 
-  def BoolToString(a:Term):
-    return a.printme()
 
-  a = 8
-  mas = [] 
-  for i1 in range(3370): 
-      mas.append([0] * a)
+#
+# Fingerprint of the rewrite code: the text of every rule, the source of the
+# builtin right-hand sides and of the simplifiers that are plain functions.
+# Results stored under another fingerprint are never read
+#
+def RulesFingerprint() -> str:
+  import hashlib, inspect
+  h = hashlib.sha1()
+  for rs in sorted((v for v in globals().values() if isinstance(v, RuleSet)), key=lambda rs: rs.name):
+    h.update(('[%s %s]' % (rs.name, rs.default.__name__)).encode('utf8'))
+    for r in rs.rules:
+      h.update(('%d: %s = %s%s\n' % (r.number, ' | '.join(r.lhs), r.rhs, ' commute' if r.commute else '')).encode('utf8'))
+      if r.build.__name__ != '<lambda>': h.update(inspect.getsource(r.build).encode('utf8'))
+  for f in (No.raw, FutureSimpl.raw, CheckNotHelper, RuleSet.apply, RuleCase.match, CompileMatch, CompileBuild,
+            Commuted, OperandOrders):
+    h.update(inspect.getsource(f).encode('utf8'))
+  # layout of the keys and values
+  h.update(b'digest keys, node table values')
+  # the options that change the result of a call
+  h.update(('propositional=%s' % cache.propositional).encode('utf8'))
+  if cache.propositional:
+    for f in (Propositional, PropVariables, Scope, TruthTable, Combine, Literal, Complement, Chain, Operands):
+      h.update(inspect.getsource(f).encode('utf8'))
+  h.update(repr(sorted((k.value, v) for k, v in Builders.items())).encode('utf8'))
+  return h.hexdigest()
 
-  cnt = []
-  for i in range(6): 
-      cnt.append([0])
-  for i in range(6):
-    cnt[i] = 0
+#
+# Structural digest of a term: a hash over the kind and the value of a leaf
+# or the digests of the operands, computed once per node without recursion
+#
+Digests = {}
+
+def Digest(t:Term) -> bytes:
+  import hashlib
+  d = Digests.get(t)
+  if d is not None: return d
+  stack = [t]
+  while stack:
+    x = stack[-1]
+    if x in Digests:
+      stack.pop()
+      continue
+    n = x.childcount()
+    kids = [k for k in (x.left(), x.right())[:n] if k not in Digests]
+    if kids:
+      stack.extend(kids)
+      continue
+    h = hashlib.blake2b(bytes([x.ty.value]), digest_size=16)
+    if n == 0: h.update(repr(x.v).encode('utf8'))
+    for k in (x.left(), x.right())[:n]:
+      h.update(Digests[k])
+    Digests[x] = h.digest()
+    stack.pop()
+  return Digests[t]
 
-  i = 0
-  trigger = BoolConstTerm(True)
-  release = BoolConstTerm(False)
-  invariant = BoolConstTerm(False)
-  final = BoolConstTerm(False)
-  delay = BoolConstTerm(False)
-  reaction = BoolConstTerm(False)
+#
+# Persistent cache of simplifier results in SQLite. A key is a digest of the
+# operator and the digests of the operands, a value is the digest of the
+# result term. Terms are stored once per node in the node table (digest,
+# kind, value of a leaf, digests of the operands), shared by all entries and
+# fingerprints. The entries of the current fingerprint and the nodes are
+# loaded on open, new ones are written in batches; worker processes reopen
+# the database after the fork
+#
+class DiskCache:
+  def __init__(self, path:str, batch:int = 4096) -> None:
+    self.path = path
+    self.batch = batch
+    self.fingerprint = RulesFingerprint()
+    self.db = None
+    self.pid = None
+    self.entries = {}
+    self.nodes = {}
+    self.terms = {}
+    self.pending = []
+    self.newnodes = []
+    self.hits = 0
+  def open(self) -> None:
+    import os, sqlite3
+    self.db = sqlite3.connect(self.path, timeout=60)
+    self.db.execute('CREATE TABLE IF NOT EXISTS simpl (fingerprint TEXT, key BLOB, value BLOB, '
+                    'PRIMARY KEY (fingerprint, key)) WITHOUT ROWID')
+    self.db.execute('CREATE TABLE IF NOT EXISTS node (digest BLOB PRIMARY KEY, kind, value, a, b) WITHOUT ROWID')
+    self.entries = dict(self.db.execute('SELECT key, value FROM simpl WHERE fingerprint = ?', (self.fingerprint,)))
+    self.nodes = {row[0]: row[1:] for row in self.db.execute('SELECT digest, kind, value, a, b FROM node')}
+    self.terms = {}
+    self.pending = []
+    self.newnodes = []
+    self.pid = os.getpid()
+  def connected(self) -> None:
+    import os
+    if self.pid != os.getpid(): self.open()
+  def digest(self, key) -> bytes:
+    import hashlib
+    h = hashlib.blake2b(key[0].encode('utf8'), digest_size=16)
+    for a in key[1:]:
+      h.update(Digest(a))
+    return h.digest()
+  # rebuilds the term of a digest from the node table
+  def term(self, d:bytes) -> Term:
+    stack = [d]
+    while stack:
+      e = stack[-1]
+      if e in self.terms:
+        stack.pop()
+        continue
+      kind, v, a, b = self.nodes[e]
+      ops = [k for k in (a, b) if k is not None]
+      pending = [k for k in ops if k not in self.terms]
+      if pending:
+        stack.extend(pending)
+        continue
+      ty = TermType(kind)
+      if ty is TermType.BoolConst: t = BoolConstTerm(bool(v))
+      elif ty is TermType.BoolVar: t = BoolFreeTerm(v)
+      else: t = Constructors[ty](*(self.terms[k] for k in ops))
+      self.terms[e] = t
+      Digests[t] = e
+      stack.pop()
+    return self.terms[d]
+  def get(self, key):
+    self.connected()
+    d = self.entries.get(self.digest(key))
+    if d is None: return None
+    self.hits += 1
+    return self.term(d)
+  # stores the entry and the nodes of the result not stored yet
+  def put(self, key, r) -> None:
+    self.connected()
+    k = self.digest(key)
+    if k in self.entries: return
+    d = Digest(r)
+    self.entries[k] = d
+    self.pending.append((self.fingerprint, k, d))
+    stack = [r]
+    while stack:
+      x = stack.pop()
+      e = Digests[x]
+      if e in self.nodes: continue
+      n = x.childcount()
+      kids = (x.left(), x.right())[:n]
+      ops = [Digests[c] for c in kids] + [None] * (2 - n)
+      row = (x.ty.value, x.v if n == 0 else None, ops[0], ops[1])
+      self.nodes[e] = row
+      self.newnodes.append((e,) + row)
+      stack.extend(kids)
+    if len(self.pending) >= self.batch:
+      self.flush()
+  def flush(self) -> None:
+    if self.db is None or not (self.pending or self.newnodes): return
+    with self.db:
+      self.db.executemany('INSERT OR IGNORE INTO node VALUES (?, ?, ?, ?, ?)', self.newnodes)
+      self.db.executemany('INSERT OR IGNORE INTO simpl VALUES (?, ?, ?)', self.pending)
+    self.pending = []
+    self.newnodes = []
+  # removes the entries of other fingerprints, the nodes stay
+  def prune(self) -> int:
+    self.connected()
+    with self.db:
+      return self.db.execute('DELETE FROM simpl WHERE fingerprint != ?', (self.fingerprint,)).rowcount
+  def close(self) -> None:
+    self.flush()
+    if self.db is not None: self.db.close()
+    self.db = None
+    self.pid = None
+  def printme(self) -> str:
+    return "disk cache %s: %d entries, %d hits" % (self.path, len(self.entries), self.hits)
 
 
-  
-  def Reduce(k):
-   
-    x0 = ConSimpl(invariant, reaction)
-    x1 = DisSimpl(release, x0)
-    x2 = ConSimpl(invariant, No(delay))
-    x3 = WeakUntilSimpl(x2, x1)
-    x4 = ConSimpl(final, x3)
-    x5 = DisSimpl(release, x4)
-    x6 = ConSimpl(invariant, No(final))
-    x7 = WeakUntilSimpl(x6, x5)
-    x8 = ConSimpl(trigger, No(release))
-    x9 = ImplSimpl(x8, x7)
-    x10 = GloballySimpl(x9)
-
-
-    mas[k][0] = BoolToString(trigger)
-    mas[k][1] = BoolToString(release)
-    mas[k][2] = BoolToString(invariant)
-    mas[k][3] = BoolToString(final)
-    mas[k][4] = BoolToString(delay)
-    mas[k][5] = BoolToString(reaction)
-    mas[k][6] = BoolToString(x10)
-    return k+1
-
-  cnt[0] = 0
-  while cnt[0] < 2:
-    if (cnt[0] == 0 ): trigger = BoolConstTerm(True)
-    if (cnt[0] == 1 ): trigger = BoolFreeTerm('trig')
-    cnt[0]+=1
-    cnt[1] = 0
-    while cnt[1] < 5:
-      if (cnt[1] == 0): release = BoolConstTerm(True)
-      if (cnt[1] == 1): release = BoolConstTerm(False)
-      if (cnt[1] == 2): release = BoolFreeTerm('rel')
-      if (cnt[1] == 3): 
-        if (trigger.type() == TermType.BoolVar and trigger.v == 'trig'):
-          release = BoolFreeTerm('trig')
-        else: break
-      if (cnt[1] == 4): 
-        if (trigger.type() == TermType.BoolVar and trigger.v == 'trig'):
-          release = NotTerm(BoolFreeTerm('trig'))
-        else: break
-      cnt[1]+=1
-      cnt[2] = 0
-      while cnt[2] < 6:
-        if (cnt[2] == 0): invariant = BoolConstTerm(True)
-        if (cnt[2] == 1): invariant = BoolConstTerm(False)
-        if (cnt[2] == 2): invariant = BoolFreeTerm('inv')
-        if (cnt[2] == 3): 
-            if trigger.type() == TermType.BoolVar and trigger.v == 'trig':
-              invariant = BoolFreeTerm('trig')
-            else: cnt[2] = 4
-        if (cnt[2] == 4):
-          if (release.type() == TermType.BoolVar and release.v == 'rel'):
-            invariant = BoolFreeTerm('rel')
-          else: break
-        if (cnt[2] == 5): 
-          if (release.type() == TermType.BoolVar and release.v == 'rel'):
-            invariant = NotTerm(BoolFreeTerm('rel'))
-          else: break
-        cnt[2]+=1
-        cnt[3] = 0
-        while cnt[3] < 9:
-            if (cnt[3] == 0): final = BoolConstTerm(True)
-            if (cnt[3] == 1): final = BoolConstTerm(False)
-            if (cnt[3] == 2): final = BoolFreeTerm('fin')
-            if (cnt[3] == 3):
-              if (trigger.type() == TermType.BoolVar and trigger.v == 'trig'):
-                final = BoolFreeTerm('trig')
-              else: cnt[3] = 5
-            if (cnt[3] == 4): 
-              if (trigger.type() == TermType.BoolVar and trigger.v == 'trig'):
-                final = NotTerm(BoolFreeTerm('trig'))
-              else: cnt[3] = 5
-            if (cnt[3] == 5):
-              if (release.type() == TermType.BoolVar and release.v == 'rel'):
-                final = BoolFreeTerm('rel')
-              else: cnt[3] = 7
-            if (cnt[3] == 6):
-              if (release.type() == TermType.BoolVar and release.v == 'rel'):
-                final = NotTerm(BoolFreeTerm('rel'))
-              else: cnt[3] = 7
-            if (cnt[3] == 7):
-              if (invariant.type() == TermType.BoolVar and invariant.v == 'inv'):
-                final = BoolFreeTerm('inv')
-              else: break                      
-            if (cnt[3] == 8): 
-              if (invariant.type() == TermType.BoolVar and invariant.v == 'inv'):
-                final = NotTerm(BoolFreeTerm('inv'))
-              else: break                      
-            cnt[3] += 1
-            cnt[4] = 0
-            while cnt[4] < 11:
-                if (cnt[4] == 0): delay = BoolConstTerm(True)
-                if (cnt[4] == 1): delay = BoolConstTerm(False)
-                if (cnt[4] == 2): delay = BoolFreeTerm('del')
-                if (cnt[4] == 3):
-                  if (trigger.type() == TermType.BoolVar and trigger.v == 'trig'):
-                    delay = BoolFreeTerm('trig')
-                  else: cnt[4] = 5
-                if (cnt[4] == 4): 
-                  if (trigger.type() == TermType.BoolVar and trigger.v == 'trig'):
-                    delay = NotTerm(BoolFreeTerm('trig'))
-                  else: cnt[4] = 5
-                if (cnt[4] == 5):
-                  if (release.type() == TermType.BoolVar and release.v == 'rel'):
-                    delay = BoolFreeTerm('rel')
-                  else: cnt[4] = 7
-                if (cnt[4] == 6): 
-                  if (release.type() == TermType.BoolVar and release.v == 'rel'):
-                    delay = NotTerm(BoolFreeTerm('rel'))
-                  else: cnt[4] = 7
-                if (cnt[4] == 7):
-                  if (invariant.type() == TermType.BoolVar and invariant.v == 'inv'):
-                    delay = BoolFreeTerm('inv')
-                  else: cnt[4] = 9
-                if (cnt[4] == 8): 
-                  if (invariant.type() == TermType.BoolVar and invariant.v == 'inv'):
-                      delay = NotTerm(BoolFreeTerm('inv'))
-                  else: cnt[4] = 9
-                if (cnt[4] == 9):
-                  if (final.type() == TermType.BoolVar and  final.v == 'fin'):
-                    delay = BoolFreeTerm('fin')
-                  else: break
-                if (cnt[4] == 10): 
-                  if (final.type() == TermType.BoolVar and  final.v == 'fin'):
-                    delay = NotTerm(BoolFreeTerm('fin')) 
-                  else: break
-                cnt[4]+=1
-                cnt[5] = 0
-                while cnt[5] < 3:
-                  if (cnt[5] == 0): reaction = BoolConstTerm(True)
-                  if (cnt[5] == 1): reaction = BoolConstTerm(False)
-                  if (cnt[5] == 2): reaction = BoolFreeTerm('rea')
-                  i = Reduce(i)
-                  cnt[5] += 1
-                  
-
-# G ((trig ∧ ¬ rel) → ( (inv ∧ ¬fin) W (rel v (fin ∧ ((inv ∧ (¬ del)) W (rel v (inv ∧ rea))))))) 
-
-  for i in range(0, len(mas)):
-      for i2 in range(0, len(mas[i])):
-          print(mas[i][i2], end=' ')
-      print()
-
-  from openpyxl import Workbook
-  wb = Workbook()
-  ws = wb.active
-  for subarray in mas:
-     ws.append(subarray)
-  wb.save('./edtl-ltl.xlsx')
+#
+# Attribute space of the classification: values of an attribute depend on
+# the attributes chosen before it, e.g. release may be trig or ¬trig only
+# when the trigger is trig
+#
+Attributes = ['trigger', 'release', 'invariant', 'final', 'delay', 'reaction']
+
+def IsVar(a:Term, name:str) -> bool:
+  return a.ty == TermType.BoolVar and a.v == name
+
+def Literals(name:str):
+  return [BoolFreeTerm(name), NotTerm(BoolFreeTerm(name))]
+
+def AttributeValues(k:int, chosen:list):
+  values = [BoolConstTerm(True), BoolConstTerm(False)]
+  if k == 0: return [values[0], BoolFreeTerm('trig')]
+  trig = IsVar(chosen[0], 'trig')
+  if k == 1:
+    values.append(BoolFreeTerm('rel'))
+    if trig: values += Literals('trig')
+    return values
+  rel = IsVar(chosen[1], 'rel')
+  if k == 2:
+    values.append(BoolFreeTerm('inv'))
+    if trig: values.append(BoolFreeTerm('trig'))
+    if rel: values += Literals('rel')
+    return values
+  if k == 5:
+    values.append(BoolFreeTerm('rea'))
+    return values
+  values.append(BoolFreeTerm('fin' if k == 3 else 'del'))
+  if trig: values += Literals('trig')
+  if rel: values += Literals('rel')
+  if IsVar(chosen[2], 'inv'): values += Literals('inv')
+  if k == 4 and IsVar(chosen[3], 'fin'): values += Literals('fin')
+  return values
+
+# all attribute tuples that start with the given prefix, in sweep order
+def Combinations(prefix:list):
+  if len(prefix) == len(Attributes):
+    yield tuple(prefix)
+    return
+  for v in AttributeValues(len(prefix), prefix):
+    yield from Combinations(prefix + [v])
+
+#
+# EDTL requirement as LTL:
+# G ((trig ∧ ¬ rel) → ( (inv ∧ ¬fin) W (rel v (fin ∧ ((inv ∧ (¬ del)) W (rel v (inv ∧ rea)))))))
+#
+def Reduce(trigger:Term, release:Term, invariant:Term, final:Term, delay:Term, reaction:Term):
+  x0 = ConSimpl(invariant, reaction)
+  x1 = DisSimpl(release, x0)
+  x2 = ConSimpl(invariant, No(delay))
+  x3 = WeakUntilSimpl(x2, x1)
+  x4 = ConSimpl(final, x3)
+  x5 = DisSimpl(release, x4)
+  x6 = ConSimpl(invariant, No(final))
+  x7 = WeakUntilSimpl(x6, x5)
+  x8 = ConSimpl(trigger, No(release))
+  x9 = ImplSimpl(x8, x7)
+  x10 = GloballySimpl(x9)
+  if cache.fixpoint: x10 = Simplify(x10, True)
+  return x10
+
+#
+# The sweep is split into shards by the (trigger, release) prefix,
+# every shard is reduced independently
+#
+def Shards():
+  return [[t, r] for t in AttributeValues(0, []) for r in AttributeValues(1, [t])]
+
+# do the attributes agree with the fixed values, {attribute name: term};
+# a prefix is checked on the attributes it has
+def Matches(attrs, fixed:dict) -> bool:
+  for name, v in fixed.items():
+    k = Attributes.index(name)
+    if k < len(attrs) and attrs[k] is not v: return False
+  return True
+
+#
+# Options of the simplifiers as worker processes need them: a pool started
+# by spawn or forkserver imports this module afresh, so they are passed to
+# every worker instead of being inherited from the parent
+#
+def Settings() -> dict:
+  disk = cache.disk
+  return {'propositional': cache.propositional, 'fixpoint': cache.fixpoint, 'maxsize': cache.maxsize,
+          'disk': None if disk is None else (disk.path, disk.batch)}
+
+def Configure(settings:dict) -> None:
+  cache.propositional = settings['propositional']
+  cache.fixpoint = settings['fixpoint']
+  cache.resize(settings['maxsize'])
+  disk = settings['disk']
+  # a forked worker keeps the inherited cache, it reconnects by itself
+  if disk is None: cache.disk = None
+  elif cache.disk is None or cache.disk.path != disk[0]: cache.disk = DiskCache(*disk)
+
+def ReduceShard(prefix:list, fixed:dict = None):
+  records = [(attrs, Reduce(*attrs)) for attrs in Combinations(prefix)
+             if fixed is None or Matches(attrs, fixed)]
+  # a worker stores its new disk cache entries before the shard goes back
+  if cache.disk is not None: cache.disk.flush()
+  return records
+
+#
+# Streaming classification: yields records (attributes, ltl) lazily in sweep
+# order, the records are consumed by sinks one at a time. fixed restricts
+# the sweep to the tuples with the given attribute values
+#
+def Classify(workers:int = None, fixed:dict = None):
+  if workers == 1:
+    for attrs in Combinations([]):
+      if fixed is None or Matches(attrs, fixed):
+        yield attrs, Reduce(*attrs)
+    if cache.disk is not None: cache.disk.flush()
+    return
+  from concurrent.futures import ProcessPoolExecutor
+  from functools import partial
+  shards = [s for s in Shards() if fixed is None or Matches(s, fixed)]
+  with ProcessPoolExecutor(max_workers=workers, initializer=Configure, initargs=(Settings(),)) as pool:
+    # map keeps the shard order, so the stream is the same for any worker count
+    for records in pool.map(partial(ReduceShard, fixed=fixed), shards):
+      yield from records
+
+def Row(record) -> list:
+  attrs, ltl = record
+  return [a.printme() for a in attrs] + [ltl.printme()]
+
+class PrintSink:
+  def write(self, record) -> None:
+    print(' '.join(Row(record)), end=' \n')
+  def close(self) -> None:
+    pass
+
+#
+# Write-only workbook: openpyxl streams the rows into a temporary file
+# instead of keeping a cell object for every value
+#
+class WorkbookSink:
+  def __init__(self, path:str) -> None:
+    from openpyxl import Workbook
+    self.path = path
+    self.wb = Workbook(write_only=True)
+    self.ws = self.wb.create_sheet()
+  def write(self, record) -> None:
+    self.ws.append(Row(record))
+  def close(self) -> None:
+    self.wb.save(self.path)
+
+#
+# CSV file written in batches of bufsize rows, '-' is the standard output
+#
+class CsvSink:
+  def __init__(self, path:str, bufsize:int = 1024) -> None:
+    import csv, sys
+    self.path = path
+    self.f = sys.stdout if path == '-' else open(path, 'w', encoding='utf8', newline='')
+    self.writer = csv.writer(self.f)
+    self.bufsize = bufsize
+    self.rows = []
+  def write(self, record) -> None:
+    self.rows.append(Row(record))
+    if len(self.rows) >= self.bufsize:
+      self.flush()
+  def flush(self) -> None:
+    self.writer.writerows(self.rows)
+    self.rows = []
+  def close(self) -> None:
+    self.flush()
+    if self.path != '-': self.f.close()
+
+def FileSink(path:str):
+  if path.endswith('.csv'): return CsvSink(path)
+  return WorkbookSink(path)
+
+#
+# Equivalence classes of the sweep: attribute tuples grouped by the LTL
+# formula they simplify to. The key is the canonical form of the formula,
+# so classes that differ only in the order of ∧/∨ operands are merged
+#
+class ClassIndex:
+  def __init__(self) -> None:
+    self.classes = {}
+  def write(self, record) -> None:
+    attrs, ltl = record
+    ltl = Canonical(ltl)
+    members = self.classes.get(ltl)
+    if members is None:
+      members = self.classes[ltl] = []
+    members.append(attrs)
+  def close(self) -> None:
+    pass
+  def count(self) -> int:
+    return len(self.classes)
+  def sizes(self) -> dict:
+    return {ltl: len(members) for ltl, members in self.classes.items()}
+  # first attribute tuple of every class in sweep order
+  def representatives(self) -> dict:
+    return {ltl: members[0] for ltl, members in self.classes.items()}
+  def printme(self) -> str:
+    lines = ['%d classes' % self.count()]
+    ranked = sorted(self.classes.items(), key=lambda c: -len(c[1]))
+    for k, (ltl, members) in enumerate(ranked):
+      lines.append('%d: %d rows, %s, e.g. %s' % (k + 1, len(members), ltl.printme(),
+                   ' '.join(a.printme() for a in members[0])))
+    return '\n'.join(lines)
+
+
+#
+# MAIN
+#
+def Main(workers:int = None):
+
+  classes = ClassIndex()
+  sinks = [PrintSink(), FileSink('./edtl-ltl.xlsx'), classes]
+  for record in Classify(workers):
+    for sink in sinks:
+      sink.write(record)
+  for sink in sinks:
+    sink.close()
+
+  print()
+  print(classes.printme())
 
 
 
 if __name__ == '__main__':
-  Main()
\ No newline at end of file
+  Main()
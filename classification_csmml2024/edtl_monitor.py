@@ -0,0 +1,103 @@
+# Online monitoring of EDTL requirements
+#
+# A requirement is given by the six attributes used in convert2024.Main:
+# trigger, release, final, delay, reaction and invariant. Its meaning is the
+# LTL formula built there,
+#   G ((trig ∧ ¬rel) → ((inv ∧ ¬fin) W (rel ∨ (fin ∧ ((inv ∧ ¬del) W (rel ∨ (inv ∧ rea)))))))
+# A monitor reads the controller one cycle at a time and keeps two flags per
+# requirement, like the states of edtl_semantics.pml:
+#   final    a trigger is waiting for the final event, the invariant must hold
+#   reaction the final event happened, the invariant must hold and the
+#            delay must not expire before the reaction
+# Obligations started by different triggers that are in the same phase have
+# the same future, so two flags are enough and every cycle costs O(1).
+# Weak until is used, so obligations still open at the end of a log are not
+# violations.
+
+import csv
+
+from convert2024 import Term, TermType, BoolConstTerm
+
+
+# value of a propositional attribute in one cycle
+def Value(a, cycle:dict) -> bool:
+  if callable(a) and not isinstance(a, Term): return bool(a(cycle))
+  ty = a.ty
+  if ty == TermType.BoolConst: return a.val()
+  if ty == TermType.BoolVar: return bool(cycle[a.val()])
+  if ty == TermType.Not: return not Value(a.left(), cycle)
+  if ty == TermType.And: return Value(a.left(), cycle) and Value(a.right(), cycle)
+  if ty == TermType.Or: return Value(a.left(), cycle) or Value(a.right(), cycle)
+  if ty == TermType.Impl: return (not Value(a.left(), cycle)) or Value(a.right(), cycle)
+  raise ValueError('attribute is not propositional: ' + a.printme())
+
+#
+# Requirement: every attribute is a propositional Term over the cycle
+# variables or a callable taking the cycle dict
+#
+class Requirement:
+  def __init__(self, desc:str, trigger=None, release=None, final=None,
+               delay=None, reaction=None, invariant=None) -> None:
+    self.desc = desc
+    self.trigger = BoolConstTerm(True) if trigger is None else trigger
+    self.release = BoolConstTerm(False) if release is None else release
+    self.final = BoolConstTerm(True) if final is None else final
+    self.delay = BoolConstTerm(True) if delay is None else delay
+    self.reaction = BoolConstTerm(True) if reaction is None else reaction
+    self.invariant = BoolConstTerm(True) if invariant is None else invariant
+
+class Monitor:
+  def __init__(self, req:Requirement) -> None:
+    self.req = req
+    self.cycle = 0
+    self.final = False
+    self.reaction = False
+    self.violations = []
+
+  # reads one cycle, returns False when the requirement is violated in it
+  def step(self, cycle:dict) -> bool:
+    req = self.req
+    rel = Value(req.release, cycle)
+    inv = Value(req.invariant, cycle)
+    ok = True
+    final = False
+    reaction = self.reaction
+    if self.final or (not rel and Value(req.trigger, cycle)):
+      if rel: pass
+      elif Value(req.final, cycle): reaction = True
+      elif inv: final = True
+      else: ok = False
+    if reaction:
+      reaction = False
+      if rel or (inv and Value(req.reaction, cycle)): pass
+      elif inv and not Value(req.delay, cycle): reaction = True
+      else: ok = False
+    self.final = final
+    self.reaction = reaction
+    if not ok: self.violations.append(self.cycle)
+    self.cycle += 1
+    return ok
+
+  def state(self) -> str:
+    if self.final and self.reaction: return 'final+reaction'
+    if self.final: return 'final'
+    if self.reaction: return 'reaction'
+    return 'trigger'
+
+#
+# Monitors a set of requirements over a stream of cycles and yields
+# (cycle number, requirement) for every violation as soon as it happens
+#
+def Watch(reqs:list, cycles):
+  monitors = [Monitor(r) for r in reqs]
+  for k, cycle in enumerate(cycles):
+    for m in monitors:
+      if not m.step(cycle):
+        yield k, m.req
+
+# cycles of a CSV log with a header of variable names and 0/1 values,
+# the file is read lazily line by line
+def ReadCycles(path:str):
+  with open(path, encoding='utf8', newline='') as f:
+    for row in csv.DictReader(f):
+      yield {name: v.strip() not in ('0', '', 'false', 'False') for name, v in row.items()}
@@ -0,0 +1,270 @@
+# Equality saturation over the rewrite rules of convert2024
+#
+# An e-graph keeps classes of equivalent terms: a node is an operator with
+# the ids of its operand classes, and congruent nodes share a class. Every
+# rule of the rule sets is read as an equation lhs = rhs; saturation adds the
+# right-hand side of every match to the class of the match, so all rewrite
+# orders are explored at once instead of the first matching rule winning.
+# The run stops at a fixpoint or at the iteration, node or time limit, then
+# the cheapest term of a class is extracted by a cost model (size by default).
+
+import time
+
+from convert2024 import (Term, TermType, BoolConstTerm, BoolFreeTerm, RuleSet, ParsePattern,
+                         Constructors)
+import convert2024
+
+# identities the plain-function simplifiers (No, FutureSimpl) and the
+# builtin right-hand sides apply
+Builtins = [('¬true', 'false'), ('¬false', 'true'), ('¬¬a', 'a'), ('F true', 'true'), ('F false', 'false')]
+
+Leaves = (TermType.BoolConst, TermType.BoolVar)
+
+# left-hand sides that are not equations for arbitrary operands: the greedy
+# simplifier only meets them on operands where they hold, or after earlier
+# rules of the set failed, but in an e-graph they would merge classes with
+# different meaning (counterexamples were found on random traces)
+Contextual = frozenset([
+  'g@(G a) ∨ a',
+  'a ∨ (b ∧ (c ∨ u@(d U a)))',
+  'a ∨ (b ∧ ((d ∧ a) W (a ∨ (b ∧ c))))',
+  'a ∨ (b ∧ ((a ∧ d) W (a ∨ (b ∧ c))))',
+  'a ∨ (b ∧ (l@(c ∧ b) W (a ∨ (b ∧ d))))',
+  'a ∨ (b ∧ (l@(b ∧ c) W (a ∨ (b ∧ d))))',
+  'a ∨ (b ∧ (l@(c ∧ b) W (a ∨ (d ∧ b))))',
+  'a ∨ (b ∧ (l@(b ∧ c) W (a ∨ (d ∧ b))))',
+  'G (a ∨ (b W w@(c W a)))',
+  'a → (b@a W (a ∧ c))',
+  'a → w@(b W (a ∨ c))',
+])
+
+#
+# Equations of the rule sets as (rule name, lhs text, lhs pattern, rhs pattern),
+# rules with a builtin right-hand side and the excluded left-hand sides are
+# left out
+#
+def LoadRules(rulesets:list = None, exclude = Contextual) -> list:
+  if rulesets is None:
+    rulesets = sorted((v for v in vars(convert2024).values() if isinstance(v, RuleSet)), key=lambda rs: rs.name)
+  rules = []
+  for rs in rulesets:
+    for r in rs.rules:
+      if r.build.__name__ != '<lambda>': continue
+      rhs = ParsePattern(r.rhs)
+      for c in r.cases:
+        if c.text in exclude: continue
+        rules.append((r.name(), c.text, (rs.op,) + tuple(c.args), rhs))
+  for k, (lhs, rhs) in enumerate(Builtins):
+    rules.append(('builtin #%d' % (k + 1), lhs, ParsePattern(lhs), ParsePattern(rhs)))
+  return rules
+
+# cost of a node for extraction: one per node
+def Size(node) -> int:
+  return 1
+
+class EGraph:
+  def __init__(self) -> None:
+    self.parent = []
+    self.classes = {}
+    self.memo = {}
+
+  def find(self, c:int) -> int:
+    root = c
+    while self.parent[root] != root:
+      root = self.parent[root]
+    while self.parent[c] != root:
+      self.parent[c], c = root, self.parent[c]
+    return root
+
+  def canonical(self, node):
+    if node[0] in Leaves: return node
+    return (node[0],) + tuple(self.find(c) for c in node[1:])
+
+  def add(self, node) -> int:
+    node = self.canonical(node)
+    c = self.memo.get(node)
+    if c is not None: return self.find(c)
+    c = len(self.parent)
+    self.parent.append(c)
+    self.classes[c] = {node}
+    self.memo[node] = c
+    return c
+
+  def union(self, a:int, b:int) -> bool:
+    a = self.find(a)
+    b = self.find(b)
+    if a == b: return False
+    if len(self.classes[a]) < len(self.classes[b]): a, b = b, a
+    self.parent[b] = a
+    self.classes[a] |= self.classes.pop(b)
+    return True
+
+  # restores congruence: equal canonical nodes in different classes are merged
+  def rebuild(self) -> None:
+    while True:
+      memo = {}
+      merges = []
+      for c, nodes in self.classes.items():
+        nodes = {self.canonical(n) for n in nodes}
+        self.classes[c] = nodes
+        for n in nodes:
+          d = memo.get(n)
+          if d is None: memo[n] = c
+          elif d != c: merges.append((d, c))
+      if not merges:
+        self.memo = memo
+        return
+      for a, b in merges:
+        self.union(a, b)
+
+  def nodecount(self) -> int:
+    return len(self.memo)
+
+  # stores a term, returns its class
+  def addterm(self, t:Term) -> int:
+    ids = {}
+    stack = [t]
+    while stack:
+      x = stack[-1]
+      if x in ids:
+        stack.pop()
+        continue
+      n = x.childcount()
+      kids = (x.left(), x.right())[:n]
+      pending = [k for k in kids if k not in ids]
+      if pending:
+        stack.extend(pending)
+        continue
+      stack.pop()
+      if n == 0: ids[x] = self.add((x.ty, x.v))
+      else: ids[x] = self.add((x.ty,) + tuple(ids[k] for k in kids))
+    return ids[t]
+
+  #
+  # Matching: yields the environments {variable: class} of pattern p in
+  # class c; a complement of a variable bound later is checked at the end
+  #
+  def complement(self, a:int, b:int) -> bool:
+    a = self.find(a)
+    b = self.find(b)
+    if (TermType.Not, b) in self.classes[a] or (TermType.Not, a) in self.classes[b]: return True
+    ca = {n[1] for n in self.classes[a] if n[0] is TermType.BoolConst}
+    cb = {n[1] for n in self.classes[b] if n[0] is TermType.BoolConst}
+    return any(x != y for x in ca for y in cb)
+
+  def match(self, p, c:int, env:dict):
+    c = self.find(c)
+    tag = p[0]
+    if tag == 'var':
+      x = p[1]
+      if x in env:
+        if self.find(env[x]) == c: yield env
+      else:
+        e = dict(env)
+        e[x] = c
+        yield e
+    elif tag == 'not':
+      x = p[1]
+      if x in env:
+        if self.complement(env[x], c): yield env
+      else:
+        e = dict(env)
+        e['~'] = env.get('~', ()) + ((x, c),)
+        yield e
+    elif tag == 'const':
+      if (TermType.BoolConst, p[1]) in self.classes[c]: yield env
+    elif tag == 'atom':
+      if (TermType.BoolVar, p[1]) in self.classes[c]: yield env
+    elif tag == 'as':
+      for e in self.match(('var', p[1]), c, env):
+        yield from self.match(p[2], c, e)
+    else:
+      for node in list(self.classes[c]):
+        if node[0] is not tag: continue
+        if len(p) == 2:
+          yield from self.match(p[1], node[1], env)
+        else:
+          for e in self.match(p[1], node[1], env):
+            yield from self.match(p[2], node[2], e)
+
+  def matches(self, lhs, c:int):
+    for env in self.match(lhs, c, {}):
+      if all(self.complement(env[x], d) for x, d in env.get('~', ())):
+        yield env
+
+  def instantiate(self, p, env:dict) -> int:
+    tag = p[0]
+    if tag == 'var': return env[p[1]]
+    if tag == 'const': return self.add((TermType.BoolConst, p[1]))
+    if tag == 'atom': return self.add((TermType.BoolVar, p[1]))
+    return self.add((tag,) + tuple(self.instantiate(q, env) for q in p[1:]))
+
+  #
+  # Saturation: every iteration collects the matches of all rules first and
+  # applies them after, then restores congruence
+  #
+  def run(self, rules:list, iterations:int = 30, nodes:int = 20000, seconds:float = 5.0) -> str:
+    deadline = time.perf_counter() + seconds
+    for k in range(iterations):
+      found = []
+      for name, text, lhs, rhs in rules:
+        for c in list(self.classes):
+          for env in self.matches(lhs, c):
+            found.append((c, rhs, env))
+        if time.perf_counter() > deadline: return 'time'
+      changed = False
+      for c, rhs, env in found:
+        if self.union(c, self.instantiate(rhs, env)): changed = True
+        if self.nodecount() > nodes: break
+      self.rebuild()
+      if not changed: return 'saturated'
+      if self.nodecount() > nodes: return 'nodes'
+      if time.perf_counter() > deadline: return 'time'
+    return 'iterations'
+
+  #
+  # Extraction: best cost of every class by relaxation, then the term of the
+  # cheapest node, operands first
+  #
+  def costs(self, cost) -> dict:
+    best = {}
+    changed = True
+    while changed:
+      changed = False
+      for c, nodes in self.classes.items():
+        for n in nodes:
+          if n[0] in Leaves: k = cost(n)
+          elif all(d in best for d in n[1:]): k = cost(n) + sum(best[d][0] for d in n[1:])
+          else: continue
+          if c not in best or k < best[c][0]:
+            best[c] = (k, n)
+            changed = True
+    return best
+
+  def extract(self, c:int, cost = Size) -> Term:
+    best = self.costs(cost)
+    built = {}
+    stack = [self.find(c)]
+    while stack:
+      d = stack[-1]
+      if d in built:
+        stack.pop()
+        continue
+      n = best[d][1]
+      if n[0] is TermType.BoolConst: built[d] = BoolConstTerm(n[1])
+      elif n[0] is TermType.BoolVar: built[d] = BoolFreeTerm(n[1])
+      else:
+        pending = [e for e in n[1:] if e not in built]
+        if pending:
+          stack.extend(pending)
+          continue
+        built[d] = Constructors[n[0]](*(built[e] for e in n[1:]))
+      stack.pop()
+    return built[self.find(c)]
+
+# smallest term equal to t under the rules, with the limits of EGraph.run
+def Minimize(t:Term, rules:list = None, cost = Size, **limits) -> Term:
+  g = EGraph()
+  c = g.addterm(t)
+  g.run(LoadRules() if rules is None else rules, **limits)
+  return g.extract(c, cost)
@@ -0,0 +1,190 @@
+# Bounded semantic equivalence of LTL terms on lasso traces
+#
+# A lasso of length n with loop start l is the infinite trace
+# s0 .. s(l-1) (sl .. s(n-1))^ω. For one shape (n, l) and k variables all
+# 2^(k n) lassos are evaluated at once: a value is a list of n integers, bit j
+# of the integer at position i is the value at i on lasso number j, and
+# variable number v holds at i on the lassos whose number has bit i k + v set.
+# Boolean operators are single integer operations, U and W are two backward
+# passes over the loop and one over the prefix.
+# Two terms are reported equal when they agree on every lasso up to the
+# bound; a difference is always a real counterexample, an equality is only
+# as good as the bound (18 variable bits by default, e.g. 3 positions for the
+# six sweep variables).
+
+from convert2024 import Term, TermType, Canonical, SortKey, ClassIndex
+from convert2024 import BoolConstTerm, BoolFreeTerm, NotTerm, Constructors
+
+# variable bits of a shape, every integer then has 2^Lanes bits
+Lanes = 18
+# longest lasso when there are few variables
+Longest = 6
+
+def Variables(*terms) -> list:
+  names = set()
+  seen = set()
+  stack = list(terms)
+  while stack:
+    t = stack.pop()
+    if t in seen: continue
+    seen.add(t)
+    if t.ty is TermType.BoolVar: names.add(t.v)
+    stack.extend((t.left(), t.right())[:t.childcount()])
+  return sorted(names)
+
+def Bound(k:int, lanes:int = Lanes) -> int:
+  return max(1, min(Longest, lanes // max(k, 1)))
+
+# the lassos of length 1 .. bound, as (length, loop start)
+def Shapes(bound:int):
+  for n in range(1, bound + 1):
+    for l in range(n):
+      yield n, l
+
+# integer with bit j set on the lanes j that have bit b set, 2^width lanes
+def Projection(b:int, width:int) -> int:
+  block = 1 << b
+  m = ((1 << block) - 1) << block
+  size = 2 * block
+  while size < 1 << width:
+    m |= m << size
+    size *= 2
+  return m
+
+#
+# All lassos of one shape over the given variables
+#
+class Lasso:
+  def __init__(self, names:list, n:int, loop:int) -> None:
+    self.names = names
+    self.n = n
+    self.loop = loop
+    k = len(names)
+    self.width = k * n
+    self.ones = (1 << (1 << self.width)) - 1
+    self.vars = {s: [Projection(i * k + v, self.width) for i in range(n)] for v, s in enumerate(names)}
+
+  # least (U) or greatest (W) solution of x = b ∨ (a ∧ X x)
+  def until(self, a:list, b:list, weak:bool) -> list:
+    x = [0] * self.n
+    nxt = self.ones if weak else 0
+    for k in range(2):
+      for i in range(self.n - 1, self.loop - 1, -1):
+        nxt = x[i] = b[i] | (a[i] & nxt)
+    for i in range(self.loop - 1, -1, -1):
+      nxt = x[i] = b[i] | (a[i] & nxt)
+    return x
+
+  # values of the term at every position, shared subterms are evaluated once
+  def evaluate(self, term:Term) -> list:
+    ones = self.ones
+    values = {}
+    stack = [term]
+    while stack:
+      t = stack[-1]
+      if t in values:
+        stack.pop()
+        continue
+      kids = [k for k in (t.left(), t.right())[:t.childcount()] if k not in values]
+      if kids:
+        stack.extend(kids)
+        continue
+      stack.pop()
+      ty = t.ty
+      if ty is TermType.BoolConst: v = [ones if t.v else 0] * self.n
+      elif ty is TermType.BoolVar: v = self.vars[t.v]
+      elif ty is TermType.Not: v = [ones ^ x for x in values[t.a]]
+      elif ty is TermType.G: v = self.until(values[t.a], [0] * self.n, True)
+      elif ty is TermType.F: v = self.until([ones] * self.n, values[t.a], False)
+      else:
+        a = values[t.a]
+        b = values[t.b]
+        if ty is TermType.And: v = [x & y for x, y in zip(a, b)]
+        elif ty is TermType.Or: v = [x | y for x, y in zip(a, b)]
+        elif ty is TermType.Impl: v = [(ones ^ x) | y for x, y in zip(a, b)]
+        elif ty is TermType.U: v = self.until(a, b, False)
+        elif ty is TermType.W: v = self.until(a, b, True)
+        else: raise ValueError('cannot evaluate ' + t.printme())
+      values[t] = v
+    return values[term]
+
+  # lasso number j as (steps, loop start), a step is the set of true variables
+  def trace(self, j:int):
+    k = len(self.names)
+    steps = [{s for v, s in enumerate(self.names) if j >> (i * k + v) & 1} for i in range(self.n)]
+    return steps, self.loop
+
+#
+# Comparison of two terms: None when they agree on all lassos up to the
+# bound, else a counterexample (steps, loop start)
+#
+def Counterexample(a:Term, b:Term, bound:int = None):
+  names = Variables(a, b)
+  if bound is None: bound = Bound(len(names))
+  for n, l in Shapes(bound):
+    lasso = Lasso(names, n, l)
+    diff = lasso.evaluate(a)[0] ^ lasso.evaluate(b)[0]
+    if diff: return lasso.trace((diff & -diff).bit_length() - 1)
+  return None
+
+def Equivalent(a:Term, b:Term, bound:int = None) -> bool:
+  return a is b or Counterexample(a, b, bound) is None
+
+def PrintTrace(trace) -> str:
+  steps, loop = trace
+  text = ['{' + ', '.join(sorted(s)) + '}' for s in steps]
+  return ' '.join(text[:loop] + ['('] + text[loop:] + [')ω'])
+
+#
+# Validation of the rule sets: every rule case read as an equation, with the
+# pattern variables as propositions (LTL validity is closed under
+# substitution, so this covers all operands)
+#
+def Instantiate(p, env:dict) -> Term:
+  tag = p[0]
+  if tag == 'var': return env.get(p[1]) or BoolFreeTerm(p[1])
+  if tag == 'not': return NotTerm(env.get(p[1]) or BoolFreeTerm(p[1]))
+  if tag == 'const': return BoolConstTerm(p[1])
+  if tag == 'atom': return BoolFreeTerm(p[1])
+  if tag == 'as':
+    t = env[p[1]] = Instantiate(p[2], env)
+    return t
+  return Constructors[tag](*(Instantiate(q, env) for q in p[1:]))
+
+# (rule name, lhs text, counterexample) of every left-hand side that changes
+# the meaning, in the first operand order that does
+def CheckRules(rulesets:list = None, bound:int = None) -> list:
+  from egraph import LoadRules
+  failed = []
+  for name, text, lhs, rhs in LoadRules(rulesets, exclude=()):
+    if failed and failed[-1][:2] == (name, text): continue
+    env = {}
+    # the second pass sees the bindings of @ made anywhere in the lhs
+    Instantiate(lhs, env)
+    l = Instantiate(lhs, env)
+    r = Instantiate(rhs, env)
+    trace = Counterexample(l, r, bound)
+    if trace is not None: failed.append((name, text, trace))
+  return failed
+
+#
+# Merges the classes of an index whose formulas are equal up to the bound,
+# the smallest formula of a group names the merged class
+#
+def Fingerprint(t:Term, lassos:list) -> tuple:
+  return tuple(lasso.evaluate(t)[0] for lasso in lassos)
+
+def MergeClasses(index:ClassIndex, bound:int = None) -> ClassIndex:
+  names = Variables(*index.classes)
+  if bound is None: bound = Bound(len(names))
+  lassos = [Lasso(names, n, l) for n, l in Shapes(bound)]
+  groups = {}
+  for ltl in index.classes:
+    groups.setdefault(Fingerprint(ltl, lassos), []).append(ltl)
+  merged = ClassIndex()
+  for group in groups.values():
+    first = min(group, key=lambda t: (len(SortKey(t)), SortKey(t)))
+    members = merged.classes[Canonical(first)] = []
+    for ltl in group:
+      members.extend(index.classes[ltl])
+  return merged
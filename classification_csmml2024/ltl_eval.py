@@ -0,0 +1,90 @@
+# Vectorized evaluation of LTL terms over finite traces
+#
+# A trace is a dict of equally long boolean NumPy arrays, one per BoolFreeTerm
+# name. A term is evaluated bottom-up into an array holding its value at every
+# position of the trace, using the finite-trace semantics:
+#   G a at i   a holds at every j in [i, n)
+#   F a at i   a holds at some j in [i, n)
+#   a U b at i b holds at some j >= i and a holds on [i, j)
+#   a W b at i a U b, or G a
+# Temporal operators are computed with backward scans over whole arrays,
+# so a trace of millions of cycles costs a few array passes per operator.
+
+import numpy as np
+
+from convert2024 import Term, TermType
+
+
+# index of the first true value at or after every position, n if there is none
+def NextTrue(x:np.ndarray) -> np.ndarray:
+  n = len(x)
+  idx = np.where(x, np.arange(n), n)
+  return np.minimum.accumulate(idx[::-1])[::-1]
+
+def Globally(a:np.ndarray) -> np.ndarray:
+  return np.logical_and.accumulate(a[::-1])[::-1]
+
+def Future(a:np.ndarray) -> np.ndarray:
+  return np.logical_or.accumulate(a[::-1])[::-1]
+
+def Until(a:np.ndarray, b:np.ndarray) -> np.ndarray:
+  nb = NextTrue(b)
+  return (nb < len(b)) & (nb <= NextTrue(~a))
+
+def WeakUntil(a:np.ndarray, b:np.ndarray) -> np.ndarray:
+  # with no b ahead nb is n, and a holding to the end gives n as well
+  return NextTrue(b) <= NextTrue(~a)
+
+def TraceLength(trace:dict) -> int:
+  lengths = {len(v) for v in trace.values()}
+  if len(lengths) != 1:
+    raise ValueError('trace must have variables of one common length')
+  return lengths.pop()
+
+#
+# Evaluates a term at every position of the trace, shared subterms of the
+# term DAG are evaluated once
+#
+def Evaluate(term:Term, trace:dict) -> np.ndarray:
+  n = TraceLength(trace)
+  values = {}
+  stack = [term]
+  while stack:
+    t = stack[-1]
+    if t in values:
+      stack.pop()
+      continue
+    kids = [k for k in (t.left(), t.right())[:t.childcount()] if k not in values]
+    if kids:
+      stack.extend(kids)
+      continue
+    stack.pop()
+    ty = t.ty
+    if ty == TermType.BoolConst:
+      v = np.full(n, t.val(), dtype=bool)
+    elif ty == TermType.BoolVar:
+      if t.val() not in trace: raise KeyError('trace has no variable ' + t.val())
+      v = np.asarray(trace[t.val()], dtype=bool)
+    elif ty == TermType.Not:
+      v = ~values[t.left()]
+    elif ty == TermType.G:
+      v = Globally(values[t.left()])
+    elif ty == TermType.F:
+      v = Future(values[t.left()])
+    else:
+      a = values[t.left()]
+      b = values[t.right()]
+      if ty == TermType.And: v = a & b
+      elif ty == TermType.Or: v = a | b
+      elif ty == TermType.Impl: v = ~a | b
+      elif ty == TermType.U: v = Until(a, b)
+      elif ty == TermType.W: v = WeakUntil(a, b)
+      else: raise ValueError('cannot evaluate ' + t.printme())
+    values[t] = v
+  return values[term]
+
+# does the trace satisfy the term from its first position
+def Holds(term:Term, trace:dict) -> bool:
+  if TraceLength(trace) == 0:
+    raise ValueError('finite-trace semantics needs a non-empty trace')
+  return bool(Evaluate(term, trace)[0])
@@ -0,0 +1,142 @@
+# Binary store of classification results
+#
+# Layout, all integers little-endian:
+#   magic          8 bytes
+#   rows           7 int32 per record: arena roots of the six attributes
+#                  (trigger, release, invariant, final, delay, reaction)
+#                  and of the simplified formula
+#   left, right    int32 per arena node
+#   op             one byte per arena node
+#   names          variable names separated by zero bytes
+#   footer         magic, row count, node offset, node count,
+#                  names offset, names length
+# Rows are appended while the sweep runs, the shared term DAG is small and is
+# written after them on close, so a store is readable only after close(): a
+# sweep interrupted before has no footer and its file cannot be read. A
+# reader maps the file and decodes only the rows and nodes it touches.
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from term_arena import Arena
+
+Magic = b'EDTLRS\x00\x01'
+Footer = struct.Struct('<8sQQQQQ')
+RowSize = 7
+
+def LittleEndian(a:array) -> bytes:
+  if sys.byteorder != 'little':
+    a = array(a.typecode, a)
+    a.byteswap()
+  return a.tobytes()
+
+#
+# Sink writing the store, rows are flushed in batches of bufsize
+#
+class StoreSink:
+  def __init__(self, path:str, bufsize:int = 1024) -> None:
+    self.f = open(path, 'wb')
+    self.f.write(Magic)
+    self.arena = Arena()
+    self.bufsize = bufsize
+    self.rows = array('i')
+    self.count = 0
+  def write(self, record) -> None:
+    attrs, ltl = record
+    for t in attrs:
+      self.rows.append(self.arena.add(t))
+    self.rows.append(self.arena.add(ltl))
+    self.count += 1
+    if len(self.rows) >= self.bufsize * RowSize:
+      self.flush()
+  def flush(self) -> None:
+    self.f.write(LittleEndian(self.rows))
+    self.rows = array('i')
+  def close(self) -> None:
+    self.flush()
+    arena = self.arena
+    nodes = self.f.tell()
+    self.f.write(LittleEndian(arena.left))
+    self.f.write(LittleEndian(arena.right))
+    self.f.write(arena.op.tobytes())
+    names = '\0'.join(arena.names).encode('utf8')
+    self.f.write(names)
+    self.f.write(Footer.pack(Magic, self.count, nodes, len(arena), nodes + 9 * len(arena), len(names)))
+    self.f.close()
+
+#
+# Random-access reader over a memory-mapped store. The size, the magic and
+# the footer are checked before anything is decoded, a file that fails is
+# closed and reported with ValueError
+#
+class ResultStore:
+  def __init__(self, path:str) -> None:
+    self.f = open(path, 'rb')
+    self.mm = None
+    self.views = []
+    try:
+      self.map(path)
+    except BaseException:
+      self.close()
+      raise
+
+  def map(self, path:str) -> None:
+    size = os.fstat(self.f.fileno()).st_size
+    # an empty file cannot be mapped at all
+    if size < len(Magic) + Footer.size or self.f.read(len(Magic)) != Magic:
+      raise ValueError(path + ' is not a result store')
+    self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, self.count, nodes, n, names, namelen = Footer.unpack_from(self.mm, size - Footer.size)
+    if magic != Magic:
+      raise ValueError(path + ' is not a complete result store (was the sink closed?)')
+    if len(Magic) + 4 * RowSize * self.count != nodes or nodes + 9 * n != names or names + namelen != size - Footer.size:
+      raise ValueError(path + ' is a damaged result store')
+    mv = memoryview(self.mm)
+    self.views.append(mv)
+    self.rows = self.ints(mv, len(Magic), self.count * RowSize)
+    self.arena = Arena()
+    self.arena.left = self.ints(mv, nodes, n)
+    self.arena.right = self.ints(mv, nodes + 4 * n, n)
+    self.arena.op = mv[nodes + 8 * n:nodes + 9 * n]
+    self.views.append(self.arena.op)
+    self.arena.names = bytes(mv[names:names + namelen]).decode('utf8').split('\0') if namelen else []
+
+  def ints(self, mv:memoryview, offset:int, n:int):
+    if sys.byteorder != 'little':
+      a = array('i', mv[offset:offset + 4 * n])
+      a.byteswap()
+      return a
+    v = mv[offset:offset + 4 * n].cast('i')
+    self.views.append(v)
+    return v
+
+  def __len__(self) -> int:
+    return self.count
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  # record k as lazy arena views: (attributes, ltl)
+  def __getitem__(self, k:int):
+    if k < 0: k += self.count
+    if not 0 <= k < self.count: raise IndexError('record %d out of range' % k)
+    row = self.rows[RowSize * k:RowSize * (k + 1)]
+    return tuple(self.arena[i] for i in row[:-1]), self.arena[row[-1]]
+
+  # record k as ordinary hash-consed terms
+  def record(self, k:int):
+    attrs, ltl = self[k]
+    return tuple(self.arena.term(a.i) for a in attrs), self.arena.term(ltl.i)
+
+  def close(self) -> None:
+    for v in reversed(self.views):
+      v.release()
+    self.views = []
+    if self.mm is not None: self.mm.close()
+    self.f.close()
@@ -0,0 +1,195 @@
+# Array-backed storage for many LTL terms
+#
+# Nodes live in parallel arrays instead of one Python object each:
+#   op    array('B')  TermType value of the node
+#   left  array('i')  index of the left child, for a constant 0/1, for a
+#                     variable the index of its name in the string table
+#   right array('i')  index of the right child, -1 when there is none
+# Children always come before their parents and equal subterms are stored
+# once, so an index identifies a structure just like a hash-consed node.
+# ArenaTerm reads nodes lazily with the Term interface, add() and term()
+# convert between arena indices and ordinary hash-consed terms.
+
+from array import array
+
+from convert2024 import (Term, TermType, BoolConstTerm, BoolFreeTerm, NotTerm, AndTerm,
+                         OrTerm, ImplTerm, UTerm, WTerm, GTerm, FTerm)
+
+Classes = {c.ty: c for c in (BoolConstTerm, BoolFreeTerm, NotTerm, AndTerm, OrTerm,
+                               ImplTerm, UTerm, WTerm, GTerm, FTerm)}
+Kinds = {ty.value: ty for ty in TermType}
+Unary = {TermType.Not: "¬", TermType.G: "G ", TermType.F: "F "}
+Binary = {TermType.And: " ∧ ", TermType.Or: " ∨ ", TermType.Impl: " → ",
+          TermType.U: " U ", TermType.W: " W "}
+
+
+class Arena:
+  def __init__(self) -> None:
+    self.op = array('B')
+    self.left = array('i')
+    self.right = array('i')
+    self.names = []
+    # dedup tables, built on the first add(): read-only and unpickled
+    # arenas never pay for them
+    self.nameids = None
+    self.index = None
+
+  def __len__(self) -> int:
+    return len(self.op)
+
+  # only the arrays are stored
+  def __getstate__(self):
+    return (self.op, self.left, self.right, self.names)
+
+  def __setstate__(self, state) -> None:
+    self.__init__()
+    self.op, self.left, self.right, self.names = state
+
+  # one int per node: (left, right + 1, op) packed
+  @staticmethod
+  def key(op:int, l:int, r:int) -> int:
+    return ((l << 32 | (r + 1)) << 8) | op
+
+  def indexed(self) -> None:
+    if self.index is not None: return
+    self.nameids = {s: k for k, s in enumerate(self.names)}
+    self.index = {self.key(o, l, r): i for i, (o, l, r) in enumerate(zip(self.op, self.left, self.right))}
+
+  # drops the dedup tables of a finished arena, add() builds them again
+  def compact(self) -> None:
+    self.nameids = None
+    self.index = None
+
+  def name(self, s:str) -> int:
+    k = self.nameids.get(s)
+    if k is None:
+      k = len(self.names)
+      self.names.append(s)
+      self.nameids[s] = k
+    return k
+
+  def node(self, op:int, l:int, r:int) -> int:
+    key = self.key(op, l, r)
+    i = self.index.get(key)
+    if i is None:
+      i = len(self.op)
+      self.op.append(op)
+      self.left.append(l)
+      self.right.append(r)
+      self.index[key] = i
+    return i
+
+  # stores a term and returns the index of its root
+  def add(self, t:Term) -> int:
+    self.indexed()
+    done = {}
+    stack = [t]
+    while stack:
+      x = stack[-1]
+      if x in done:
+        stack.pop()
+        continue
+      ty = x.ty
+      if ty is TermType.BoolConst:
+        done[x] = self.node(ty.value, int(x.v), -1)
+      elif ty is TermType.BoolVar:
+        done[x] = self.node(ty.value, self.name(x.v), -1)
+      else:
+        kids = [k for k in (x.left(), x.right())[:x.childcount()] if k not in done]
+        if kids:
+          stack.extend(kids)
+          continue
+        r = done[x.right()] if x.childcount() == 2 else -1
+        done[x] = self.node(ty.value, done[x.left()], r)
+      stack.pop()
+    return done[t]
+
+  # rebuilds the hash-consed term of an index
+  def term(self, i:int) -> Term:
+    built = {}
+    stack = [i]
+    while stack:
+      j = stack[-1]
+      if j in built:
+        stack.pop()
+        continue
+      ty = Kinds[self.op[j]]
+      l = self.left[j]
+      r = self.right[j]
+      if ty is TermType.BoolConst:
+        built[j] = BoolConstTerm(bool(l))
+      elif ty is TermType.BoolVar:
+        built[j] = BoolFreeTerm(self.names[l])
+      else:
+        kids = [k for k in (l, r) if k >= 0 and k not in built]
+        if kids:
+          stack.extend(kids)
+          continue
+        if r < 0: built[j] = Classes[ty](built[l])
+        else: built[j] = Classes[ty](built[l], built[r])
+      stack.pop()
+    return built[i]
+
+  def __getitem__(self, i:int) -> 'ArenaTerm':
+    return ArenaTerm(self, i)
+
+#
+# Lazy Term view of one arena node
+#
+class ArenaTerm(Term):
+  __slots__ = ('arena', 'i')
+  def __new__(cls, arena:Arena, i:int):
+    t = object.__new__(cls)
+    t.arena = arena
+    t.i = i
+    return t
+  def __reduce__(self):
+    return (ArenaTerm, (self.arena, self.i))
+  @property
+  def ty(self) -> TermType:
+    return Kinds[self.arena.op[self.i]]
+  @property
+  def a(self) -> 'ArenaTerm':
+    return ArenaTerm(self.arena, self.arena.left[self.i])
+  @property
+  def b(self) -> 'ArenaTerm':
+    return ArenaTerm(self.arena, self.arena.right[self.i])
+  @property
+  def v(self):
+    l = self.arena.left[self.i]
+    if self.ty is TermType.BoolConst: return bool(l)
+    return self.arena.names[l]
+  def childcount(self) -> int:
+    if self.arena.right[self.i] >= 0: return 2
+    if self.ty in Unary: return 1
+    return 0
+  def left(self) -> 'ArenaTerm':
+    return self.a
+  def right(self) -> 'ArenaTerm':
+    return self.b
+  def val(self):
+    return self.v
+  def printme(self) -> str:
+    ty = self.ty
+    if ty is TermType.BoolConst: return "true" if self.v else "false"
+    if ty is TermType.BoolVar: return self.v
+    if ty in Unary: return Unary[ty] + Wrapped(self.a)
+    return Wrapped(self.a) + Binary[ty] + Wrapped(self.b)
+  def equals(self, other:Term) -> bool:
+    return self == other
+  def __eq__(self, other) -> bool:
+    return isinstance(other, ArenaTerm) and self.arena is other.arena and self.i == other.i
+  def __hash__(self) -> int:
+    return hash((id(self.arena), self.i))
+
+def Wrapped(a:ArenaTerm) -> str:
+  if a.ty in (TermType.BoolConst, TermType.BoolVar, TermType.Not): return a.printme()
+  return "(" + a.printme() + ")"
+
+# stores a list of terms, returns the arena and the root indices
+def ToArena(terms:list, arena:Arena = None):
+  if arena is None: arena = Arena()
+  return arena, [arena.add(t) for t in terms]
+
+def FromArena(arena:Arena, roots:list) -> list:
+  return [arena.term(i) for i in roots]
@@ -0,0 +1,743 @@
+# Tests of the simplifiers, the sweep and the evaluators
+#
+#   python -m unittest discover classification_csmml2024/tests
+#
+# The rule engine is compared with the elif chains it replaced
+# (legacy_convert2024.py), the evaluators with a naive recursive one.
+
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import convert2024 as c
+import equiv
+import legacy_convert2024 as legacy
+from convert2024 import TermType, BoolConstTerm, BoolFreeTerm, NotTerm
+from convert2024 import AndTerm, OrTerm, ImplTerm, WTerm, GTerm
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+# sha256 of the rows of the default sweep, one line per record
+Golden = '300649805710b4f5a47d03fe956b181190b99564d75c40c570c5f4b302a915b2'
+
+Leaves = ['a', 'b', 'c', 'rel', True, False]
+Unary = ['NotTerm', 'GTerm', 'FTerm']
+Binary = ['AndTerm', 'OrTerm', 'ImplTerm', 'WTerm', 'UTerm']
+
+#
+# Random term of depth up to depth, built with the classes of module m so
+# that the same seed gives the same formula in both implementations
+#
+def RandomTerm(m, depth:int, r:random.Random):
+  if depth == 0 or r.random() < 0.25:
+    x = r.choice(Leaves)
+    if isinstance(x, bool): return m.BoolConstTerm(x)
+    return m.BoolFreeTerm(x)
+  name = r.choice(Unary + Binary)
+  if name in Unary: return getattr(m, name)(RandomTerm(m, depth - 1, r))
+  return getattr(m, name)(RandomTerm(m, depth - 1, r), RandomTerm(m, depth - 1, r))
+
+# t rebuilt with the classes of convert2024 and every ¬¬ pair removed
+def Plain(t):
+  name = type(t).__name__
+  if name == 'NotTerm' and type(t.left()).__name__ == 'NotTerm': return Plain(t.left().left())
+  n = t.childcount()
+  if n == 0: return getattr(c, name)(t.v)
+  if n == 1: return getattr(c, name)(Plain(t.left()))
+  return getattr(c, name)(Plain(t.left()), Plain(t.right()))
+
+def Sweep() -> str:
+  return '\n'.join(' '.join(c.Row(record)) for record in c.Classify(1))
+
+#
+# Value of t at position i of a finite trace of length n, straight from the
+# definitions (U and W look at the rest of the trace, W holds at its end)
+#
+def Naive(t, trace:dict, i:int, n:int) -> bool:
+  ty = t.ty
+  if ty is TermType.BoolConst: return t.v
+  if ty is TermType.BoolVar: return bool(trace[t.v][i])
+  if ty is TermType.Not: return not Naive(t.a, trace, i, n)
+  if ty is TermType.And: return Naive(t.a, trace, i, n) and Naive(t.b, trace, i, n)
+  if ty is TermType.Or: return Naive(t.a, trace, i, n) or Naive(t.b, trace, i, n)
+  if ty is TermType.Impl: return (not Naive(t.a, trace, i, n)) or Naive(t.b, trace, i, n)
+  if ty is TermType.G: return all(Naive(t.a, trace, j, n) for j in range(i, n))
+  if ty is TermType.F: return any(Naive(t.a, trace, j, n) for j in range(i, n))
+  for j in range(i, n):
+    if Naive(t.b, trace, j, n): return True
+    if not Naive(t.a, trace, j, n): return False
+  return ty is TermType.W
+
+# the EDTL requirement as in convert2024.Main, before any simplification
+def Requirement(trigger, release, invariant, final, delay, reaction):
+  return GTerm(ImplTerm(AndTerm(trigger, NotTerm(release)),
+    WTerm(AndTerm(invariant, NotTerm(final)), OrTerm(release, AndTerm(final,
+      WTerm(AndTerm(invariant, NotTerm(delay)), OrTerm(release, AndTerm(invariant, reaction))))))))
+
+#
+# Value of t at position i of the lasso steps[:loop] steps[loop:]^ω, steps
+# are sets of true variables: a future position is reached within n steps
+#
+def LassoNaive(t, steps:list, loop:int, i:int) -> bool:
+  n = len(steps)
+  def path(i:int) -> list:
+    out = []
+    for k in range(n + 1):
+      out.append(i)
+      i = i + 1 if i + 1 < n else loop
+    return out
+  ty = t.ty
+  if ty is TermType.BoolConst: return t.v
+  if ty is TermType.BoolVar: return t.v in steps[i]
+  if ty is TermType.Not: return not LassoNaive(t.a, steps, loop, i)
+  if ty is TermType.And: return LassoNaive(t.a, steps, loop, i) and LassoNaive(t.b, steps, loop, i)
+  if ty is TermType.Or: return LassoNaive(t.a, steps, loop, i) or LassoNaive(t.b, steps, loop, i)
+  if ty is TermType.Impl: return not LassoNaive(t.a, steps, loop, i) or LassoNaive(t.b, steps, loop, i)
+  if ty is TermType.G: return all(LassoNaive(t.a, steps, loop, j) for j in path(i))
+  if ty is TermType.F: return any(LassoNaive(t.a, steps, loop, j) for j in path(i))
+  for j in path(i):
+    if LassoNaive(t.b, steps, loop, j): return True
+    if not LassoNaive(t.a, steps, loop, j): return False
+  return ty is TermType.W
+
+# {variable: list of values} of length n
+def RandomTrace(names:list, n:int, r:random.Random) -> dict:
+  return {v: [r.random() < 0.5 for i in range(n)] for v in names}
+
+
+class SweepTest(unittest.TestCase):
+  def setUp(self) -> None:
+    c.cache.clear()
+
+  def test_golden(self) -> None:
+    rows = Sweep()
+    self.assertEqual(rows.count('\n') + 1, 3369)
+    self.assertEqual(hashlib.sha256(rows.encode('utf8')).hexdigest(), Golden)
+
+  def test_cached(self) -> None:
+    first = Sweep()
+    self.assertEqual(Sweep(), first)
+
+  # map keeps the shard order, so a pool gives the stream of one process
+  def test_workers(self) -> None:
+    records = list(c.Classify(2))
+    self.assertEqual(records, list(c.Classify(1)))
+    fixed = {'trigger': BoolFreeTerm('trig'), 'final': BoolFreeTerm('fin')}
+    self.assertEqual(list(c.Classify(2, fixed)), list(c.Classify(1, fixed)))
+
+  def test_settings(self) -> None:
+    saved = c.Settings()
+    try:
+      c.cache.propositional = True
+      c.cache.fixpoint = True
+      c.cache.resize(1000)
+      settings = c.Settings()
+      c.Configure(saved)
+      self.assertFalse(c.cache.propositional)
+      c.Configure(settings)
+      self.assertEqual((c.cache.propositional, c.cache.fixpoint, c.cache.maxsize), (True, True, 1000))
+    finally:
+      c.Configure(saved)
+
+  # a spawned worker imports the module afresh and only has the settings
+  def test_spawn(self) -> None:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    c.cache.propositional = True
+    try:
+      expected = list(c.Classify(1))
+      context = multiprocessing.get_context('spawn')
+      with ProcessPoolExecutor(2, mp_context=context, initializer=c.Configure, initargs=(c.Settings(),)) as pool:
+        records = [r for shard in pool.map(c.ReduceShard, c.Shards()) for r in shard]
+    finally:
+      c.cache.propositional = False
+    self.assertEqual(records, expected)
+    index = c.ClassIndex()
+    for record in records:
+      index.write(record)
+    self.assertEqual(index.count(), 211)
+
+  def test_classes(self) -> None:
+    index = c.ClassIndex()
+    for record in c.Classify(1):
+      index.write(record)
+    self.assertEqual(index.count(), 213)
+    self.assertEqual(sum(index.sizes().values()), 3369)
+
+
+class TermsTest(unittest.TestCase):
+  def test_interned(self) -> None:
+    a = BoolFreeTerm('a')
+    t = AndTerm(a, NotTerm(BoolFreeTerm('b')))
+    self.assertIs(AndTerm(BoolFreeTerm('a'), NotTerm(BoolFreeTerm('b'))), t)
+    self.assertIsNot(OrTerm(a, NotTerm(BoolFreeTerm('b'))), t)
+    self.assertIs(t.ty, TermType.And)
+    self.assertFalse(hasattr(t, '__dict__'))
+
+  # the rules intern their constants when they fire, so a sweep after
+  # DropTerms gives the same rows
+  def test_drop(self) -> None:
+    c.cache.clear()
+    first = Sweep()
+    c.DropTerms()
+    self.assertEqual(c.NodeCount(), 0)
+    a = BoolFreeTerm('a')
+    self.assertIs(c.DisSimpl(a, NotTerm(a)), BoolConstTerm(True))
+    self.assertEqual(Sweep(), first)
+
+
+#
+# The rule sets against the elif chains: same operands, same result.
+# Double negations are compared removed, the rule engine drops them where
+# the chains kept ¬¬a. Commuted cases fire on some operand orders the chains
+# had no branch for, those results must be equivalent
+#
+class RulesTest(unittest.TestCase):
+  Simplifiers = [('DisSimpl', 2), ('ConSimpl', 2), ('ImplSimpl', 2),
+                 ('WeakUntilSimpl', 2), ('GloballySimpl', 1)]
+
+  def setUp(self) -> None:
+    c.cache.clear()
+
+  def test_legacy(self) -> None:
+    compared = commuted = 0
+    for i in range(10000):
+      name, k = self.Simplifiers[i % len(self.Simplifiers)]
+      old = [RandomTerm(legacy, 4, random.Random(i * 7 + j)) for j in range(k)]
+      new = [RandomTerm(c, 4, random.Random(i * 7 + j)) for j in range(k)]
+      try:
+        expected = getattr(legacy, name)(*old)
+        if expected is None: continue
+      # the chains fail on some operands, e.g. constants under G
+      except Exception:
+        continue
+      got = getattr(c, name)(*new)
+      if Plain(got) is not Plain(expected):
+        self.assertTrue(equiv.Equivalent(got, Plain(expected)), '%s(%s)' % (name, ', '.join(t.printme() for t in new)))
+        commuted += 1
+      compared += 1
+    self.assertGreater(compared, 8000)
+    self.assertLess(commuted, compared // 100)
+
+  # one written order covers the mirrored ones below the root
+  def test_commute(self) -> None:
+    a, b = BoolFreeTerm('a'), BoolFreeTerm('b')
+    self.assertEqual(len(c.Commuted(c.ParsePattern('a ∨ (b ∧ a)'))), 2)
+    self.assertEqual(len(c.Commuted(c.ParsePattern('a ∧ (b ∧ b)'))), 1)
+    self.assertEqual(len(c.Commuted(c.ParsePattern('(b ∧ ~a) ∨ a'))), 2)
+    self.assertIs(c.DisSimpl(a, AndTerm(b, a)), a)
+    self.assertIs(c.DisSimpl(a, AndTerm(a, b)), a)
+    rs = c.RuleSet('Test', TermType.Or, OrTerm)
+    rs.rule('a ∨ (b ∧ a)', to='a', commute=True)
+    self.assertIs(rs.apply(a, AndTerm(a, b)), a)
+    self.assertIs(rs.apply(AndTerm(a, b), a), OrTerm(AndTerm(a, b), a))
+    # no rule set lists an order another case already covers
+    for rs in (c.DisRules, c.ConRules, c.ImplRules, c.WeakUntilRules, c.GloballyRules):
+      shapes = [c.PatternShape((rs.op,) + x.args, {}) for r in rs.rules for x in r.cases]
+      self.assertEqual(len(shapes), len(set(shapes)), rs.name)
+
+  # the trie finds every case that matches, in rule order
+  def test_candidates(self) -> None:
+    r = random.Random(2)
+    for rs in (c.DisRules, c.ConRules, c.ImplRules, c.WeakUntilRules, c.GloballyRules):
+      arity = len(rs.rules[0].cases[0].args)
+      for i in range(2000):
+        args = tuple(RandomTerm(c, 4, r) for k in range(arity))
+        found = rs.candidates(args)
+        self.assertEqual([x.order for x in found], sorted(x.order for x in found))
+        for x in (x for rule in rs.rules for x in rule.cases):
+          if x.match(args) is not None: self.assertIn(x, found)
+
+  # a lookup only visits the patterns that fit the operands
+  def test_trie_size(self) -> None:
+    rs = c.RuleSet('Test', TermType.Or, OrTerm)
+    for k in range(200):
+      rs.rule('a ∨ (b U %s)' % ' U '.join(['c'] * (k + 2)), to='a')
+    rs.rule('a ∨ G b', to='b')
+    a = BoolFreeTerm('a')
+    self.assertEqual([x.rule.number for x in rs.candidates((a, GTerm(a)))], [201])
+    self.assertEqual(rs.candidates((a, a)), [])
+    self.assertLess(len(rs.trie.source.splitlines()), 1000)
+
+  def test_double_negation(self) -> None:
+    b = BoolFreeTerm('b')
+    self.assertIs(c.ConSimpl(BoolFreeTerm('a'), NotTerm(NotTerm(b))).right(), b)
+
+
+#
+# Deep terms must not hit the recursion limit
+#
+class SimplifyTest(unittest.TestCase):
+  def setUp(self) -> None:
+    c.cache.clear()
+
+  def test_double_negation(self) -> None:
+    a = BoolFreeTerm('a')
+    b = BoolFreeTerm('b')
+    t = a
+    for i in range(3000):
+      t = NotTerm(t)
+    self.assertIs(c.Simplify(AndTerm(t, b)), AndTerm(a, b))
+    self.assertIs(c.Simplify(AndTerm(b, NotTerm(t)), True), AndTerm(b, NotTerm(a)))
+    self.assertIs(c.ConSimpl(t, b), AndTerm(a, b))
+    self.assertIs(c.ConSimpl(b, NotTerm(t)), AndTerm(b, NotTerm(a)))
+    self.assertIs(c.Simplify(NotTerm(t)), NotTerm(a))
+
+  def test_chain(self) -> None:
+    t = BoolFreeTerm('x')
+    for i in range(5000):
+      t = OrTerm(BoolFreeTerm('v%d' % (i % 7)), AndTerm(t, NotTerm(NotTerm(BoolFreeTerm('y')))))
+    for fixpoint in (False, True):
+      r = c.Simplify(t, fixpoint)
+      self.assertIsNot(r, t)
+      self.assertIs(c.ParseFormula(c.SortKey(r)), r)
+
+
+class ParserTest(unittest.TestCase):
+  def test_sweep(self) -> None:
+    for attrs, ltl in c.Classify(1):
+      self.assertIs(c.ParseFormula(ltl.printme()), ltl)
+      for a in attrs:
+        self.assertIs(c.ParseFormula(a.printme()), a)
+
+  def test_random(self) -> None:
+    r = random.Random(1)
+    for i in range(3000):
+      t = RandomTerm(c, 5, r)
+      self.assertIs(c.ParseFormula(t.printme()), t, t.printme())
+
+  def test_errors(self) -> None:
+    for text in ['', 'a ∧', '(a ∨ b', 'a b', 'G', 'a ∧ ∧ b', 'a)']:
+      with self.subTest(text=text):
+        with self.assertRaises(ValueError):
+          c.ParseFormula(text)
+
+
+@unittest.skipUnless(np is not None, 'needs numpy')
+class EvaluatorTest(unittest.TestCase):
+  def test_ltl_eval(self) -> None:
+    import ltl_eval
+    for s in range(2000):
+      r = random.Random(s)
+      t = RandomTerm(c, 4, r)
+      n = r.randint(1, 7)
+      trace = RandomTrace(['a', 'b', 'c', 'rel'], n, r)
+      expected = [Naive(t, trace, i, n) for i in range(n)]
+      arrays = {v: np.array(x) for v, x in trace.items()}
+      self.assertEqual(list(ltl_eval.Evaluate(t, arrays)), expected, t.printme())
+      self.assertEqual(ltl_eval.Holds(t, arrays), expected[0])
+
+  def test_length(self) -> None:
+    import ltl_eval
+    with self.assertRaises(ValueError):
+      ltl_eval.Evaluate(c.AndTerm(BoolFreeTerm('a'), BoolFreeTerm('b')),
+                        {'a': np.zeros(3, bool), 'b': np.zeros(4, bool)})
+
+
+#
+# The monitor, the requirement and its reduced form agree on every log, and
+# the first violation is reported at the end of the shortest bad prefix
+#
+class MonitorTest(unittest.TestCase):
+  Names = ['trig', 'rel', 'inv', 'fin', 'del', 'rea']
+
+  def test_naive(self) -> None:
+    from edtl_monitor import Monitor, Requirement as Req, Watch
+    r = random.Random(1)
+    for s in range(2000):
+      attrs = [r.choice([BoolFreeTerm(v), NotTerm(BoolFreeTerm(v)), BoolConstTerm(True), BoolConstTerm(False)])
+               for v in self.Names]
+      trigger, release, invariant, final, delay, reaction = attrs
+      n = r.randint(1, 12)
+      trace = RandomTrace(self.Names, n, r)
+      cycles = [{v: trace[v][i] for v in self.Names} for i in range(n)]
+      req = Req('r', trigger=trigger, release=release, final=final,
+                delay=delay, reaction=reaction, invariant=invariant)
+      m = Monitor(req)
+      for cycle in cycles:
+        m.step(cycle)
+      ltl = Requirement(*attrs)
+      text = ' '.join(a.printme() for a in attrs)
+      expected = Naive(ltl, trace, 0, n)
+      self.assertEqual(not m.violations, expected, text)
+      self.assertEqual(Naive(c.Reduce(*attrs), trace, 0, n), expected, text)
+      bad = [k for k in range(n) if not Naive(ltl, {v: x[:k + 1] for v, x in trace.items()}, 0, k + 1)]
+      self.assertEqual(m.violations[:1], bad[:1], text)
+      self.assertEqual([k for k, q in Watch([req], cycles)], m.violations)
+
+  def test_read_cycles(self) -> None:
+    from edtl_monitor import ReadCycles
+    with tempfile.TemporaryDirectory() as d:
+      path = os.path.join(d, 'log.csv')
+      with open(path, 'w', encoding='utf8') as f:
+        f.write('trig,rel\n1,0\n0, 1\nfalse,true\n')
+      self.assertEqual(list(ReadCycles(path)), [{'trig': True, 'rel': False},
+        {'trig': False, 'rel': True}, {'trig': False, 'rel': True}])
+
+
+#
+# After a rule change invalidate must leave the cache as if every entry had
+# been computed with the new rules
+#
+class InvalidateTest(unittest.TestCase):
+  def setUp(self) -> None:
+    self.maxsize = c.cache.maxsize
+    c.cache.clear()
+    c.cache.resize(1 << 24)
+    c.cache.track = True
+
+  def tearDown(self) -> None:
+    c.cache.track = False
+    c.cache.clear()
+    c.cache.resize(self.maxsize)
+
+  def check(self, rules:list) -> list:
+    dropped = c.cache.invalidate(rules=rules)
+    self.assertGreater(dropped, 0)
+    incremental = [ltl for attrs, ltl in c.Classify(1)]
+    c.cache.clear()
+    full = [ltl for attrs, ltl in c.Classify(1)]
+    self.assertEqual(len(incremental), len(full))
+    for x, y in zip(incremental, full):
+      self.assertIs(x, y)
+    return full
+
+  def test_add(self) -> None:
+    rs = c.GloballyRules
+    before = [ltl for attrs, ltl in c.Classify(1)]
+    r = rs.rule('G (a ∨ b)', to='G a ∨ G b')
+    try:
+      after = self.check([r])
+      self.assertNotEqual(after, before)
+    finally:
+      rs.rules.remove(r)
+      rs.reindex()
+
+  def test_replace(self) -> None:
+    rs = c.DisRules
+    before = [ltl for attrs, ltl in c.Classify(1)]
+    number = 6
+    old = rs.rules[number - 1]
+    old, new = rs.replace(number, 'a ∨ (b ∧ a)', to='b')
+    try:
+      self.check([new])
+    finally:
+      rs.rules[number - 1] = old
+      rs.reindex()
+    c.cache.clear()
+    self.assertEqual([ltl for attrs, ltl in c.Classify(1)], before)
+
+  def test_remove(self) -> None:
+    rs = c.DisRules
+    before = [ltl for attrs, ltl in c.Classify(1)]
+    k = next(i for i, r in enumerate(rs.rules) if r.printme() == 'a ∨ (b ∧ a) = a')
+    old = rs.rules.pop(k)
+    rs.reindex()
+    try:
+      after = self.check([])
+      self.assertNotEqual(after, before)
+    finally:
+      rs.rules.insert(k, old)
+      rs.reindex()
+
+  def test_simplifier(self) -> None:
+    [ltl for attrs, ltl in c.Classify(1)]
+    self.assertGreater(c.cache.invalidate(simplifier='WeakUntilSimpl'), 0)
+    incremental = [ltl for attrs, ltl in c.Classify(1)]
+    c.cache.clear()
+    self.assertEqual(incremental, [ltl for attrs, ltl in c.Classify(1)])
+
+
+#
+# Saturation finds the smallest equal term and never changes the meaning
+#
+class EGraphTest(unittest.TestCase):
+  def test_congruence(self) -> None:
+    from egraph import EGraph
+    g = EGraph()
+    a, b, x = BoolFreeTerm('a'), BoolFreeTerm('b'), BoolFreeTerm('x')
+    left = g.addterm(GTerm(AndTerm(a, x)))
+    right = g.addterm(GTerm(AndTerm(b, x)))
+    self.assertEqual(g.addterm(GTerm(AndTerm(a, x))), left)
+    self.assertNotEqual(g.find(left), g.find(right))
+    g.union(g.addterm(a), g.addterm(b))
+    g.rebuild()
+    self.assertEqual(g.find(left), g.find(right))
+
+  # the contextual left-hand sides are rules of the sets and are left out
+  def test_rules(self) -> None:
+    from egraph import LoadRules, Contextual
+    written = {text for rs in (c.DisRules, c.ConRules, c.ImplRules, c.WeakUntilRules, c.GloballyRules)
+               for r in rs.rules for text in r.lhs}
+    self.assertLessEqual(Contextual, written)
+    self.assertFalse({text for name, text, lhs, rhs in LoadRules()} & Contextual)
+
+  def test_minimize(self) -> None:
+    from egraph import Minimize
+    P = c.ParseFormula
+    self.assertIs(Minimize(P('(¬¬a) ∧ (¬¬¬b)')), P('a ∧ ¬b'))
+    self.assertIs(Minimize(P('a ∨ (a ∧ b)')), P('a'))
+    self.assertIs(Minimize(P('G (a W (b ∧ a))')), P('G a'))
+
+  def test_sweep(self) -> None:
+    from egraph import Minimize
+    ltls = sorted({ltl for attrs, ltl in c.Classify(1)}, key=c.SortKey)
+    for ltl in ltls[::10]:
+      m = Minimize(ltl, iterations=5, nodes=2000, seconds=1.0)
+      self.assertLessEqual(len(c.SortKey(m)), len(c.SortKey(ltl)))
+      self.assertTrue(equiv.Equivalent(m, ltl), ltl.printme())
+
+
+#
+# A counterexample tells the terms apart on its lasso, equal terms agree on
+# every lasso up to the bound; merged classes hold equivalent formulas
+#
+class EquivTest(unittest.TestCase):
+  def test_known(self) -> None:
+    P = c.ParseFormula
+    self.assertTrue(equiv.Equivalent(P('G a'), P('¬F ¬a')))
+    self.assertTrue(equiv.Equivalent(P('a W b'), P('(a U b) ∨ G a')))
+    self.assertTrue(equiv.Equivalent(P('a → b'), P('¬a ∨ b')))
+    steps, loop = equiv.Counterexample(P('F a'), P('G a'))
+    self.assertNotEqual(LassoNaive(P('F a'), steps, loop, 0), LassoNaive(P('G a'), steps, loop, 0))
+
+  def test_random(self) -> None:
+    r = random.Random(5)
+    names = ['a', 'b', 'c', 'rel']
+    differ = 0
+    for k in range(300):
+      x, y = RandomTerm(c, 3, r), RandomTerm(c, 3, r)
+      trace = equiv.Counterexample(x, y)
+      if trace is not None:
+        steps, loop = trace
+        self.assertNotEqual(LassoNaive(x, steps, loop, 0), LassoNaive(y, steps, loop, 0))
+        differ += 1
+        continue
+      for j in range(20):
+        n = r.randint(1, equiv.Bound(len(names)))
+        steps = [{v for v in names if r.random() < 0.5} for i in range(n)]
+        loop = r.randrange(n)
+        self.assertEqual(LassoNaive(x, steps, loop, 0), LassoNaive(y, steps, loop, 0))
+    self.assertGreater(differ, 100)
+
+  def test_merge(self) -> None:
+    index = c.ClassIndex()
+    for record in c.Classify(1):
+      index.write(record)
+    merged = equiv.MergeClasses(index)
+    self.assertLess(merged.count(), index.count())
+    self.assertEqual(sum(merged.sizes().values()), 3369)
+    owner = {attrs: ltl for ltl, members in merged.classes.items() for attrs in members}
+    for ltl, members in index.classes.items():
+      self.assertTrue(equiv.Equivalent(owner[members[0]], ltl), ltl.printme())
+      self.assertTrue(all(owner[attrs] is owner[members[0]] for attrs in members))
+
+
+#
+# Truth tables against the assignments of the scope, and the propositional
+# reduction against the tables
+#
+class TruthTableTest(unittest.TestCase):
+  Names = ['a', 'b', 'c', 'rel']
+
+  def setUp(self) -> None:
+    c.cache.clear()
+
+  def Prop(self, depth:int, r:random.Random):
+    if depth == 0 or r.random() < 0.3:
+      x = r.choice(self.Names + [True, False])
+      return BoolConstTerm(x) if isinstance(x, bool) else BoolFreeTerm(x)
+    if r.random() < 0.2: return NotTerm(self.Prop(depth - 1, r))
+    cls = r.choice([AndTerm, OrTerm, ImplTerm])
+    return cls(self.Prop(depth - 1, r), self.Prop(depth - 1, r))
+
+  def test_tables(self) -> None:
+    r = random.Random(3)
+    for k in range(300):
+      t = self.Prop(4, r)
+      scope = tuple(self.Names)
+      table = c.TruthTable(t, scope)
+      for j in range(64):
+        trace = {v: [bool(j >> i & 1)] for i, v in enumerate(scope)}
+        self.assertEqual(bool(table >> j & 1), Naive(t, trace, 0, 1), t.printme())
+      l = c.Literal(table, scope)
+      if l is not None: self.assertEqual(c.TruthTable(l, scope), table)
+
+  def test_queries(self) -> None:
+    P = c.ParseFormula
+    self.assertTrue(c.Tautology(P('a ∨ ¬a')))
+    self.assertTrue(c.Contradiction(P('a ∧ ¬a')))
+    self.assertTrue(c.Implies(P('a ∧ b'), P('a ∨ c')))
+    self.assertFalse(c.Implies(P('a ∨ c'), P('a ∧ b')))
+    self.assertTrue(c.Complement(P('a → b'), P('a ∧ ¬b')))
+    self.assertIs(c.Literal(c.TruthTable(P('(a ∧ b) ∨ (a ∧ ¬b)')), ('a', 'b')), P('a'))
+    # temporal operands and wide scopes have no tables
+    self.assertIsNone(c.TruthTable(P('G a ∨ b')))
+    self.assertFalse(c.Implies(P('G a'), P('G a')))
+    self.assertIsNone(c.Scope(P('a ∧ b ∧ c ∧ d ∧ e ∧ f ∧ g')))
+
+  def test_propositional(self) -> None:
+    r = random.Random(4)
+    c.cache.propositional = True
+    try:
+      for k in range(600):
+        x, y = self.Prop(3, r), self.Prop(3, r)
+        for f, cls in ((c.DisSimpl, OrTerm), (c.ConSimpl, AndTerm), (c.ImplSimpl, ImplTerm)):
+          got = f(x, y)
+          scope = c.Scope(got, x, y)
+          self.assertEqual(c.TruthTable(got, scope), c.TruthTable(cls(x, y), scope), got.printme())
+    finally:
+      c.cache.propositional = False
+      c.cache.clear()
+
+
+#
+# A warm disk cache gives the rows of a cold one from its entries; a rule
+# or option change moves the entries to another fingerprint
+#
+class DiskCacheTest(unittest.TestCase):
+  def setUp(self) -> None:
+    self.dir = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.dir.name, 'simpl.db')
+    c.cache.clear()
+
+  def tearDown(self) -> None:
+    if c.cache.disk is not None: c.cache.disk.close()
+    c.cache.disk = None
+    c.cache.clear()
+    self.dir.cleanup()
+
+  def run_sweep(self):
+    c.cache.clear()
+    disk = c.cache.disk = c.DiskCache(self.path)
+    rows = Sweep()
+    disk.close()
+    c.cache.disk = None
+    return rows, disk
+
+  def test_cold_warm(self) -> None:
+    cold, disk = self.run_sweep()
+    self.assertEqual(disk.hits, 0)
+    self.assertGreater(len(disk.entries), 0)
+    c.DropTerms()
+    warm, disk = self.run_sweep()
+    self.assertEqual(warm, cold)
+    self.assertGreater(disk.hits, 0)
+    self.assertEqual(hashlib.sha256(warm.encode('utf8')).hexdigest(), Golden)
+
+  def test_fingerprint(self) -> None:
+    self.run_sweep()
+    first = c.RulesFingerprint()
+    c.cache.propositional = True
+    try:
+      self.assertNotEqual(c.RulesFingerprint(), first)
+    finally:
+      c.cache.propositional = False
+    rs = c.GloballyRules
+    r = rs.rule('G (a ∨ b)', to='G a ∨ G b')
+    try:
+      self.assertNotEqual(c.RulesFingerprint(), first)
+      disk = c.DiskCache(self.path)
+      disk.open()
+      self.assertEqual(disk.entries, {})
+      self.assertGreater(disk.prune(), 0)
+      disk.close()
+    finally:
+      rs.rules.remove(r)
+      rs.reindex()
+    self.assertEqual(c.RulesFingerprint(), first)
+
+
+#
+# Terms survive the arena and its pickle; equal subterms are stored once
+#
+class ArenaTest(unittest.TestCase):
+  def test_round_trip(self) -> None:
+    from term_arena import ToArena, FromArena
+    terms = [RandomTerm(c, 6, random.Random(k)) for k in range(200)]
+    arena, roots = ToArena(terms)
+    self.assertEqual(FromArena(arena, roots), terms)
+    self.assertEqual(ToArena(terms, arena)[1], roots)
+    nodes = set()
+    stack = list(terms)
+    while stack:
+      t = stack.pop()
+      if t not in nodes:
+        nodes.add(t)
+        stack.extend((t.left(), t.right())[:t.childcount()])
+    self.assertEqual(len(arena), len(nodes))
+    for i, t in zip(roots, terms):
+      self.assertEqual(arena[i].printme(), t.printme())
+      self.assertEqual(arena[i], arena[i])
+
+  def test_pickle(self) -> None:
+    import pickle
+    from term_arena import ToArena, FromArena
+    terms = [RandomTerm(c, 6, random.Random(k)) for k in range(50)]
+    arena, roots = ToArena(terms)
+    copy = pickle.loads(pickle.dumps(arena))
+    self.assertIsNone(copy.index)
+    self.assertEqual(FromArena(copy, roots), terms)
+    view = pickle.loads(pickle.dumps(arena[roots[0]]))
+    self.assertEqual(view.printme(), terms[0].printme())
+    # a pickled arena indexes itself again when terms are added
+    self.assertEqual(ToArena(terms, copy)[1], roots)
+    self.assertEqual(len(copy), len(arena))
+
+
+#
+# A closed store gives back the records of the sweep, a file without a
+# complete store is refused and left closed
+#
+class ResultStoreTest(unittest.TestCase):
+  def setUp(self) -> None:
+    self.dir = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.dir.name, 'sweep.edtl')
+
+  def tearDown(self) -> None:
+    self.dir.cleanup()
+
+  def test_round_trip(self) -> None:
+    from result_store import StoreSink, ResultStore
+    records = list(c.Classify(1))
+    sink = StoreSink(self.path, bufsize=100)
+    for record in records:
+      sink.write(record)
+    sink.close()
+    with ResultStore(self.path) as store:
+      self.assertEqual(len(store), len(records))
+      self.assertEqual([store.record(k) for k in range(len(store))], records)
+      attrs, ltl = store[-1]
+      self.assertEqual(ltl.printme(), records[-1][1].printme())
+      with self.assertRaises(IndexError):
+        store[len(records)]
+
+  def test_damaged(self) -> None:
+    from result_store import StoreSink, ResultStore
+    sink = StoreSink(self.path)
+    for record in c.Classify(1):
+      sink.write(record)
+    sink.close()
+    with open(self.path, 'rb') as f:
+      data = f.read()
+    fds = len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc/self/fd') else None
+    # empty, magic only, interrupted before close, truncated, bad footer
+    for broken in (b'', data[:8], data[:-40], data[:-1], data[:-8] + b'\xff' * 8):
+      with open(self.path, 'wb') as f:
+        f.write(broken)
+      with self.assertRaisesRegex(ValueError, 'result store'):
+        ResultStore(self.path)
+    if fds is not None: self.assertEqual(len(os.listdir('/proc/self/fd')), fds)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -4,7 +4,6 @@
 # @author garanina
 
 from enum import Enum
-import unittest
   
 #
 # Enum-class for checking the type 
@@ -28,11 +27,22 @@ class Term:
   pass
 
 def printx(a) -> str:
-  if (a.type() == TermType.BoolConst) or (a.type() == TermType.BoolVar): return a.printme()
+  if (a.ty == TermType.BoolConst) or (a.ty == TermType.BoolVar): return a.printme()
   else: return "(" + a.printme() + ")" 
 
 class Term:
-  def __init__(self) -> None:
+  # nodes carry no __dict__ and no hash of their own: terms are hash-consed,
+  # so the identity hash of object is the structural one. The TermType of a
+  # node is the ty of its class
+  __slots__ = ()
+  nodes = {}
+  fields = ()
+  ty = None
+  def __init_subclass__(cls, **kw) -> None:
+    super().__init_subclass__(**kw)
+    # one node table per class, see NoOpTerm/OneOpTerm/TwoOpTerm
+    cls.nodes = {}
+  def __init__(self, *args) -> None:
     pass
   def printme(self) -> str:
     pass
@@ -43,17 +53,37 @@ class Term:
   def right(self) -> Term:
     pass
   def type(self) -> TermType:
-    pass
+    return self.ty
   def equals(self, other: Term) -> bool:
-    print('checking ')
-    print(self.printme() + ' vs ')
-    print(other.printme())
-    return self.printme() == other.printme()
+    # terms are hash-consed, so equal structures are the same node
+    return self is other
+  def __reduce__(self):
+    return (self.__class__, tuple(getattr(self, f) for f in self.fields))
+
+#
+# Hash-consing: one shared node per distinct structure. Every class keeps its
+# nodes in cls.nodes keyed on the value of a leaf or on the ids of the
+# (already interned) operands; the table holds its nodes, so the ids stay valid
+#
+def DropTerms() -> None:
+  work = [Term]
+  while work:
+    c = work.pop()
+    c.nodes.clear()
+    work.extend(c.__subclasses__())
  
 #
 # Class for const/var terms 
 #
 class NoOpTerm(Term):
+  __slots__ = ('v',)
+  fields = ('v',)
+  def __new__(cls, v):
+    t = cls.nodes.get(v)
+    if t is None:
+      t = cls.nodes[v] = object.__new__(cls)
+      t.v = v
+    return t
   def childcount(self) -> int:
     return 0
   def val(self):
@@ -63,9 +93,15 @@ class NoOpTerm(Term):
 # Class for one operation terms 
 #
 class OneOpTerm(Term):
+  __slots__ = ('a',)
   a: Term
-  def __init__(self, a:Term) -> None:
-    self.a = a
+  fields = ('a',)
+  def __new__(cls, a:Term):
+    t = cls.nodes.get(id(a))
+    if t is None:
+      t = cls.nodes[id(a)] = object.__new__(cls)
+      t.a = a
+    return t
   def childcount(self) -> int:
     return 1
   def left(self) -> Term:
@@ -75,11 +111,18 @@ class OneOpTerm(Term):
 # Class for two operation terms 
 #
 class TwoOpTerm(Term):
+  __slots__ = ('a', 'b')
   a: Term
   b: Term
-  def __init__(self, a:Term, b:Term) -> None:
-    self.a = a
-    self.b = b
+  fields = ('a', 'b')
+  def __new__(cls, a:Term, b:Term):
+    key = id(a) << 64 | id(b)
+    t = cls.nodes.get(key)
+    if t is None:
+      t = cls.nodes[key] = object.__new__(cls)
+      t.a = a
+      t.b = b
+    return t
   def childcount(self) -> int:
     return 2
   def left(self) -> Term:
@@ -91,14 +134,12 @@ class TwoOpTerm(Term):
 # Class for true/false
 #
 class BoolConstTerm(NoOpTerm):
+  __slots__ = ()
+  ty = TermType.BoolConst
   v: bool
-  def __init__(self, boolVar:bool) -> None:
-    self.v = boolVar
   def printme(self) -> str:
     if self.v: return "true"
     else: return "false"
-  def type(self) -> TermType:
-    return TermType.BoolConst
   def val(self) -> bool:
     return self.v
 
@@ -106,13 +147,11 @@ class BoolConstTerm(NoOpTerm):
 # Class for string-named variables
 #
 class BoolFreeTerm(NoOpTerm):
+  __slots__ = ()
+  ty = TermType.BoolVar
   v: str
-  def __init__(self, freeFar:str) -> None:
-    self.v = freeFar
   def printme(self) -> str:
     return self.v
-  def type(self) -> TermType:
-    return TermType.BoolVar
   def val(self) -> str: 
     return self.v
 
@@ -120,50 +159,50 @@ class BoolFreeTerm(NoOpTerm):
 # Classes for particular LTL operations
 #
 class NotTerm(OneOpTerm):
-  def type(self) -> TermType:
-    return TermType.Not
+  __slots__ = ()
+  ty = TermType.Not
   def printme(self) -> str:
     return  "¬ " + printx(self.left())
 
 class AndTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.And
+  __slots__ = ()
+  ty = TermType.And
   def printme(self) -> str:
     return printx(self.left()) + " ∧ " + printx(self.right())
 
 class OrTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.Or
+  __slots__ = ()
+  ty = TermType.Or
   def printme(self) -> str:
     return printx(self.left()) + " v " + printx(self.right())
 
 class ImplTerm(TwoOpTerm):
-  def type(self)->TermType:
-    return TermType.Impl
+  __slots__ = ()
+  ty = TermType.Impl
   def printme(self) -> str:
     return printx(self.left()) + " → " + printx(self.right())
 
 class UTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.U
+  __slots__ = ()
+  ty = TermType.U
   def printme(self) -> str:
     return printx(self.left()) + " U " + printx(self.right())
 
 class WTerm(TwoOpTerm):
-  def type(self) -> TermType:
-    return TermType.W
+  __slots__ = ()
+  ty = TermType.W
   def printme(self) -> str:
     return printx(self.left()) + " W " + printx(self.right())
 
 class GTerm(OneOpTerm):
-  def type(self) -> TermType:
-    return TermType.G
+  __slots__ = ()
+  ty = TermType.G
   def printme(self) -> str:
     return "G " + printx(self.left())
 
 class FTerm(OneOpTerm):
-  def type(self) -> TermType:
-    return TermType.F
+  __slots__ = ()
+  ty = TermType.F
   def printme(self) -> str:
     return "F " + printx(self.left())
 
@@ -171,86 +210,86 @@ class FTerm(OneOpTerm):
 # Routines for simplifications
 #
 def DisSimpl(a:Term, b:Term):
-  if ((a.type() == TermType.BoolConst) and (a.val() == True)) or \
-  ((b.type() == TermType.BoolConst) and (b.val() == True)): 
+  if ((a.ty == TermType.BoolConst) and (a.val() == True)) or \
+  ((b.ty == TermType.BoolConst) and (b.val() == True)): 
     return BoolConstTerm(True)
-  elif (a.type() == TermType.BoolConst) and (a.val() == False): return b
-  elif (b.type() == TermType.BoolConst) and (b.val() == False): return a
+  elif (a.ty == TermType.BoolConst) and (a.val() == False): return b
+  elif (b.ty == TermType.BoolConst) and (b.val() == False): return a
   #a ∨ a = a
   elif (a.equals(b)):
     return a
   #a ∨ (b ∧ a) = a
-  elif (b.type() == TermType.And) and (a.equals(b.right())):
+  elif (b.ty == TermType.And) and (a.equals(b.right())):
     return a
   #a ∨ (a ∧ b) = a
-  elif (b.type() == TermType.And) and (a.equals(b.left())):
+  elif (b.ty == TermType.And) and (a.equals(b.left())):
     return a
   #a ∨ (b ∧ (a ∨ c)) = a ∨ (b ∧ c)
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.Or) and \
+  elif (b.ty == TermType.And) and (b.right().ty == TermType.Or) and \
   (b.right().left().equals(a)):
     return DisSimpl(a, ConSimpl(b.left(), b.right().right())) 
   # a v (b ∧ (c v a) = a ∨ (b ∧ c)
-  elif (b.type() == TermType.And) and (b.right().type() == TermType.Or) and \
+  elif (b.ty == TermType.And) and (b.right().ty == TermType.Or) and \
   (b.right().right().equals(a)):
     return DisSimpl(a, ConSimpl(b.left(), b.right().left())) 
   #a ∨ F(a ∨ b) = F(a ∨ b)
-  elif (b.type() == TermType.F) and (b.left().type() == TermType.Or) and a.equals(b.left().left()):
+  elif (b.ty == TermType.F) and (b.left().ty == TermType.Or) and a.equals(b.left().left()):
     return b
   #a ∨ (b U a) = (b U a)
-  elif (b.type() == TermType.U) and (b.right().equals(a)):
+  elif (b.ty == TermType.U) and (b.right().equals(a)):
     return b
   #G(¬a) ∨ F(a) = true
-  elif (a.type() == TermType.G) and (a.left().type() == TermType.Not) and \
-  (b.type() == TermType.F) and (a.left().left().equals(b.left())):
+  elif (a.ty == TermType.G) and (a.left().ty == TermType.Not) and \
+  (b.ty == TermType.F) and (a.left().left().equals(b.left())):
     return BoolConstTerm(True)
   #a ∨ F(a) = F(a)
-  elif (b.type() == TermType.F) and (b.left().equals(a)):
+  elif (b.ty == TermType.F) and (b.left().equals(a)):
     return b
   # (G a) v a = G a
-  elif (a.type() == TermType.G) and (a.left().equals(b)): return a
+  elif (a.ty == TermType.G) and (a.left().equals(b)): return a
   #a ∨ (a ∨ b) = a V b | a ∨ (b ∨ a) = a ∨ b
-  elif (b.type() == TermType.Or) and (b.left().equals(a) or b.right().equals(a)):
+  elif (b.ty == TermType.Or) and (b.left().equals(a) or b.right().equals(a)):
     return b
   #G(¬a) ∨ (F(a) ∨ (с)) = (с)
-  elif (a.type() == TermType.G) and (a.left().type() == TermType.Not) and (b.type() == TermType.Or) and \
-  (b.left().type() == TermType.F) and (b.left().left().equals(a.left().left())):
+  elif (a.ty == TermType.G) and (a.left().ty == TermType.Not) and (b.ty == TermType.Or) and \
+  (b.left().ty == TermType.F) and (b.left().left().equals(a.left().left())):
     return b.right()
   #a ∨ (b U (a ∨ c)) = (b U (a ∨ c))
-  elif (b.type() == TermType.U) and (b.right().type() == TermType.Or) and (b.right().left().equals(a)):
+  elif (b.ty == TermType.U) and (b.right().ty == TermType.Or) and (b.right().left().equals(a)):
     return b  
   # a v (b ∧ (c v (c U a))) = a v (b ∧ (c U a)) = b ∧ (c U a)
-  elif (b.type() == TermType.And) and    \
-       (b.right().type() == TermType.Or) and  \
-       (b.right().right().type() == TermType.U) and  \
+  elif (b.ty == TermType.And) and    \
+       (b.right().ty == TermType.Or) and  \
+       (b.right().right().ty == TermType.U) and  \
        (b.right().right().right().equals(a)):
     #return DisSimpl(a,ConSimpl(b.left(),b.right().right()))
     return ConSimpl(b.left(),b.right().right())
    
   # a v (b v (c v a))) = b v (c v a) 
-  elif (b.type() == TermType.Or) and (b.right().type() == TermType.Or) and (b.right().right().equals(a)):
+  elif (b.ty == TermType.Or) and (b.right().ty == TermType.Or) and (b.right().right().equals(a)):
     return b  
 
 
 
   #a v (b ∧ (c W (a v d)))))
-  elif (b.type() == TermType.And) and    \
-       (b.right().type() == TermType.W) and  \
-       (b.right().right().type() == TermType.Or) and  \
+  elif (b.ty == TermType.And) and    \
+       (b.right().ty == TermType.W) and  \
+       (b.right().right().ty == TermType.Or) and  \
        (b.right().right().left().equals(a)):
     return b
 
   #a v (b ∧ (c W a)))) = b ∧ (c W a)
-  elif (b.type() == TermType.And) and    \
-       (b.right().type() == TermType.W) and  \
+  elif (b.ty == TermType.And) and    \
+       (b.right().ty == TermType.W) and  \
        (b.right().right().equals(a)):
     return b
 
 
   # a v (b W (a v c))) = b W (a v c)
-  elif (b.type() == TermType.W) and (b.right().type() == TermType.Or) and (b.right().left().equals(a)):
+  elif (b.ty == TermType.W) and (b.right().ty == TermType.Or) and (b.right().left().equals(a)):
     return b
   # a v (b W a)) = b W a
-  elif (b.type() == TermType.W) and (b.right().equals(a)):
+  elif (b.ty == TermType.W) and (b.right().equals(a)):
     return b
 
 
@@ -260,241 +299,241 @@ def DisSimpl(a:Term, b:Term):
 
 
 def ConSimpl(a:Term, b:Term):
-  if ((a.type() == TermType.BoolConst) and (a.val() == False)) or \
-  ((b.type() == TermType.BoolConst) and (b.val() == False)): 
+  if ((a.ty == TermType.BoolConst) and (a.val() == False)) or \
+  ((b.ty == TermType.BoolConst) and (b.val() == False)): 
     return BoolConstTerm(False)
-  elif (a.type() == TermType.BoolConst) and (a.val() == True): 
+  elif (a.ty == TermType.BoolConst) and (a.val() == True): 
     return b
-  elif (b.type() == TermType.BoolConst) and (b.val() == True): 
+  elif (b.ty == TermType.BoolConst) and (b.val() == True): 
     return a
-  elif (a.type() == TermType.Not) and (a.left().equals(b)): 
+  elif (a.ty == TermType.Not) and (a.left().equals(b)): 
     return BoolConstTerm(False)
-  elif (b.type() == TermType.Not) and (b.left().equals(a)): 
+  elif (b.ty == TermType.Not) and (b.left().equals(a)): 
     return BoolConstTerm(False)
   # (¬ a) ∧ (a v b) = (¬ a) ∧ b
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (a.left().equals(b.left())): 
+  elif (a.ty == TermType.Not) and (b.ty == TermType.Or) and (a.left().equals(b.left())): 
     return ConSimpl(a,b.right())
   # (¬ a) ∧ (b v a) = (¬ a) ∧ b
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (a.left().equals(b.right())): 
+  elif (a.ty == TermType.Not) and (b.ty == TermType.Or) and (a.left().equals(b.right())): 
     return ConSimpl(a,b.left())
   # (¬ a) ∧ (b v (b U a)) = (¬ a) ∧ (b U a)
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (b.right().type() == TermType.U) and (a.left().equals(b.right().right())) and (b.left().equals(b.right().left())) : 
+  elif (a.ty == TermType.Not) and (b.ty == TermType.Or) and (b.right().ty == TermType.U) and (a.left().equals(b.right().right())) and (b.left().equals(b.right().left())) : 
     return ConSimpl(a,b.right())
   # (¬ a) ∧ (b v ((b ∧ c) U a)) = (¬ a) ∧ ((b ∧ c) U a)
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (b.right().type() == TermType.U) and (b.right().left().type() == TermType.And) and\
+  elif (a.ty == TermType.Not) and (b.ty == TermType.Or) and (b.right().ty == TermType.U) and (b.right().left().ty == TermType.And) and\
       (a.left().equals(b.right().right())) and (b.left().equals(b.right().left().left())) : 
     return ConSimpl(a,b.right())
   else: return AndTerm(a, b)
 
 
 def No(a:Term):
-  if (a.type() == TermType.BoolConst): 
+  if (a.ty == TermType.BoolConst): 
     return BoolConstTerm(not a.val())
   else: 
     return NotTerm(a)
 
 
 def ImplSimpl(a:Term, b:Term):
-  if ((a.type() == TermType.BoolConst) or (b.type() == TermType.BoolConst)):
+  if ((a.ty == TermType.BoolConst) or (b.ty == TermType.BoolConst)):
     return DisSimpl(No(a), b)
   # ¬a -> a
-  elif ((a.type() == TermType.Not) and (a.left().equals(b))): 
+  elif ((a.ty == TermType.Not) and (a.left().equals(b))): 
     return b
   # (¬rel ->)
-  elif ((a.type() == TermType.Not) and (a.left().val() == 'rel')): 
+  elif ((a.ty == TermType.Not) and (a.left().val() == 'rel')): 
     return DisSimpl(a.left(),b)
   # ¬a -> a ∨ b
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.Or) and (a.left().equals(b.left()))): 
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.Or) and (a.left().equals(b.left()))): 
     return b
   # c∧¬a -> a
-  elif ((a.type() == TermType.And) and (a.right().type() == TermType.Not) and a.right().left().equals(b)): 
+  elif ((a.ty == TermType.And) and (a.right().ty == TermType.Not) and a.right().left().equals(b)): 
     return ImplSimpl(a.left(), b)
   # c∧¬a -> a ∨ b
-  elif ((a.type() == TermType.And) and (a.right().type() == TermType.Not) and (b.type() == TermType.Or) and (a.right().left().equals(b.left()))): 
+  elif ((a.ty == TermType.And) and (a.right().ty == TermType.Not) and (b.ty == TermType.Or) and (a.right().left().equals(b.left()))): 
     return ImplSimpl(a.left(), b)
   # ¬a -> F a
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.F) and (a.left().equals(b.left()))): 
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.F) and (a.left().equals(b.left()))): 
     return b
   # c∧¬a -> F a
-  elif ((a.type() == TermType.And) and (a.right().type() == TermType.Not) and (b.type() == TermType.F) and (a.right().left().equals(b.left()))): 
+  elif ((a.ty == TermType.And) and (a.right().ty == TermType.Not) and (b.ty == TermType.F) and (a.right().left().equals(b.left()))): 
     return ImplSimpl(a.left(), b)
   # ¬a -> F(a ∨ b)
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.F) and (b.left().type() == TermType.Or) and (a.left().equals(b.left().left()))): 
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.F) and (b.left().ty == TermType.Or) and (a.left().equals(b.left().left()))): 
     return b
   # c∧¬a -> F(a ∨ b)
-  elif ((a.type() == TermType.And) and (a.right().type() == TermType.Not) and (b.type() == TermType.F) and (b.left().type() == TermType.Or) and (a.left().equals(b.left().left()))): 
+  elif ((a.ty == TermType.And) and (a.right().ty == TermType.Not) and (b.ty == TermType.F) and (b.left().ty == TermType.Or) and (a.left().equals(b.left().left()))): 
     return ImplSimpl(a.left(), b)
   # ¬a -> b U a 
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.U) and (a.left().equals(b.right()))): 
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.U) and (a.left().equals(b.right()))): 
     return b  
   # ¬a -> b U (a ∨ c)
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.U) and (b.right().type() == TermType.Or ) and (a.left().equals(b.right().left()))):
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.U) and (b.right().ty == TermType.Or ) and (a.left().equals(b.right().left()))):
     return b  
   # ¬a -> b W a = b W a
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.W) and (a.left().equals(b.right()))): 
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.W) and (a.left().equals(b.right()))): 
     return b  
   # ¬a -> b W (a ∨ c) = b W (a ∨ c)
-  elif ((a.type() == TermType.Not) and (b.type() == TermType.W) and (b.right().type() == TermType.Or ) and (a.left().equals(b.right().left()))):
+  elif ((a.ty == TermType.Not) and (b.ty == TermType.W) and (b.right().ty == TermType.Or ) and (a.left().equals(b.right().left()))):
     return b  
   # c∧¬a -> b W a = c -> b W a
-  elif ((a.type() == TermType.And) and (a.right().type() == TermType.Not) and (b.type() == TermType.W) and (a.right().left().equals(b.right()))): 
+  elif ((a.ty == TermType.And) and (a.right().ty == TermType.Not) and (b.ty == TermType.W) and (a.right().left().equals(b.right()))): 
     return ImplSimpl(a.left(), b)  
   # c∧¬a -> b W (a ∨ d) = c -> b W (a ∨ d)
-  elif ((a.type() == TermType.And) and (a.right().type() == TermType.Not) and (b.type() == TermType.W) and (b.right().type() == TermType.Or ) and (a.right().left().equals(b.right().left()))):
+  elif ((a.ty == TermType.And) and (a.right().ty == TermType.Not) and (b.ty == TermType.W) and (b.right().ty == TermType.Or ) and (a.right().left().equals(b.right().left()))):
     return ImplSimpl(a.left(), b)  
   else:
     return ImplTerm(a, b)
   
 
 def FutureSimpl(a:Term):
-  if (a.type() == TermType.BoolConst): return a
+  if (a.ty == TermType.BoolConst): return a
   else: return FTerm(a)
   
 
 # check a and not(b)/not(a) and b 
 def CheckNotHelper(a:Term, b:Term):
-  if (a.type() == TermType.BoolConst) and (b.type() == TermType.BoolConst):
+  if (a.ty == TermType.BoolConst) and (b.ty == TermType.BoolConst):
     return a.val() != b.val()
-  if (a.type() == TermType.Not) and (b.type() != TermType.Not):
+  if (a.ty == TermType.Not) and (b.ty != TermType.Not):
     return a.left().equals(b)
-  if (a.type() != TermType.Not) and (b.type() == TermType.Not):
+  if (a.ty != TermType.Not) and (b.ty == TermType.Not):
     return b.left().equals(a)
   return False
   
 
 def GloballySimpl(a:Term):
-  if (a.type() == TermType.BoolConst): return a
+  if (a.ty == TermType.BoolConst): return a
   
   #G(F(a)) = GF(a)
-  elif (a.type() == TermType.F): return GTerm(a)
+  elif (a.ty == TermType.F): return GTerm(a)
   
   #G(G(a)) = G(a)
-  elif (a.type() == TermType.G): return GloballySimpl(a.left())
+  elif (a.ty == TermType.G): return GloballySimpl(a.left())
 
   # G ((G a) v a) = G(a)
-  elif (a.type() == TermType.Or) and (a.left().type() == TermType.G) and (a.left().left().equals(a.right())): return GloballySimpl(a.right())
+  elif (a.ty == TermType.Or) and (a.left().ty == TermType.G) and (a.left().left().equals(a.right())): return GloballySimpl(a.right())
   
   #51 G(G(a ∧ ¬b) ∨ (a U (b ∧ a))) = G(a)
-  elif (a.type() == TermType.Or) and (a.left().type() == TermType.G) and (a.right().type() == TermType.U) and \
-       (a.right().right().type() == TermType.And) and (a.left().left().type() == TermType.And) and \
+  elif (a.ty == TermType.Or) and (a.left().ty == TermType.G) and (a.right().ty == TermType.U) and \
+       (a.right().right().ty == TermType.And) and (a.left().left().ty == TermType.And) and \
        (a.left().left().left().equals(a.right().left())) and (a.right().left().equals(a.right().right().right())) and \
        CheckNotHelper((a.left().left().right()), a.right().right().left()):
     return GloballySimpl(a.left().left().left())
 
   #52 G(G(a ∧ ¬b) ∨ ((a ∧ ¬b) U (b ∧ (a U (a ∧ c))))) = G(a ∧ (G(¬b) ∨ F(b ∧ F(c))))  
-  elif (a.type() == TermType.Or) and (a.left().type() == TermType.G) and (a.right().type() == TermType.U) \
-    and (a.right().right().type() == TermType.And) and (a.right().right().right().type() == TermType.U) \
-    and (a.right().right().right().right().type() == TermType.And) and (a.left().left().equals(a.right().left())) \
+  elif (a.ty == TermType.Or) and (a.left().ty == TermType.G) and (a.right().ty == TermType.U) \
+    and (a.right().right().ty == TermType.And) and (a.right().right().right().ty == TermType.U) \
+    and (a.right().right().right().right().ty == TermType.And) and (a.left().left().equals(a.right().left())) \
     and (a.left().left().left().equals(a.right().right().right().left())) and \
     (a.left().left().left().equals(a.right().right().right().right().left())) and \
     CheckNotHelper(a.left().left().right(), a.right().right().left()):
-      print(a.right().right().right().type())
+      print(a.right().right().right().ty)
       #return GTerm(AndTerm(a.left().left().left(), OrTerm(GTerm(a.left().left().right()), FTerm(AndTerm(a.right().right().left(),
       #FTerm(a.right().right().right().right().right()))))))
       return GloballySimpl(ConSimpl(a.left().left().left(), DisSimpl(GloballySimpl(a.left().left().right()), FutureSimpl(ConSimpl(a.right().right().left(),
       FutureSimpl(a.right().right().right().right().right()))))))
       
   #53 G(G(a ∧ ¬b) ∨ ((a ∧ ¬b) U (b ∧ (a ∧ c)))) = G(a ∧ (G(¬b) ∨ F(b ∧ c)))
-  elif (a.type() == TermType.Or) and (a.right().type() == TermType.U) and (a.left().type() == TermType.G) and \
-    (a.left().left().type() == TermType.And) and (a.right().left().type() == TermType.And) and \
-    (a.left().left().equals(a.right().left())) and (a.right().right().type() == TermType.And) and \
-    (a.right().right().right().type() == TermType.And) and CheckNotHelper(a.left().left().right(), a.right().right().left()):
+  elif (a.ty == TermType.Or) and (a.right().ty == TermType.U) and (a.left().ty == TermType.G) and \
+    (a.left().left().ty == TermType.And) and (a.right().left().ty == TermType.And) and \
+    (a.left().left().equals(a.right().left())) and (a.right().right().ty == TermType.And) and \
+    (a.right().right().right().ty == TermType.And) and CheckNotHelper(a.left().left().right(), a.right().right().left()):
       #return GTerm(AndTerm(a.left().left().left(), OrTerm(GTerm(a.left().left().right()), 
       #FTerm(AndTerm(a.right().right().left(), a.right().right().right().right())))))
       return GloballySimpl(ConSimpl(a.left().left().left(), DisSimpl(GloballySimpl(a.left().left().right()), 
       FutureSimpl(ConSimpl(a.right().right().left(), a.right().right().right().right())))))
 
   #44 G(G(a) ∨ (a U b)) = G(a ∧ F(b))
-  #elif (a.type() == TermType.Or) and (a.left().type() == TermType.G) and (a.right().type() == TermType.U) and \
+  #elif (a.ty == TermType.Or) and (a.left().ty == TermType.G) and (a.right().ty == TermType.U) and \
   #  (a.left().left().equals(a.right().left())):
   #    #return GTerm(AndTerm(a.left().left(), FTerm(a.right().right())))
   #    return GloballySimpl(ConSimpl(a.left().left(), FutureSimpl(a.right().right())))
   
   #45 G((a ∧ b) U (a ∧ c)) = G(a ∧ (b U c))
-  elif (a.type() == TermType.U) and (a.left().type() == TermType.And) and (a.right().type() == TermType.And) and \
+  elif (a.ty == TermType.U) and (a.left().ty == TermType.And) and (a.right().ty == TermType.And) and \
     (a.left().left().equals(a.right().left())):
       #return GTerm(AndTerm(a.left().left(), UTerm(a.left().right(), a.right().right())))
       return GloballySimpl(ConSimpl(a.left().left(), UntilSimpl(a.left().right(), a.right().right())))
     
   #46 G(a U (a ∧ b)) = G(a ∧ F b)
-  elif (a.type() == TermType.U) and (a.right().type() == TermType.And) and \
+  elif (a.ty == TermType.U) and (a.right().ty == TermType.And) and \
     (a.left().equals(a.right().left())):
       return GloballySimpl(ConSimpl(a.left(), FutureSimpl(a.right().right())))
     
   #47 G(a U (b ∧ a)) = G(a ∧ F b)
-  elif (a.type() == TermType.U) and (a.right().type() == TermType.And) and \
+  elif (a.ty == TermType.U) and (a.right().ty == TermType.And) and \
     (a.left().equals(a.right().right())):
       return GloballySimpl(ConSimpl(a.left(), FutureSimpl(a.right().left())))
   
   # G ((¬ a) ∧ ( b U a)) = false
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.U) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.U) and \
     CheckNotHelper(a.left(),a.right().right()):
       return BoolConstTerm(False)
   
   # G ((¬ a) ∧ ( b W a)) = G ((¬ a) ∧ b))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and \
     CheckNotHelper(a.left(),a.right().right()):
       return GloballySimpl(ConSimpl(a.left(), a.right().left()))
   
   # G (a ∧ ((¬ b) W b)) = G a
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and \
     CheckNotHelper(a.right().left(),a.right().right()):
       return GloballySimpl(a.left())
 
   # G (a ∧ ((b ∧ (¬ c)) W (c ∧ b))) = G (a ∧ c)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().left().type() == TermType.And) and (a.right().right().type() == TermType.And) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and (a.right().left().ty == TermType.And) and (a.right().right().ty == TermType.And) and \
     CheckNotHelper(a.right().left().right(),a.right().right().left()) and a.right().left().left().equals(a.right().right().right()):
       return GloballySimpl(ConSimpl(a.left(),a.right().left().left()))
 
   # G ((¬ a) ∧ F a) = false
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.F) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.F) and \
     CheckNotHelper(a.left(),a.right().left()):
       return BoolConstTerm(False)
 
   # G ((¬ a) ∧ F (a ∨ b)) = G ((¬ a) ∧ F b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.F) and (a.right().left().type() == TermType.Or) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.F) and (a.right().left().ty == TermType.Or) and \
     CheckNotHelper(a.left(),a.right().left().left()):
       return GloballySimpl(ConSimpl(a.left(), FutureSimpl(a.right().left().right())))
 
   # G ((¬ a) ∧ ( b U (a ∨ c) )) = G ((¬ a) ∧ ( b U c ))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.U) and (a.right().right().type() == TermType.Or) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.U) and (a.right().right().ty == TermType.Or) and \
     CheckNotHelper(a.left(),a.right().right().left()):
       return GloballySimpl(ConSimpl(a.left(), UntilSimpl(a.right().left(),a.right().right().right())))
 
   # G ((¬ a) ∧ ( b W (a ∨ c) )) = G ((¬ a) ∧ ( b W c ))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.Or) and \
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and (a.right().right().ty == TermType.Or) and \
     CheckNotHelper(a.left(),a.right().right().left()):
       return GloballySimpl(ConSimpl(a.left(), WTerm(a.right().left(),a.right().right().right())))
   
   # G ((¬ a) ∧ (b W (c ∧ (F a)))) = G (a -> G b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-       (a.right().right().right().type() == TermType.F) and CheckNotHelper(a.left(),a.right().right().right().left()):
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and (a.right().right().ty == TermType.And) and \
+       (a.right().right().right().ty == TermType.F) and CheckNotHelper(a.left(),a.right().right().right().left()):
       #return GloballySimpl(ConSimpl(a.left(), WTerm(a.right().left(),a.right().right().left())))
       return GloballySimpl(ImplSimpl(a.left().left(), GloballySimpl(a.right().left())))
 
   # G ((¬ a) ∧ (b W (c ∧ (d U a)))) = G (a -> G b)
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-       (a.right().right().right().type() == TermType.U) and CheckNotHelper(a.left(),a.right().right().right().right()):
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and (a.right().right().ty == TermType.And) and \
+       (a.right().right().right().ty == TermType.U) and CheckNotHelper(a.left(),a.right().right().right().right()):
       #return GloballySimpl(ConSimpl(a.left(), WTerm(a.right().left(),a.right().right().left())))
       return GloballySimpl(ImplSimpl(a.left().left(), GloballySimpl(a.right().left())))
 
   # G ((¬ a) ∧ (b W (c ∧ (F (a v d))))) = G ((¬ a) ∧ (b W (c ∧ (F d))))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-       (a.right().right().right().type() == TermType.F) and (a.right().right().right().left().type() == TermType.Or) and CheckNotHelper(a.left(),a.right().right().right().left().left()):
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and (a.right().right().ty == TermType.And) and \
+       (a.right().right().right().ty == TermType.F) and (a.right().right().right().left().ty == TermType.Or) and CheckNotHelper(a.left(),a.right().right().right().left().left()):
       return GloballySimpl(ConSimpl(a.left(), WTerm(a.right().left(), AndTerm(a.right().right().left(), FTerm(a.right().right().right().left().right())))))
 
   # G ((¬ a) ∧ (b W (c ∧ (d U (a v e))))) = G ((¬ a) ∧ (b W (c ∧ (d U e))))
-  elif (a.type() == TermType.And) and (a.right().type() == TermType.W) and (a.right().right().type() == TermType.And) and \
-       (a.right().right().right().type() == TermType.U) and (a.right().right().right().right().type() == TermType.Or) and CheckNotHelper(a.left(),a.right().right().right().right().left()):
+  elif (a.ty == TermType.And) and (a.right().ty == TermType.W) and (a.right().right().ty == TermType.And) and \
+       (a.right().right().right().ty == TermType.U) and (a.right().right().right().right().ty == TermType.Or) and CheckNotHelper(a.left(),a.right().right().right().right().left()):
       return GloballySimpl(ConSimpl(a.left(), WTerm(a.right().left(), AndTerm(a.right().right().left(), UTerm(a.right().right().right().left(), a.right().right().right().right().right())))))
   
   # G ((a ∧ (¬ b)) W (b ∧ (G a))) = G (a)
-  elif (a.type() == TermType.W) and (a.left().type() == TermType.And) and (a.right().type() == TermType.And) and (a.right().right().type() == TermType.G) and \
+  elif (a.ty == TermType.W) and (a.left().ty == TermType.And) and (a.right().ty == TermType.And) and (a.right().right().ty == TermType.G) and \
        a.left().left().equals(a.right().right().left()) and CheckNotHelper(a.left().right(),a.right().left()):
       return GloballySimpl(a.right().right())
 
   # G ((a ∧ (¬ b)) W (b ∧ a)) = G (a)
-  elif (a.type() == TermType.W) and (a.left().type() == TermType.And) and (a.right().type() == TermType.And) and \
+  elif (a.ty == TermType.W) and (a.left().ty == TermType.And) and (a.right().ty == TermType.And) and \
        a.left().left().equals(a.right().right()) and CheckNotHelper(a.left().right(),a.right().left()):
       return GloballySimpl(a.right().right())
 
@@ -505,13 +544,13 @@ def GloballySimpl(a:Term):
 
 def UntilSimpl(a:Term, b:Term):
 
-  if (b.type() == TermType.BoolConst) and (b.val() == False): 
+  if (b.ty == TermType.BoolConst) and (b.val() == False): 
     return BoolConstTerm(False)
-  elif (b.type() == TermType.BoolConst) and (b.val() == True): 
+  elif (b.ty == TermType.BoolConst) and (b.val() == True): 
     return BoolConstTerm(True)
-  elif ((a.type() == TermType.BoolConst) and (a.val() == False) and (b.type() != TermType.BoolConst)): 
+  elif ((a.ty == TermType.BoolConst) and (a.val() == False) and (b.ty != TermType.BoolConst)): 
     return b
-  elif ((a.type() == TermType.BoolConst) and (a.val() == True) and (b.type() != TermType.BoolConst)): 
+  elif ((a.ty == TermType.BoolConst) and (a.val() == True) and (b.ty != TermType.BoolConst)): 
     return FutureSimpl(b)
 
   #a U a = a
@@ -523,26 +562,26 @@ def UntilSimpl(a:Term, b:Term):
     return FutureSimpl(b)
 
   #¬a U (b ∨ a) = F(a) ∨ (¬a U b)
-  elif (a.type() == TermType.Not) and (b.type() == TermType.Or) and (CheckNotHelper(a, b.right())):
+  elif (a.ty == TermType.Not) and (b.ty == TermType.Or) and (CheckNotHelper(a, b.right())):
     return DisSimpl(FutureSimpl(a.left()), UntilSimpl(a, b.left()))
     #return OrTerm(FTerm(a.left()), UTerm(a, b.left()))
     
   #46 (a ∧ b) U (c ∨ a) = a ∨ ((a ∧ b) U c)
-  #elif (a.type() == TermType.And) and (b.type() == TermType.Or) and (a.left().equals(b.right())):
+  #elif (a.ty == TermType.And) and (b.ty == TermType.Or) and (a.left().equals(b.right())):
     #return OrTerm(a.left(), UTerm(a, b.left()))
    # return DisSimpl(a.left(), UTerm(a, b.left()))
     
   #47 (a ∧ b) U a = a
-  elif (a.type() == TermType.And) and (a.left().equals(b)):
+  elif (a.ty == TermType.And) and (a.left().equals(b)):
     return b
 
   #48 a U (b ∨ a) = a ∨ b
-  elif (b.type() == TermType.Or) and (a.equals(b.right())):
+  elif (b.ty == TermType.Or) and (a.equals(b.right())):
     #return OrTerm(a, UTerm(a, b.left()))
     return DisSimpl(a, b.left())
 
   #50 (a ∧ ¬b) U (b ∧ a) = a U (b ∧ a)
-  #elif (a.type() == TermType.And) and (b.type() == TermType.And) and (a.left().equals(b.right())) \
+  #elif (a.ty == TermType.And) and (b.ty == TermType.And) and (a.left().equals(b.right())) \
    # and (CheckNotHelper(a.right(), b.left())):
       #return UTerm(a.left(), b)
     #  return UntilSimpl(a.left(), b)
@@ -555,19 +594,19 @@ def WeakUntilSimpl(a:Term, b:Term):
   
   # 0 W 0 = 0
   # 1 W 0 = 1 W 1 = 0 W 1 = 1
-  if ((a.type() == TermType.BoolConst) and (b.type() == TermType.BoolConst)):
+  if ((a.ty == TermType.BoolConst) and (b.ty == TermType.BoolConst)):
     if ((a.val() == False) and (b.val() == False)): return BoolConstTerm(False)
     else: return BoolConstTerm(True)
 
   # 0 W b = b
   # 1 W b = 1
-  elif (b.type() != TermType.BoolConst) and (a.type() == TermType.BoolConst):
+  elif (b.ty != TermType.BoolConst) and (a.ty == TermType.BoolConst):
     if (a.val() == False): return b
     else: return BoolConstTerm(True)
   
   # a W 1 = 1
   # a W 0 = G a
-  elif (a.type() != TermType.BoolConst) and (b.type() == TermType.BoolConst):
+  elif (a.ty != TermType.BoolConst) and (b.ty == TermType.BoolConst):
     if (b.val() == True): return BoolConstTerm(True)
     else: return GloballySimpl(a)
 
@@ -576,15 +615,15 @@ def WeakUntilSimpl(a:Term, b:Term):
     return a
 
   # a W (b v a) = b v a
-  elif (b.type() == TermType.Or) and (a.equals(b.right())):
+  elif (b.ty == TermType.Or) and (a.equals(b.right())):
     return b
 
   # (a ∧ b) W (c v a) = c v a
-  elif (a.type() == TermType.And) and (b.type() == TermType.Or) and (a.left().equals(b.right())):
+  elif (a.ty == TermType.And) and (b.ty == TermType.Or) and (a.left().equals(b.right())):
     return b
 
   # (a ∧ b) W a) = a
-  elif (a.type() == TermType.And) and (a.left().equals(b)):
+  elif (a.ty == TermType.And) and (a.left().equals(b)):
     return b
 
   # ¬a W a = = G(¬a) \/ F(a) = true
@@ -592,69 +631,40 @@ def WeakUntilSimpl(a:Term, b:Term):
     return BoolConstTerm(True)
 
   # ¬a W (b v a) = ¬a W b
-  elif (b.type() == TermType.Or) and CheckNotHelper(a, b.right()):
+  elif (b.ty == TermType.Or) and CheckNotHelper(a, b.right()):
     return WeakUntilSimpl(a, b.left())
 
   # (a ∧ ¬b) W (b ∧ (G a)) = G (a)
-  elif (a.type() == TermType.And) and (b.type() == TermType.And) and (b.right().type() == TermType.G) and \
+  elif (a.ty == TermType.And) and (b.ty == TermType.And) and (b.right().ty == TermType.G) and \
        a.left().equals(b.right().left()) and CheckNotHelper(a.right(),b.left()):
       return GloballySimpl(a.left())
 
   # a W b
-#  elif ((b.type() != TermType.BoolConst) and (a.type() != TermType.BoolConst)): return WTerm(a, b)
+#  elif ((b.ty != TermType.BoolConst) and (a.ty != TermType.BoolConst)): return WTerm(a, b)
   else: return WTerm(a, b)
 
 
+def konv(a_txt):
+  if (a_txt == 'true*'): 
+    return BoolConstTerm(True)
+  elif (a_txt == 'false*'): 
+    return BoolConstTerm(False)
+  else: return BoolFreeTerm(a_txt)
+
 #
-# MAIN
+# Streaming classification: yields records (attributes, ltl formulas) lazily,
+# one per row of the attribute table, the records are consumed by sinks
 #
-def Main():
-
-  import pandas as pd
-  import numpy as np
-  from matplotlib import pyplot as plt 
-
-  data_frame = pd.read_csv('atributs.csv', encoding='utf8')
-  print(data_frame);
-
-  def konv(a_txt):
-    if (a_txt == 'true*'): 
-      return BoolConstTerm(True)
-    elif (a_txt == 'false*'): 
-      return BoolConstTerm(False)
-    else: return BoolFreeTerm(a_txt)
-
-  def BoolToString(a:Term):
-    return a.printme()
-
-
-  a = 12
-  mas = [] 
-  for i1 in range(243): 
-      mas.append([0] * a)
-
-
-  for i in data_frame.index:
-    release_txt = data_frame['release'][i]
-    delay_txt = data_frame['delay'][i]
-    final_txt = data_frame['final'][i]
-    reaction_txt = data_frame['reaction'][i]
-    invariant_txt = data_frame['invariant'][i]
-
-    release = konv(release_txt)
-    delay = konv(delay_txt)
-    final = konv(final_txt)
-    reaction = konv(reaction_txt)
-    invariant = konv(invariant_txt)
-
-# false	true	fin	true	inv
-    if (release_txt == 'false*' and delay_txt == 'true*' and final_txt == 'fin' and reaction_txt == 'true*' and invariant_txt == 'inv'):
-      y13 = 1
-    else: y13 = 2
+def Classify(rows):
+  for row in rows:
+    release = konv(row['release'])
+    delay = konv(row['delay'])
+    final = konv(row['final'])
+    reaction = konv(row['reaction'])
+    invariant = konv(row['invariant'])
 
 # G ((trig ∧ ¬ rel) → ( (inv ∧ ¬fin) W (rel v (fin ∧ ((inv ∧ (¬ del)) W (rel v (inv ∧ rea))))))) = 		
 
-
     trigger = BoolFreeTerm('trig')
     x0 = ConSimpl(trigger, No(release))
     x1 = ConSimpl(invariant, reaction)
@@ -668,10 +678,8 @@ def Main():
     x9 = ImplSimpl(x0, x8)
     x10 = GloballySimpl(x9)
 
-    
     trigger = BoolConstTerm(True)
     
-    #y0 = ConSimpl(trigger, No(release))
     y0 = ConSimpl(trigger, No(release))
     y1 = ConSimpl(invariant, reaction)
     y2 = DisSimpl(release, y1)
@@ -684,36 +692,81 @@ def Main():
     y9 = ImplSimpl(y0, y8)
     y10 = GloballySimpl(y9)
 
-    # if (y15.type() == TermType.G): y16 = GloballySimpl(y15.left())
-    # else: y16 = y15
-
-    trigger = BoolConstTerm(False)
+    # trigger = false makes the requirement trivially true
     z1 = BoolConstTerm(True)
-    
-    mas[i][0] = BoolToString(release)
-    mas[i][1] = BoolToString(delay)
-    mas[i][2] = BoolToString(final)
-    mas[i][3] = BoolToString(reaction)
-    mas[i][4] = BoolToString(invariant)
 
-    mas[i][5] = BoolToString(x10)
-    mas[i][6] = BoolToString(y10)
-    mas[i][7] = BoolToString(z1)
+    yield (release, delay, final, reaction, invariant), (x10, y10, z1)
+
+def Row(record) -> list:
+  attrs, ltls = record
+  return [a.printme() for a in attrs] + [x.printme() for x in ltls]
+
+class PrintSink:
+  def write(self, record) -> None:
+    print(' '.join(Row(record)), end=' \n')
+  def close(self) -> None:
+    pass
+
+#
+# Write-only workbook: openpyxl streams the rows into a temporary file
+# instead of keeping a cell object for every value
+#
+class WorkbookSink:
+  def __init__(self, path:str) -> None:
+    from openpyxl import Workbook
+    self.path = path
+    self.wb = Workbook(write_only=True)
+    self.ws = self.wb.create_sheet()
+  def write(self, record) -> None:
+    self.ws.append(Row(record))
+  def close(self) -> None:
+    self.wb.save(self.path)
+
+#
+# CSV file written in batches of bufsize rows
+#
+class CsvSink:
+  def __init__(self, path:str, bufsize:int = 1024) -> None:
+    import csv
+    self.f = open(path, 'w', encoding='utf8', newline='')
+    self.writer = csv.writer(self.f)
+    self.bufsize = bufsize
+    self.rows = []
+  def write(self, record) -> None:
+    self.rows.append(Row(record))
+    if len(self.rows) >= self.bufsize:
+      self.flush()
+  def flush(self) -> None:
+    self.writer.writerows(self.rows)
+    self.rows = []
+  def close(self) -> None:
+    self.flush()
+    self.f.close()
+
+def FileSink(path:str):
+  if path.endswith('.csv'): return CsvSink(path)
+  return WorkbookSink(path)
+
+
+#
+# MAIN
+#
+def Main():
 
-  for i in range(0, len(mas)):
-      for i2 in range(0, len(mas[i])):
-          print(mas[i][i2], end=' ')
-      print()
+  import csv
 
-  from openpyxl import Workbook
-  wb = Workbook()
-  ws = wb.active
-  for subarray in mas:
-     ws.append(subarray)
-  wb.save('./edtl-ltl.xlsx')
+  sinks = [PrintSink(), FileSink('./edtl-ltl.xlsx')]
+  with open('atributs.csv', encoding='utf8', newline='') as f:
+    # rows are read one at a time while they are classified
+    reader = csv.DictReader(f)
+    print('atributs.csv: %s' % ', '.join(reader.fieldnames))
+    for record in Classify(reader):
+      for sink in sinks:
+        sink.write(record)
+  for sink in sinks:
+    sink.close()
 
 
 
 if __name__ == '__main__':
-  #unittest.main()
   Main()
\ No newline at end of file